@@ -0,0 +1,123 @@
+"""
+Everlast AI Backend - Metrics Middleware
+
+Misst die Dauer aller HTTP-Requests pro Route und registriert die
+Laufzeit-Kennzahlen (Queue-Tiefe, Caches, Ollama-Backends), die erst beim
+Abruf von ``/metrics`` ausgelesen werden.
+"""
+
+import time
+
+from services.metrics import HTTP_REQUEST_SECONDS, registry
+from services.ollama_service import ollama_service
+from services.whisper_service import whisper_service
+
+
+class MetricsMiddleware:
+    """
+    ASGI-Middleware für die Request-Dauer.
+
+    Gemessen wird bis zum Ende der Antwort (auch bei Streams). Als Label dient
+    das Routen-Template (z.B. ``/api/v1/jobs/{job_id}``), nicht der konkrete
+    Pfad, damit die Anzahl der Zeitreihen begrenzt bleibt.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=route,
+                status=str(status),
+            )
+
+
+def _caches():
+    for cache in (ollama_service.cache, whisper_service.cache):
+        if cache is not None:
+            yield cache.name, cache.stats()
+
+
+def _cache_hits():
+    for name, stats in _caches():
+        yield (name, "memory"), stats["hits_memory"]
+        yield (name, "disk"), stats["hits_disk"]
+        yield (name, "coalesced"), stats["coalesced"]
+
+
+registry.callback(
+    "everlast_whisper_queue_depth",
+    "Wartende Transkriptions-Aufträge",
+    (),
+    lambda: [((), whisper_service.scheduler.queue_depth)],
+)
+registry.callback(
+    "everlast_whisper_running",
+    "Laufende Transkriptions-Aufträge",
+    (),
+    lambda: [((), whisper_service.scheduler.running)],
+)
+registry.callback(
+    "everlast_whisper_rejected_total",
+    "Wegen voller Warteschlange abgewiesene Transkriptionen",
+    (),
+    lambda: [((), whisper_service.scheduler.stats()["rejected"])],
+    kind="counter",
+)
+registry.callback(
+    "everlast_ollama_in_flight",
+    "Laufende Requests pro Ollama-Backend",
+    ("backend",),
+    lambda: [((b.url,), b.in_flight) for b in ollama_service.backends],
+)
+registry.callback(
+    "everlast_ollama_backend_up",
+    "Ollama-Backend erreichbar (1) oder nicht (0)",
+    ("backend",),
+    lambda: [((b.url,), int(bool(b.available))) for b in ollama_service.backends],
+)
+registry.callback(
+    "everlast_cache_hits_total",
+    "Cache-Treffer nach Tier (coalesced = auf laufende Berechnung gewartet)",
+    ("cache", "tier"),
+    _cache_hits,
+    kind="counter",
+)
+registry.callback(
+    "everlast_cache_misses_total",
+    "Cache-Fehlschläge (Wert wurde berechnet)",
+    ("cache",),
+    lambda: [((name,), stats["misses"]) for name, stats in _caches()],
+    kind="counter",
+)
+registry.callback(
+    "everlast_cache_hit_ratio",
+    "Anteil der Cache-Treffer an allen Abfragen",
+    ("cache",),
+    lambda: [((name,), stats["hit_rate"]) for name, stats in _caches()],
+)
+registry.callback(
+    "everlast_cache_entries",
+    "Einträge im Speicher-Tier",
+    ("cache",),
+    lambda: [((name,), stats["entries"]) for name, stats in _caches()],
+)
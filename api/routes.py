@@ -4,28 +4,85 @@ Everlast AI Backend - API Routes
 REST-API Endpoints für LLM-Generierung und STT-Transkription.
 """
 
+import asyncio
+import json
 import logging
 from typing import Optional
 
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi import (
+    APIRouter,
+    UploadFile,
+    File,
+    Form,
+    HTTPException,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.responses import Response
+import httpx
+from pydantic import ValidationError
 
+from api.streaming import stream_events
 from config import settings, GPU_PROFILES
+from hardware import HardwareSnapshot, hardware_detector
 from models.schemas import (
     GenerateRequest,
     GenerateResponse,
+    GenerateBatchRequest,
+    GenerateBatchItem,
+    GenerateBatchResponse,
+    DecodeOptions,
     TranscribeResponse,
     HealthResponse,
     ModelInfo,
     GPUProfile,
+    GPUDeviceInfo,
+    HardwareInfo,
+    StreamTranscribeConfig,
+    TranscriptionJob,
+    TranscriptionJobResults,
 )
+from services.audio import EmptyAudioError
+from services.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, registry
+from services.ollama_backends import OllamaUnavailableError
 from services.ollama_service import ollama_service
-from services.whisper_service import whisper_service
+from services.tracing import add_span, current_trace
+from services.transcription_jobs import (
+    JobNotFoundError,
+    JobSourceError,
+    transcription_jobs,
+)
+from services.whisper_scheduler import WhisperBusyError
+from services.whisper_service import DECODE_PRESETS, DEFAULT_DECODE, whisper_service
+from services.warm_pool import warm_pool
+from services.whisper_stream import StreamingTranscription
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
+def _ollama_unavailable() -> HTTPException:
+    """503 mit Retry-After, wenn kein Ollama-Backend erreichbar ist."""
+    return HTTPException(
+        status_code=503,
+        detail="Ollama nicht erreichbar. Ist Ollama gestartet?",
+        headers={"Retry-After": str(ollama_service.retry_after())},
+    )
+
+
+def _require_ollama():
+    """
+    Weist Requests ab, wenn Ollama laut gecachtem Health-Status nicht erreichbar ist.
+
+    Kein Netzwerkzugriff: der Status kommt vom Health-Monitor und aus den
+    Ergebnissen echter Calls (Circuit Breaker).
+    """
+    if not ollama_service.allow_request():
+        raise _ollama_unavailable()
+
+
 # ============================================================================
 # Health & Info Endpoints
 # ============================================================================
@@ -47,7 +104,7 @@ async def health_check():
     ollama_models = []
 
     if ollama_available:
-        ollama_models = await ollama_service.list_model_names()
+        ollama_models = [m.name for m in ollama_service.cached_models]
 
     return HealthResponse(
         status="ok",
@@ -56,10 +113,55 @@ async def health_check():
         ollama_available=ollama_available,
         ollama_models=ollama_models,
         whisper_available=whisper_service.is_loaded,
-        whisper_model=whisper_service._loaded_model_size,
+        whisper_model=whisper_service.last_model_size,
+        whisper_models=whisper_service.loaded_models,
     )
 
 
+@router.get("/metrics", tags=["Health"])
+async def metrics():
+    """
+    Metriken im Prometheus-Format.
+
+    Request-Dauer pro Route, Ollama-TTFT und Tokens/s, Whisper-Wartezeit vs.
+    Transkriptionsdauer, Real-Time-Factor, Ladezeiten, Cache-Trefferquoten
+    und Queue-Tiefe.
+    """
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Metriken deaktiviert")
+    return Response(registry.render(), media_type=METRICS_CONTENT_TYPE)
+
+
+@router.get("/api/v1/ollama/health", tags=["Health"])
+async def ollama_health():
+    """Gecachter Ollama-Status inkl. Circuit-Breaker-Zustand."""
+    return ollama_service.health_info()
+
+
+@router.get("/api/v1/ollama/backends", tags=["Health"])
+async def ollama_backends():
+    """Status, Modelle, laufende Requests und Latenz pro Ollama-Backend."""
+    return ollama_service.backend_stats()
+
+
+@router.get("/api/v1/ollama/cache", tags=["LLM"])
+async def ollama_cache_stats():
+    """Kennzahlen des Antwort-Caches für deterministische Generierungen."""
+    cache = ollama_service.cache
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+
+@router.delete("/api/v1/ollama/cache", tags=["LLM"])
+async def clear_ollama_cache():
+    """Leert den Antwort-Cache."""
+    cache = ollama_service.cache
+    if cache is not None:
+        await asyncio.to_thread(cache.clear)
+    return {"status": "cleared"}
+
+
 @router.get("/api/v1/gpu-profiles", response_model=list[GPUProfile], tags=["Config"])
 async def list_gpu_profiles():
     """Liste aller verfügbaren GPU-Profile mit Modell-Empfehlungen."""
@@ -78,13 +180,40 @@ async def list_gpu_profiles():
     return profiles
 
 
+def _hardware_info(snapshot: HardwareSnapshot) -> HardwareInfo:
+    return HardwareInfo(
+        profile=snapshot.profile,
+        provider=snapshot.provider,
+        detected_at=snapshot.detected_at,
+        gpus=[
+            GPUDeviceInfo(
+                index=gpu.index,
+                name=gpu.name,
+                vram_gb=gpu.vram_gb,
+                vram_free_mb=gpu.vram_free_bytes // (1024**2),
+            )
+            for gpu in snapshot.gpus
+        ],
+    )
+
+
+@router.get("/api/v1/hardware", response_model=HardwareInfo, tags=["Config"])
+async def get_hardware():
+    """Gecachte Hardware-Erkennung (alle GPUs)."""
+    return _hardware_info(hardware_detector.snapshot)
+
+
+@router.post("/api/v1/hardware/refresh", response_model=HardwareInfo, tags=["Config"])
+async def refresh_hardware():
+    """Hardware neu erkennen (z.B. nach Treiber- oder GPU-Wechsel)."""
+    snapshot = await asyncio.to_thread(hardware_detector.refresh)
+    return _hardware_info(snapshot)
+
+
 @router.get("/api/v1/models", response_model=list[ModelInfo], tags=["Models"])
 async def list_models():
     """Liste aller installierten Ollama-Modelle."""
-    if not await ollama_service.is_available():
-        raise HTTPException(
-            status_code=503, detail="Ollama nicht erreichbar. Ist Ollama gestartet?"
-        )
+    _require_ollama()
 
     return await ollama_service.list_models()
 
@@ -95,15 +224,26 @@ async def list_models():
 
 
 @router.post("/api/v1/generate", response_model=GenerateResponse, tags=["LLM"])
-async def generate_text(request: GenerateRequest):
+async def generate_text(request: GenerateRequest, http_request: Request):
     """
     Text-Generierung mit Ollama LLM.
 
     Verwendet das konfigurierte Standard-Modell oder ein explizit angegebenes.
+    Mit ``stream: true`` werden die Tokens inkrementell gesendet
+    (``Accept: text/event-stream`` für SSE, sonst NDJSON).
     """
-    if not await ollama_service.is_available():
-        raise HTTPException(
-            status_code=503, detail="Ollama nicht erreichbar. Ist Ollama gestartet?"
+    _require_ollama()
+
+    if request.stream:
+        return stream_events(
+            http_request,
+            ollama_service.generate_stream(
+                prompt=request.prompt,
+                system_prompt=request.system_prompt,
+                model=request.model,
+                max_tokens=request.max_tokens,
+                temperature=request.temperature,
+            ),
         )
 
     try:
@@ -116,26 +256,82 @@ async def generate_text(request: GenerateRequest):
         )
         return result
 
+    except (httpx.TransportError, OllamaUnavailableError) as e:
+        logger.error(f"Generierungsfehler: {e}")
+        raise _ollama_unavailable()
     except Exception as e:
         logger.error(f"Generierungsfehler: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _batch_item(index: int, outcome: GenerateResponse | Exception) -> GenerateBatchItem:
+    if isinstance(outcome, Exception):
+        message = str(outcome) or type(outcome).__name__
+        return GenerateBatchItem(index=index, error=message)
+    return GenerateBatchItem(index=index, result=outcome)
+
+
+@router.post(
+    "/api/v1/generate/batch", response_model=GenerateBatchResponse, tags=["LLM"]
+)
+async def generate_batch(request: GenerateBatchRequest, http_request: Request):
+    """
+    Mehrere Generierungen in einem Request.
+
+    Die Requests laufen mit begrenzter Parallelität (``OLLAMA_NUM_PARALLEL``).
+    Fehler werden pro Element gemeldet. Mit ``stream: true`` kommt jedes
+    Ergebnis als ``result``-Event, sobald es fertig ist (NDJSON oder SSE).
+    """
+    _require_ollama()
+    outcomes = ollama_service.generate_batch(request.requests, request.concurrency)
+
+    if request.stream:
+
+        async def events():
+            try:
+                async for index, outcome in outcomes:
+                    yield {"type": "result", **_batch_item(index, outcome).model_dump()}
+                yield {"type": "done", "count": len(request.requests)}
+            finally:
+                await outcomes.aclose()
+
+        return stream_events(http_request, events())
+
+    items: list[GenerateBatchItem | None] = [None] * len(request.requests)
+    async for index, outcome in outcomes:
+        items[index] = _batch_item(index, outcome)
+    failed = sum(1 for item in items if item.error is not None)
+    return GenerateBatchResponse(
+        results=items, succeeded=len(items) - failed, failed=failed
+    )
+
+
 @router.post("/api/v1/chat", response_model=GenerateResponse, tags=["LLM"])
 async def chat_completion(
     messages: list[dict],
+    http_request: Request,
     model: Optional[str] = None,
     max_tokens: int = 2048,
     temperature: float = 0.7,
+    stream: bool = False,
 ):
     """
     Chat-Completion im OpenAI-kompatiblen Format.
 
     Erwartet eine Liste von Messages mit "role" und "content".
+    Mit ``stream=true`` werden die Tokens inkrementell gesendet.
     """
-    if not await ollama_service.is_available():
-        raise HTTPException(
-            status_code=503, detail="Ollama nicht erreichbar. Ist Ollama gestartet?"
+    _require_ollama()
+
+    if stream:
+        return stream_events(
+            http_request,
+            ollama_service.generate_chat_stream(
+                messages=messages,
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+            ),
         )
 
     try:
@@ -147,6 +343,9 @@ async def chat_completion(
         )
         return result
 
+    except (httpx.TransportError, OllamaUnavailableError) as e:
+        logger.error(f"Chat-Fehler: {e}")
+        raise _ollama_unavailable()
     except Exception as e:
         logger.error(f"Chat-Fehler: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -157,66 +356,406 @@ async def chat_completion(
 # ============================================================================
 
 
+def _busy(error: WhisperBusyError) -> HTTPException:
+    """503 mit Retry-After für eine volle Transkriptions-Warteschlange."""
+    logger.warning(str(error))
+    return HTTPException(
+        status_code=503,
+        detail=str(error),
+        headers={"Retry-After": str(error.retry_after)},
+    )
+
+
+def _decode_options(**fields) -> DecodeOptions:
+    """Decoder-Optionen aus Formularfeldern (422 bei ungültigen Werten)."""
+    try:
+        return DecodeOptions(
+            **{name: value for name, value in fields.items() if value is not None}
+        )
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=422,
+            detail=e.errors(include_url=False, include_context=False),
+        )
+
+
+@router.get("/api/v1/transcribe/presets", tags=["STT"])
+async def transcribe_presets():
+    """Decoder-Presets mit den Optionen, die an faster-whisper gehen."""
+    return {"default": DEFAULT_DECODE.preset, "presets": DECODE_PRESETS}
+
+
+def _session_key(http_request: Request, session_id: Optional[str]) -> str:
+    """
+    Schlüssel für gemerkte Sprachen (``language=auto``): Formularfeld
+    ``session_id``, sonst Header ``X-Session-ID``, sonst die Client-Adresse.
+    """
+    session_id = session_id or http_request.headers.get("x-session-id")
+    if session_id:
+        return f"session:{session_id[:128]}"
+    client = http_request.client
+    return f"client:{client.host if client else 'unknown'}"
+
+
+def _record_upload():
+    """Erfasst Empfang und Spooling des Uploads (bis zum Aufruf der Route)."""
+    trace = current_trace()
+    if trace is not None:
+        add_span("upload", trace.root.start_ns)
+
+
 @router.post("/api/v1/transcribe", response_model=TranscribeResponse, tags=["STT"])
 async def transcribe_audio(
+    http_request: Request,
     audio: UploadFile = File(..., description="Audio-Datei zur Transkription"),
-    language: str = Form(default="de", description="Sprache (ISO 639-1)"),
+    language: str = Form(
+        default="de", description="Sprache (ISO 639-1) oder auto (Erkennung)"
+    ),
+    session_id: Optional[str] = Form(
+        default=None,
+        description="Sitzung, für die language=auto die erkannte Sprache merkt",
+    ),
     model: Optional[str] = Form(default=None, description="Whisper-Modell"),
+    stream: bool = Form(
+        default=False, description="Segmente streamen (NDJSON oder SSE)"
+    ),
+    word_timestamps: bool = Form(
+        default=False, description="Wort-Zeitstempel (nur mit stream)"
+    ),
+    long_audio: bool = Form(
+        default=False,
+        description="Langaudio-Modus: Abschnitte parallel transkribieren",
+    ),
+    preset: str = Form(
+        default="accurate", description="Decoder-Preset: fast oder accurate"
+    ),
+    beam_size: Optional[int] = Form(default=None, description="Beam-Size"),
+    initial_prompt: Optional[str] = Form(
+        default=None, description="Kontext/Fachbegriffe für das erste Fenster"
+    ),
+    condition_on_previous_text: Optional[bool] = Form(default=None),
+    without_timestamps: Optional[bool] = Form(default=None),
+    vad_filter: Optional[bool] = Form(default=None),
+    vad_threshold: Optional[float] = Form(default=None),
+    vad_min_silence_ms: Optional[int] = Form(default=None),
+    vad_speech_pad_ms: Optional[int] = Form(default=None),
 ):
     """
     Audio-Transkription mit faster-whisper.
 
     Unterstützte Formate: webm, wav, mp3, ogg, flac, m4a
+
+    Mit ``stream=true`` werden die Segmente gesendet, sobald sie fertig sind
+    (``info``, ``segment``…, ``done``) – als NDJSON oder, mit
+    ``Accept: text/event-stream``, als Server-Sent Events.
+
+    Mit ``long_audio=true`` wird lange Audio an Sprechpausen geteilt und auf
+    allen Workern parallel transkribiert; die Antwort enthält ``segments``.
+
+    ``preset=fast`` dekodiert greedy (Beam 1, ohne Temperatur-Fallback) –
+    gedacht für kurze Kommandos. Einzelne Decoder-Optionen überschreiben das
+    Preset (siehe ``GET /api/v1/transcribe/presets``).
+
+    ``language=auto`` erkennt die Sprache auf den ersten Sekunden und merkt
+    sie pro ``session_id`` (bzw. ``X-Session-ID`` oder Client-Adresse);
+    Folge-Requests der Sitzung überspringen die Erkennung. Die Antwort
+    enthält ``language_probability`` und ``language_source``.
     """
-    # Modell bei Bedarf wechseln
-    if model and model != whisper_service.model_size:
-        whisper_service._model_size = model
-        whisper_service.unload_model()
+    _record_upload()
+    options = _decode_options(
+        preset=preset,
+        beam_size=beam_size,
+        initial_prompt=initial_prompt,
+        condition_on_previous_text=condition_on_previous_text,
+        without_timestamps=without_timestamps,
+        vad_filter=vad_filter,
+        vad_threshold=vad_threshold,
+        vad_min_silence_ms=vad_min_silence_ms,
+        vad_speech_pad_ms=vad_speech_pad_ms,
+    )
+    if stream:
+        return await _transcribe_stream(
+            http_request,
+            audio,
+            language,
+            model,
+            word_timestamps,
+            options,
+            _session_key(http_request, session_id),
+        )
 
     try:
-        # Audio-Daten lesen
-        audio_data = await audio.read()
+        # Upload direkt als (ggf. gespoolte) Datei übergeben, ohne ihn
+        # komplett in den Speicher zu lesen oder neu zu schreiben
         mime_type = audio.content_type or "audio/webm"
 
         logger.info(
             f"Transkribiere: {audio.filename}, "
-            f"{len(audio_data)} bytes, {mime_type}"
+            f"{audio.size if audio.size is not None else '?'} bytes, {mime_type}"
         )
 
         # Transkription durchführen
         result = await whisper_service.transcribe(
-            audio_data=audio_data,
+            audio_data=audio.file,
             language=language,
             mime_type=mime_type,
+            model=model,
+            long_audio=long_audio,
+            options=options,
+            session_key=_session_key(http_request, session_id),
         )
 
         return result
 
+    except EmptyAudioError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except WhisperBusyError as e:
+        raise _busy(e)
+    except Exception as e:
+        logger.error(f"Transkriptionsfehler: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def _transcribe_stream(
+    http_request: Request,
+    audio: UploadFile,
+    language: str,
+    model: Optional[str],
+    word_timestamps: bool,
+    options: DecodeOptions,
+    session_key: str,
+):
+    """Segment-Stream; Backpressure-Fehler kommen noch als HTTP-Status."""
+    logger.info(f"Transkribiere (Stream): {audio.filename}, {audio.content_type}")
+    events = whisper_service.transcribe_stream(
+        audio.file,
+        language=language,
+        model=model,
+        word_timestamps=word_timestamps,
+        options=options,
+        session_key=session_key,
+    )
+    try:
+        # Erstes Event abwarten: volle Queue -> 503 statt Fehler-Event
+        first = await anext(events)
+    except EmptyAudioError as e:
+        await events.aclose()
+        raise HTTPException(status_code=400, detail=str(e))
+    except WhisperBusyError as e:
+        await events.aclose()
+        raise _busy(e)
     except Exception as e:
+        await events.aclose()
         logger.error(f"Transkriptionsfehler: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+    async def _events():
+        try:
+            yield first
+            async for event in events:
+                yield event
+        finally:
+            await events.aclose()
+
+    return stream_events(http_request, _events())
+
+
+@router.websocket("/api/v1/transcribe/ws")
+async def transcribe_stream(websocket: WebSocket):
+    """
+    Streaming-Transkription über WebSocket.
+
+    Protokoll:
+    1. Client sendet eine JSON-Konfiguration (``StreamTranscribeConfig``)
+    2. Client sendet Audio als Binär-Frames (pcm_s16le oder webm-Chunks)
+    3. Server sendet ``partial``- und ``final``-Events mit Zeitstempeln,
+       sobald Sprechpausen erkannt werden
+    4. Client sendet ``{"type": "stop"}``; Server schließt mit ``done`` ab
+    """
+    await websocket.accept()
+    try:
+        config = StreamTranscribeConfig.model_validate(await websocket.receive_json())
+    except (ValidationError, ValueError) as e:
+        await websocket.send_json({"type": "error", "detail": str(e)})
+        await websocket.close(code=1003)
+        return
+    except KeyError:
+        # Binär-Frame statt JSON-Konfiguration (receive_json erwartet "text")
+        await websocket.send_json(
+            {"type": "error", "detail": "Erstes Frame muss die JSON-Konfiguration sein"}
+        )
+        await websocket.close(code=1003)
+        return
+    except WebSocketDisconnect:
+        return
+
+    session = StreamingTranscription(whisper_service, config)
+
+    async def _send_events():
+        async for event in session.events():
+            await websocket.send_json(event)
+
+    sender = asyncio.create_task(_send_events())
+    await websocket.send_json({"type": "ready", "format": config.format})
+    logger.info(
+        f"Streaming-Transkription gestartet: {config.format}, "
+        f"Sprache: {config.language}"
+    )
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes") is not None:
+                if session.failed:
+                    # Audio nicht dekodierbar: Sitzung beenden statt weiter zu puffern
+                    await session.finish()
+                    await sender
+                    await websocket.close(code=1003)
+                    break
+                session.push_audio(message["bytes"])
+            elif message.get("text"):
+                try:
+                    command = json.loads(message["text"])
+                except ValueError:
+                    command = {}
+                if isinstance(command, dict) and command.get("type") == "stop":
+                    await session.finish()
+                    await sender
+                    await websocket.close()
+                    break
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        try:
+            await sender
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            # z.B. send_json auf einem bereits geschlossenen Socket
+            logger.debug(f"Senden der Streaming-Events abgebrochen: {e}")
+        await session.close()
+        logger.info("Streaming-Transkription beendet")
+
+
+# ============================================================================
+# Batch-Jobs
+# ============================================================================
+
+
+def _job_not_found(job_id: str) -> HTTPException:
+    return HTTPException(status_code=404, detail=f"Job nicht gefunden: {job_id}")
+
+
+@router.post(
+    "/api/v1/jobs/transcribe",
+    response_model=TranscriptionJob,
+    status_code=202,
+    tags=["Jobs"],
+)
+async def submit_transcription_job(
+    files: list[UploadFile] = File(default=[], description="Audio-Dateien"),
+    paths: list[str] = Form(
+        default=[], description="Server-Pfade relativ zu WHISPER_JOBS_ALLOWED_ROOT"
+    ),
+    language: str = Form(default="de", description="Sprache (ISO 639-1)"),
+    model: Optional[str] = Form(default=None, description="Whisper-Modell"),
+    long_audio: bool = Form(default=False, description="Langaudio-Modus"),
+):
+    """
+    Batch-Transkription als Hintergrund-Job.
+
+    Die Dateien werden nacheinander mit niedriger Priorität transkribiert;
+    Fortschritt über ``/api/v1/jobs/{id}``, Ergebnisse über
+    ``/api/v1/jobs/{id}/results``.
+    """
+    try:
+        return await transcription_jobs.submit(
+            [(f.filename or "audio", f.file) for f in files],
+            paths,
+            language=language,
+            model=model,
+            long_audio=long_audio,
+        )
+    except JobSourceError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/api/v1/jobs", response_model=list[TranscriptionJob], tags=["Jobs"])
+async def list_transcription_jobs(limit: int = 50):
+    """Die neuesten Transkriptions-Jobs."""
+    return await transcription_jobs.recent(limit)
+
+
+@router.get("/api/v1/jobs/{job_id}", response_model=TranscriptionJob, tags=["Jobs"])
+async def get_transcription_job(job_id: str):
+    """Status und Fortschritt eines Jobs."""
+    try:
+        return await transcription_jobs.get(job_id)
+    except JobNotFoundError:
+        raise _job_not_found(job_id)
+
+
+@router.get(
+    "/api/v1/jobs/{job_id}/results",
+    response_model=TranscriptionJobResults,
+    tags=["Jobs"],
+)
+async def get_transcription_job_results(job_id: str):
+    """Alle Ergebnisse eines Jobs (auch während er noch läuft)."""
+    try:
+        job = await transcription_jobs.get(job_id)
+        items = await transcription_jobs.items(job_id)
+    except JobNotFoundError:
+        raise _job_not_found(job_id)
+    return TranscriptionJobResults(job=job, items=items)
+
+
+@router.post(
+    "/api/v1/jobs/{job_id}/cancel", response_model=TranscriptionJob, tags=["Jobs"]
+)
+async def cancel_transcription_job(job_id: str):
+    """Bricht einen Job ab (bereits laufende Dateien werden noch fertig)."""
+    try:
+        return await transcription_jobs.cancel(job_id)
+    except JobNotFoundError:
+        raise _job_not_found(job_id)
+
+
+@router.delete("/api/v1/jobs/{job_id}", tags=["Jobs"])
+async def delete_transcription_job(job_id: str):
+    """Löscht einen Job samt Ergebnissen und hochgeladenen Dateien."""
+    try:
+        await transcription_jobs.delete(job_id)
+    except JobNotFoundError:
+        raise _job_not_found(job_id)
+    return {"status": "deleted", "id": job_id}
+
 
 @router.post("/api/v1/whisper/load", tags=["STT"])
 async def load_whisper_model(
     model: str = Form(default=None, description="Modell-Größe (tiny, base, small, medium, large-v3)"),
 ):
     """
-    Whisper-Modell vorladen.
+    Whisper-Modell vorladen und als Standard-Modell setzen.
 
     Nützlich um das Modell beim Start zu laden, damit die erste Transkription
-    schneller ist.
+    schneller ist. Bereits geladene Modelle bleiben im Pool, solange das
+    Speicherbudget reicht.
     """
     if model:
-        whisper_service._model_size = model
+        whisper_service.set_default_model(model)
 
     try:
         await whisper_service.load_model()
         return {
             "status": "ok",
-            "model": whisper_service._loaded_model_size,
+            "model": whisper_service.model_size,
             "device": whisper_service.device,
             "compute_type": whisper_service.compute_type,
+            "loaded_models": whisper_service.loaded_models,
         }
     except Exception as e:
         logger.error(f"Fehler beim Laden des Modells: {e}")
@@ -224,7 +763,58 @@ async def load_whisper_model(
 
 
 @router.post("/api/v1/whisper/unload", tags=["STT"])
-async def unload_whisper_model():
-    """Whisper-Modell entladen (GPU-Speicher freigeben)."""
-    whisper_service.unload_model()
-    return {"status": "ok", "message": "Modell entladen"}
+async def unload_whisper_model(
+    model: Optional[str] = Form(default=None, description="Modell (leer = alle)"),
+):
+    """Whisper-Modell(e) entladen (GPU-Speicher freigeben)."""
+    whisper_service.unload_model(model)
+    return {
+        "status": "ok",
+        "message": "Modell entladen",
+        "loaded_models": whisper_service.loaded_models,
+    }
+
+
+@router.get("/api/v1/whisper/queue", tags=["STT"])
+async def whisper_queue_status():
+    """Auslastung des Transkriptions-Worker-Pools (Queue-Tiefe, Wartezeiten)."""
+    stats = whisper_service.scheduler.stats()
+    stats["backend"] = settings.whisper_backend
+    if whisper_service.uses_processes:
+        stats["process_pool"] = whisper_service.process_pool.stats()
+    if whisper_service.batcher is not None:
+        stats["batching"] = whisper_service.batcher.stats()
+    if whisper_service.cache is not None:
+        stats["cache"] = whisper_service.cache.stats()
+    stats["language_hints"] = whisper_service.language_hints.stats()
+    return stats
+
+
+@router.get("/api/v1/whisper/models", tags=["STT"])
+async def whisper_pool_status():
+    """Geladene Whisper-Modelle und Speicherbudget des Pools."""
+    return whisper_service.pool.stats()
+
+
+@router.get("/api/v1/warm-pool", tags=["Config"])
+async def warm_pool_status():
+    """Vorgeladene und warm gehaltene Modelle inkl. Ladezeiten."""
+    return warm_pool.stats()
+
+
+@router.get("/api/v1/whisper/cache", tags=["STT"])
+async def whisper_cache_stats():
+    """Kennzahlen des Transkript-Caches."""
+    cache = whisper_service.cache
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+
+@router.delete("/api/v1/whisper/cache", tags=["STT"])
+async def clear_whisper_cache():
+    """Leert den Transkript-Cache."""
+    cache = whisper_service.cache
+    if cache is not None:
+        await asyncio.to_thread(cache.clear)
+    return {"status": "cleared"}
@@ -0,0 +1,65 @@
+"""
+Everlast AI Backend - Streaming Helpers
+
+Ausgabe von Event-Streams als Server-Sent Events oder NDJSON.
+"""
+
+import json
+import logging
+from typing import AsyncIterator
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+SSE_MEDIA_TYPE = "text/event-stream"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def wants_sse(request: Request) -> bool:
+    """Prüft, ob der Client Server-Sent Events angefordert hat."""
+    return SSE_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def format_sse(event: dict) -> str:
+    """Formatiert ein Event als SSE-Nachricht (``event:`` = Event-Typ)."""
+    data = json.dumps(event, ensure_ascii=False)
+    return f"event: {event.get('type', 'message')}\ndata: {data}\n\n"
+
+
+def format_ndjson(event: dict) -> str:
+    """Formatiert ein Event als NDJSON-Zeile."""
+    return json.dumps(event, ensure_ascii=False) + "\n"
+
+
+def stream_events(request: Request, events: AsyncIterator[dict]) -> StreamingResponse:
+    """
+    Streamt Events als SSE oder NDJSON (abhängig vom Accept-Header).
+
+    Trennt der Client die Verbindung, wird der Event-Generator geschlossen,
+    damit laufende Upstream-Requests abgebrochen werden. Fehler während des
+    Streams werden als ``{"type": "error"}`` Event gemeldet, da der
+    HTTP-Status zu diesem Zeitpunkt bereits gesendet wurde.
+    """
+    sse = wants_sse(request)
+    formatter = format_sse if sse else format_ndjson
+
+    async def body():
+        try:
+            async for event in events:
+                if await request.is_disconnected():
+                    logger.info("Client getrennt, breche Stream ab")
+                    break
+                yield formatter(event)
+        except Exception as e:
+            logger.error(f"Stream-Fehler: {e}")
+            yield formatter({"type": "error", "detail": str(e)})
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(
+        body(),
+        media_type=SSE_MEDIA_TYPE if sse else NDJSON_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,65 @@
+"""
+Everlast AI Backend - Tracing Middleware
+
+Startet pro HTTP-Request einen Trace, setzt ``X-Request-ID`` und
+``Server-Timing`` in der Antwort und übergibt den Trace an den Exporter.
+"""
+
+import re
+
+from services.tracing import finish_trace, span_exporter, start_trace
+
+# Request-IDs von Clients werden übernommen, aber bereinigt und begrenzt
+_MAX_REQUEST_ID_LENGTH = 128
+_UNSAFE_REQUEST_ID = re.compile(r"[^A-Za-z0-9._:/+=-]")
+
+
+class TracingMiddleware:
+    """
+    ASGI-Middleware für Request-Traces.
+
+    ``Server-Timing`` enthält die Stufen, die bis zum Beginn der Antwort
+    abgeschlossen sind; bei Streams landen spätere Stufen nur im Export.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        request_id = _UNSAFE_REQUEST_ID.sub(
+            "", headers.get(b"x-request-id", b"").decode("latin-1")
+        )
+        traceparent = headers.get(b"traceparent", b"").decode("latin-1").strip()
+
+        trace = start_trace(
+            f"{scope['method']} {scope['path']}",
+            request_id=request_id[:_MAX_REQUEST_ID_LENGTH] or None,
+            traceparent=traceparent or None,
+        )
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-request-id", trace.request_id.encode("latin-1")),
+                    (b"server-timing", trace.server_timing().encode("latin-1")),
+                ]
+                trace.root.attributes["http.status_code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            finish_trace(trace)
+            route = getattr(scope.get("route"), "path", None)
+            if route:
+                trace.root.name = f"{scope['method']} {route}"
+            trace.root.attributes["http.method"] = scope["method"]
+            trace.root.attributes["http.target"] = scope["path"]
+            # auch fehlgeschlagene Requests werden exportiert
+            span_exporter.export(trace)
@@ -0,0 +1,8 @@
+"""
+Everlast AI Backend - Benchmarks
+
+Lasttests gegen den echten Server mit simuliertem Ollama und Whisper-Stub.
+
+    python -m benchmarks.run --scenario all --output results.json
+    python -m benchmarks.compare baseline.json results.json
+"""
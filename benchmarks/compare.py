@@ -0,0 +1,91 @@
+"""
+Everlast AI Backend - Benchmark-Vergleich
+
+Vergleicht zwei Ergebnisdateien von ``benchmarks.run`` und markiert
+Verschlechterungen oberhalb einer Schwelle.
+
+    python -m benchmarks.compare baseline.json results.json --threshold 10
+
+Exit-Code 1, wenn mindestens eine Kennzahl schlechter als die Schwelle ist
+(z.B. für CI).
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# (Pfad im Szenario, Anzeigename, größer ist besser)
+METRICS = [
+    (("throughput_rps",), "Durchsatz req/s", True),
+    (("latency", "p50_ms"), "p50 ms", False),
+    (("latency", "p95_ms"), "p95 ms", False),
+    (("latency", "p99_ms"), "p99 ms", False),
+    (("ttft", "p50_ms"), "TTFT p50 ms", False),
+    (("memory", "max_rss_during_mb"), "RSS max MB", False),
+]
+
+
+def _get(data: dict, path: tuple[str, ...]):
+    for key in path:
+        if not isinstance(data, dict) or key not in data:
+            return None
+        data = data[key]
+    return data
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> tuple[list[str], int]:
+    """Liefert Tabellenzeilen und die Anzahl der Verschlechterungen."""
+    base_scenarios = {s["name"]: s for s in baseline["scenarios"]}
+    lines = []
+    regressions = 0
+    for scenario in current["scenarios"]:
+        base = base_scenarios.get(scenario["name"])
+        if base is None:
+            continue
+        lines.append(f"{scenario['name']}")
+        for path, label, higher_is_better in METRICS:
+            old, new = _get(base, path), _get(scenario, path)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old * 100 if old else 0.0
+            worse = -change if higher_is_better else change
+            marker = ""
+            if worse > threshold:
+                marker = "  << schlechter"
+                regressions += 1
+            lines.append(
+                f"  {label:<16} {old:>10.2f} -> {new:>10.2f} ({change:+.1f}%){marker}"
+            )
+        if scenario["failed"] > base["failed"]:
+            lines.append(f"  Fehler: {base['failed']} -> {scenario['failed']}")
+            regressions += 1
+    return lines, regressions
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Benchmark-Ergebnisse vergleichen")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="Erlaubte Verschlechterung in Prozent",
+    )
+    args = parser.parse_args(argv)
+
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+    current = json.loads(Path(args.current).read_text(encoding="utf-8"))
+    print(f"Basis: {baseline.get('commit')} ({baseline.get('created_at')})")
+    print(f"Neu:   {current.get('commit')} ({current.get('created_at')})")
+
+    lines, regressions = compare(baseline, current, args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"{regressions} Verschlechterung(en) über {args.threshold:.0f}%")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
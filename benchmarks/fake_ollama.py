@@ -0,0 +1,230 @@
+"""
+Everlast AI Backend - Fake Ollama
+
+Simulierter Ollama-Server für Benchmarks (ohne GPU und ohne Modelle).
+
+- ``/api/tags``, ``/api/ps``, ``/api/generate`` und ``/api/chat`` im
+  Ollama-Format, mit und ohne Streaming
+- Konfigurierbare Latenz bis zum ersten Token und Token-Rate
+- Begrenzte Parallelität wie ``OLLAMA_NUM_PARALLEL``
+- Modellwechsel kosten Ladezeit, wenn mehr Modelle angefragt werden als
+  gleichzeitig geladen sein dürfen
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+@dataclass
+class FakeOllamaConfig:
+    """Verhalten des simulierten Servers."""
+
+    models: tuple[str, ...] = ("llama3.2:3b", "qwen2.5:7b")
+    latency_ms: float = 50.0  # Prompt-Verarbeitung bis zum ersten Token
+    tokens_per_second: float = 200.0
+    default_tokens: int = 64  # ohne num_predict
+    parallel: int = 4  # wie OLLAMA_NUM_PARALLEL
+    load_ms: float = 500.0  # Ladezeit eines Modells
+    max_loaded: int = 1  # wie OLLAMA_MAX_LOADED_MODELS
+
+
+class _FakeOllama:
+    def __init__(self, config: FakeOllamaConfig):
+        self.config = config
+        self.loaded: OrderedDict[str, float] = OrderedDict()
+        self.requests = 0
+        self._slots = asyncio.Semaphore(config.parallel)
+        self._load_lock = asyncio.Lock()
+
+    async def ensure_loaded(self, model: str) -> int:
+        """Lädt das Modell (simuliert) und liefert die Ladezeit in ns."""
+        async with self._load_lock:
+            if model in self.loaded:
+                self.loaded.move_to_end(model)
+                return 0
+            await asyncio.sleep(self.config.load_ms / 1000)
+            while len(self.loaded) >= self.config.max_loaded:
+                self.loaded.popitem(last=False)
+            self.loaded[model] = time.time()
+            return int(self.config.load_ms * 1e6)
+
+    def token_count(self, payload: dict) -> int:
+        options = payload.get("options") or {}
+        return int(options.get("num_predict") or self.config.default_tokens)
+
+    async def tokens(self, count: int):
+        """Liefert ``count`` Tokens im Takt der konfigurierten Token-Rate."""
+        await asyncio.sleep(self.config.latency_ms / 1000)
+        interval = 1 / self.config.tokens_per_second
+        started = time.perf_counter()
+        for i in range(count):
+            # Gegen den Startzeitpunkt takten, damit sich Verzögerungen nicht aufsummieren
+            delay = started + i * interval - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield f"tok{i} "
+
+
+def create_app(config: FakeOllamaConfig | None = None) -> FastAPI:
+    """Erzeugt die FastAPI-App des simulierten Ollama-Servers."""
+    fake = _FakeOllama(config or FakeOllamaConfig())
+    app = FastAPI(title="Fake Ollama")
+    app.state.fake = fake
+
+    @app.get("/api/tags")
+    async def tags():
+        return {
+            "models": [
+                {"name": name, "modified_at": "2024-01-01T00:00:00Z", "digest": "0"}
+                for name in fake.config.models
+            ]
+        }
+
+    @app.get("/api/ps")
+    async def ps():
+        return {"models": [{"name": name} for name in fake.loaded]}
+
+    async def _complete(request: Request, chat: bool):
+        payload = await request.json()
+        model = payload.get("model", "")
+        if model not in fake.config.models:
+            return JSONResponse(
+                {"error": f"model '{model}' not found"}, status_code=404
+            )
+        fake.requests += 1
+        started_ns = time.time_ns()
+
+        # Nur Modell laden (Warm-up ohne Prompt)
+        if not payload.get("prompt") and not payload.get("messages"):
+            load_ns = await fake.ensure_loaded(model)
+            return {"model": model, "response": "", "done": True, "load_duration": load_ns}
+
+        def chunk(text: str) -> dict:
+            if chat:
+                return {"model": model, "message": {"role": "assistant", "content": text}}
+            return {"model": model, "response": text}
+
+        def final(count: int, load_ns: int, eval_started_ns: int) -> dict:
+            now = time.time_ns()
+            return {
+                **chunk(""),
+                "done": True,
+                "done_reason": "length",
+                "eval_count": count,
+                "eval_duration": now - eval_started_ns,
+                "load_duration": load_ns,
+                "total_duration": now - started_ns,
+            }
+
+        count = fake.token_count(payload)
+
+        if not payload.get("stream", True):
+            async with fake._slots:
+                load_ns = await fake.ensure_loaded(model)
+                eval_started_ns = time.time_ns()
+                text = "".join([t async for t in fake.tokens(count)])
+            data = final(count, load_ns, eval_started_ns)
+            data.update(chunk(text))
+            return data
+
+        async def stream():
+            async with fake._slots:
+                load_ns = await fake.ensure_loaded(model)
+                eval_started_ns = time.time_ns()
+                async for token in fake.tokens(count):
+                    yield json.dumps({**chunk(token), "done": False}) + "\n"
+            yield json.dumps(final(count, load_ns, eval_started_ns)) + "\n"
+
+        return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+    @app.post("/api/generate")
+    async def generate(request: Request):
+        return await _complete(request, chat=False)
+
+    @app.post("/api/chat")
+    async def chat(request: Request):
+        return await _complete(request, chat=True)
+
+    return app
+
+
+class FakeOllamaServer:
+    """Startet den simulierten Server mit uvicorn in einem Hintergrund-Thread."""
+
+    def __init__(
+        self,
+        config: FakeOllamaConfig | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        import uvicorn
+
+        self.app = create_app(config)
+        self._server = uvicorn.Server(
+            uvicorn.Config(self.app, host=host, port=port, log_level="warning")
+        )
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        # Port 0: der tatsächliche Port steht erst nach dem Start fest
+        host, port = self._server.servers[0].sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def start(self, timeout: float = 10.0):
+        self._thread = threading.Thread(
+            target=self._server.run, name="fake-ollama", daemon=True
+        )
+        self._thread.start()
+        deadline = time.monotonic() + timeout
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError("Fake-Ollama konnte nicht gestartet werden")
+            time.sleep(0.01)
+
+    def stop(self):
+        self._server.should_exit = True
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def __enter__(self) -> "FakeOllamaServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Simulierter Ollama-Server")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--tokens-per-second", type=float, default=200.0)
+    parser.add_argument("--parallel", type=int, default=4)
+    parser.add_argument("--load-ms", type=float, default=500.0)
+    args = parser.parse_args()
+
+    uvicorn.run(
+        create_app(
+            FakeOllamaConfig(
+                latency_ms=args.latency_ms,
+                tokens_per_second=args.tokens_per_second,
+                parallel=args.parallel,
+                load_ms=args.load_ms,
+            )
+        ),
+        host="127.0.0.1",
+        port=args.port,
+    )
@@ -0,0 +1,173 @@
+"""
+Everlast AI Backend - Benchmark-Harness
+
+Lastgenerator und Auswertung für die Benchmark-Szenarien.
+
+- Geschlossene Last: N Requests mit fester Anzahl gleichzeitiger Clients
+- Latenz-Perzentile (p50/p95/p99), Durchsatz, Fehler
+- Speicher (RSS) des Server-Prozesses, während der Last abgetastet
+"""
+
+import asyncio
+import math
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+
+# Ein Request: liefert optional Zusatz-Messwerte (z.B. {"ttft": 0.12})
+RequestFn = Callable[[int], Awaitable[Optional[dict]]]
+
+
+def percentile(values: list[float], p: float) -> float | None:
+    """Perzentil mit linearer Interpolation (wie ``numpy.percentile``)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(values: list[float]) -> dict:
+    """Perzentile und Mittelwert in Millisekunden."""
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean_ms": round(sum(values) / len(values) * 1000, 2),
+        "p50_ms": round(percentile(values, 50) * 1000, 2),
+        "p95_ms": round(percentile(values, 95) * 1000, 2),
+        "p99_ms": round(percentile(values, 99) * 1000, 2),
+        "max_ms": round(max(values) * 1000, 2),
+    }
+
+
+def process_memory_mb(pid: int) -> dict:
+    """
+    Aktueller und maximaler RSS eines Prozesses in MB.
+
+    Liest ``/proc/<pid>/status`` (Linux); auf anderen Systemen leer.
+    """
+    if not sys.platform.startswith("linux"):
+        return {}
+    values = {}
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                if key in ("VmRSS", "VmHWM"):
+                    values[key] = int(rest.split()[0]) / 1024  # kB -> MB
+    except OSError:
+        return {}
+    return {
+        "rss_mb": round(values.get("VmRSS", 0.0), 1),
+        "peak_rss_mb": round(values.get("VmHWM", 0.0), 1),
+    }
+
+
+class MemorySampler:
+    """Tastet den RSS eines Prozesses periodisch ab (Maximum während der Last)."""
+
+    def __init__(self, pid: int | None, interval: float = 0.1):
+        self.pid = pid if pid is not None else os.getpid()
+        self.interval = interval
+        self.samples: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def _run(self):
+        while True:
+            rss = process_memory_mb(self.pid).get("rss_mb")
+            if rss is not None:
+                self.samples.append(rss)
+            await asyncio.sleep(self.interval)
+
+    async def __aenter__(self) -> "MemorySampler":
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, *exc):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    def result(self) -> dict:
+        memory = process_memory_mb(self.pid)
+        if self.samples:
+            memory["max_rss_during_mb"] = max(self.samples)
+            memory["start_rss_mb"] = self.samples[0]
+        return memory
+
+
+@dataclass
+class ScenarioResult:
+    """Messwerte eines Szenarios."""
+
+    name: str
+    requests: int
+    concurrency: int
+    wall_seconds: float = 0.0
+    latencies: list[float] = field(default_factory=list)
+    errors: dict[str, int] = field(default_factory=dict)
+    extra: dict[str, list[float]] = field(default_factory=dict)
+    memory: dict = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        succeeded = len(self.latencies)
+        return {
+            "name": self.name,
+            "requests": self.requests,
+            "concurrency": self.concurrency,
+            "succeeded": succeeded,
+            "failed": sum(self.errors.values()),
+            "errors": self.errors,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "throughput_rps": (
+                round(succeeded / self.wall_seconds, 2) if self.wall_seconds else None
+            ),
+            "latency": summarize(self.latencies),
+            **{name: summarize(values) for name, values in self.extra.items()},
+            "memory": self.memory,
+        }
+
+
+async def run_load(
+    name: str,
+    request: RequestFn,
+    total: int,
+    concurrency: int,
+    server_pid: int | None = None,
+) -> ScenarioResult:
+    """
+    Führt ``total`` Requests mit ``concurrency`` gleichzeitigen Clients aus.
+
+    Jeder Client holt sich den nächsten Index, bis alle Requests verteilt
+    sind. Fehlgeschlagene Requests zählen nach Fehlertyp, nicht in die Latenz.
+    """
+    result = ScenarioResult(name, total, concurrency)
+    counter = iter(range(total))
+
+    async def client():
+        for index in counter:
+            started = time.perf_counter()
+            try:
+                extra = await request(index)
+            except Exception as e:
+                status = getattr(getattr(e, "response", None), "status_code", None)
+                key = f"HTTP {status}" if status else type(e).__name__
+                result.errors[key] = result.errors.get(key, 0) + 1
+                continue
+            result.latencies.append(time.perf_counter() - started)
+            for key, value in (extra or {}).items():
+                result.extra.setdefault(key, []).append(value)
+
+    async with MemorySampler(server_pid) as sampler:
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(min(concurrency, total))))
+        result.wall_seconds = time.perf_counter() - started
+    result.memory = sampler.result()
+    return result
@@ -0,0 +1,264 @@
+"""
+Everlast AI Backend - Benchmark-Runner
+
+Startet Fake-Ollama und den Server (mit Whisper-Stub) als eigenen Prozess,
+führt die Szenarien aus und schreibt die Ergebnisse als JSON.
+
+    python -m benchmarks.run --scenario generate --scenario chat \\
+        --requests 200 --concurrency 16 --output results.json
+
+Servereinstellungen lassen sich mit ``--env`` überschreiben, z.B.
+``--env WHISPER_WORKERS=2``, um Konfigurationen zu vergleichen.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+from benchmarks.fake_ollama import FakeOllamaConfig, FakeOllamaServer
+from benchmarks.harness import run_load
+from benchmarks.scenarios import SCENARIOS, ScenarioOptions
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def server_env(args: argparse.Namespace, ollama_url: str, data_dir: str) -> dict:
+    """Umgebung des Server-Prozesses: keine Caches, kein Vorladen, Stub-Parameter."""
+    env = dict(os.environ)
+    env.update(
+        {
+            "OLLAMA_BASE_URL": ollama_url,
+            "OLLAMA_BASE_URLS": "",
+            "OLLAMA_DEFAULT_MODEL": args.ollama_models[0],
+            # Caches würden wiederholte Requests verfälschen
+            "OLLAMA_CACHE_ENABLED": "false",
+            "WHISPER_CACHE_ENABLED": "false",
+            # Der Stub unterstützt keine BatchedInferencePipeline
+            "WHISPER_BATCH_ENABLED": "false",
+            "WARM_WHISPER_MODELS": "",
+            "WARM_OLLAMA_MODELS": "",
+            "WHISPER_JOBS_DB": os.path.join(data_dir, "jobs.db"),
+            "WHISPER_JOBS_DIR": os.path.join(data_dir, "jobs"),
+            "TRACE_EXPORT_FILE": "",
+            "TRACE_EXPORT_URL": "",
+            "LOG_LEVEL": "WARNING",
+            "BENCH_WHISPER_LOAD_MS": str(args.whisper_load_ms),
+        }
+    )
+    if args.whisper_rtf is not None:
+        env["BENCH_WHISPER_RTF"] = str(args.whisper_rtf)
+    for item in args.env:
+        key, _, value = item.partition("=")
+        env[key] = value
+    return env
+
+
+async def wait_until_ready(url: str, process: subprocess.Popen, timeout: float):
+    """Wartet, bis ``/health`` antwortet."""
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=url, timeout=5.0) as client:
+        while time.monotonic() < deadline:
+            if process is not None and process.poll() is not None:
+                raise RuntimeError(f"Server beendet (Exit-Code {process.returncode})")
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server unter {url} nicht erreichbar")
+
+
+async def run_scenarios(
+    args: argparse.Namespace, url: str, server_pid: int | None
+) -> list[dict]:
+    options = ScenarioOptions(
+        max_tokens=args.max_tokens,
+        ollama_models=args.ollama_models,
+        whisper_models=args.whisper_models,
+    )
+    limits = httpx.Limits(max_connections=args.concurrency * 2)
+    results = []
+    async with httpx.AsyncClient(
+        base_url=url, timeout=args.timeout, limits=limits
+    ) as client:
+        for name in args.scenario:
+            request = SCENARIOS[name](client, options)
+            if args.warmup:
+                # Erste Modell-Ladevorgänge nicht mitmessen
+                await run_load(f"{name}:warmup", request, args.warmup, args.concurrency)
+            print(f"→ {name}: {args.requests} Requests, {args.concurrency} parallel")
+            result = await run_load(
+                name, request, args.requests, args.concurrency, server_pid
+            )
+            results.append(result.to_dict())
+            _print_result(results[-1])
+    return results
+
+
+def _print_result(result: dict):
+    latency = result["latency"]
+    memory = result["memory"]
+    line = (
+        f"  ok {result['succeeded']}/{result['requests']}, "
+        f"{result['throughput_rps']} req/s, "
+        f"p50 {latency.get('p50_ms')} ms, p95 {latency.get('p95_ms')} ms, "
+        f"p99 {latency.get('p99_ms')} ms"
+    )
+    if "ttft" in result:
+        line += f", TTFT p50 {result['ttft'].get('p50_ms')} ms"
+    if memory:
+        line += f", RSS max {memory.get('max_rss_during_mb')} MB"
+    print(line)
+    if result["errors"]:
+        print(f"  Fehler: {result['errors']}")
+
+
+async def main_async(args: argparse.Namespace) -> dict:
+    fake = None
+    process = None
+    url = args.server_url
+    try:
+        with tempfile.TemporaryDirectory(prefix="everlast-bench-") as data_dir:
+            if url is None:
+                fake = FakeOllamaServer(
+                    FakeOllamaConfig(
+                        models=tuple(args.ollama_models),
+                        latency_ms=args.ollama_latency_ms,
+                        tokens_per_second=args.ollama_tokens_per_second,
+                        parallel=args.ollama_parallel,
+                        load_ms=args.ollama_load_ms,
+                        max_loaded=args.ollama_max_loaded,
+                    )
+                )
+                fake.start()
+                port = _free_port()
+                url = f"http://127.0.0.1:{port}"
+                process = subprocess.Popen(
+                    [sys.executable, "-m", "benchmarks.server", "--port", str(port)],
+                    cwd=PROJECT_DIR,
+                    env=server_env(args, fake.url, data_dir),
+                )
+            await wait_until_ready(url, process, args.startup_timeout)
+            results = await run_scenarios(
+                args, url, process.pid if process is not None else None
+            )
+    finally:
+        if process is not None:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        if fake is not None:
+            fake.stop()
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": {
+            key: value
+            for key, value in vars(args).items()
+            if key not in ("output", "scenario")
+        },
+        "scenarios": results,
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Everlast AI Backend Benchmarks")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=[*SCENARIOS, "all"],
+        help="Szenario (mehrfach möglich, Standard: all)",
+    )
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--warmup", type=int, default=4, help="Nicht gemessene Requests vorab"
+    )
+    parser.add_argument("--output", help="Ergebnisse als JSON schreiben")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    parser.add_argument(
+        "--server-url",
+        help="Laufenden Server messen statt einen eigenen zu starten (ohne RSS)",
+    )
+    parser.add_argument(
+        "--env",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Einstellung für den Server-Prozess",
+    )
+    parser.add_argument("--max-tokens", type=int, default=64)
+    parser.add_argument(
+        "--ollama-models", type=lambda v: v.split(","), default=["llama3.2:3b", "qwen2.5:7b"]
+    )
+    parser.add_argument("--ollama-latency-ms", type=float, default=50.0)
+    parser.add_argument("--ollama-tokens-per-second", type=float, default=200.0)
+    parser.add_argument("--ollama-parallel", type=int, default=4)
+    parser.add_argument("--ollama-load-ms", type=float, default=500.0)
+    parser.add_argument("--ollama-max-loaded", type=int, default=1)
+    parser.add_argument(
+        "--whisper-models", type=lambda v: v.split(","), default=["tiny", "base"]
+    )
+    parser.add_argument(
+        "--whisper-rtf",
+        type=float,
+        help="Simulierter Real-Time-Factor (Standard: je nach Modellgröße)",
+    )
+    parser.add_argument("--whisper-load-ms", type=float, default=300.0)
+    args = parser.parse_args(argv)
+
+    if not args.scenario or "all" in args.scenario:
+        args.scenario = list(SCENARIOS)
+    return args
+
+
+def main(argv: list[str] | None = None):
+    args = parse_args(argv)
+    report = asyncio.run(main_async(args))
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Ergebnisse geschrieben: {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
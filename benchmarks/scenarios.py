@@ -0,0 +1,203 @@
+"""
+Everlast AI Backend - Benchmark-Szenarien
+
+Jedes Szenario erzeugt aus einem HTTP-Client eine Request-Funktion, die der
+Harness mit laufendem Index aufruft.
+
+- ``generate``: parallele Text-Generierung
+- ``generate_stream``: parallele Token-Streams (misst zusätzlich TTFT)
+- ``chat``: parallele Chat-Completions
+- ``transcribe_mixed``: kurze, mittlere und lange Aufnahmen, teils gestreamt,
+  teils im Langaudio-Modus
+- ``model_switch``: abwechselnd verschiedene Whisper- und Ollama-Modelle
+"""
+
+import io
+import json
+import time
+import wave
+from dataclasses import dataclass, field
+from typing import Callable
+
+import httpx
+import numpy as np
+
+from benchmarks.harness import RequestFn
+
+SAMPLE_RATE = 16000
+
+
+def make_wav(seconds: float, speech_seconds: float = 4.0, pause_seconds: float = 0.8):
+    """
+    Synthetische Aufnahme: Tonfolgen ("Sprache") im Wechsel mit Pausen.
+
+    Die Pausen erlauben dem Langaudio-Modus, an Sprechpausen zu teilen.
+    """
+    rng = np.random.default_rng(int(seconds * 1000))
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    signal = 0.2 * np.sin(2 * np.pi * 220 * t) + 0.05 * rng.standard_normal(len(t))
+    period = speech_seconds + pause_seconds
+    signal[(t % period) >= speech_seconds] = 0.0
+    pcm = (np.clip(signal, -1.0, 1.0) * 32767).astype(np.int16)
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+
+@dataclass
+class ScenarioOptions:
+    """Parameter, die für alle Szenarien gelten."""
+
+    max_tokens: int = 64
+    ollama_models: list[str] = field(default_factory=lambda: ["llama3.2:3b"])
+    whisper_models: list[str] = field(default_factory=lambda: ["tiny", "base"])
+    clip_seconds: dict[str, float] = field(
+        default_factory=lambda: {"short": 3.0, "medium": 15.0, "long": 60.0}
+    )
+    _clips: dict[str, bytes] = field(default_factory=dict, repr=False)
+
+    def clip(self, name: str) -> bytes:
+        if name not in self._clips:
+            self._clips[name] = make_wav(self.clip_seconds[name])
+        return self._clips[name]
+
+
+def _prompt(index: int) -> str:
+    # Eindeutiger Prompt, damit kein Response-Cache greift
+    return f"Benchmark-Request {index}: fasse den Text zusammen."
+
+
+async def _transcribe(
+    client: httpx.AsyncClient,
+    audio: bytes,
+    model: str | None = None,
+    mode: str = "plain",
+):
+    data = {"language": "de"}
+    if model:
+        data["model"] = model
+    if mode == "stream":
+        data["stream"] = "true"
+    elif mode == "long_audio":
+        data["long_audio"] = "true"
+    response = await client.post(
+        "/api/v1/transcribe",
+        files={"audio": ("bench.wav", audio, "audio/wav")},
+        data=data,
+    )
+    response.raise_for_status()
+    if mode == "stream":
+        # Fehler nach Stream-Beginn kommen als Event, nicht als Statuscode
+        for line in response.text.splitlines():
+            event = json.loads(line)
+            if event["type"] == "error":
+                raise RuntimeError(event.get("detail", "Stream-Fehler"))
+
+
+def generate(client: httpx.AsyncClient, options: ScenarioOptions) -> RequestFn:
+    async def request(index: int):
+        response = await client.post(
+            "/api/v1/generate",
+            json={
+                "prompt": _prompt(index),
+                "model": options.ollama_models[0],
+                "max_tokens": options.max_tokens,
+            },
+        )
+        response.raise_for_status()
+
+    return request
+
+
+def generate_stream(client: httpx.AsyncClient, options: ScenarioOptions) -> RequestFn:
+    async def request(index: int):
+        started = time.perf_counter()
+        ttft = None
+        payload = {
+            "prompt": _prompt(index),
+            "model": options.ollama_models[0],
+            "max_tokens": options.max_tokens,
+            "stream": True,
+        }
+        async with client.stream("POST", "/api/v1/generate", json=payload) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                event = json.loads(line)
+                if event["type"] == "token" and ttft is None:
+                    ttft = time.perf_counter() - started
+                elif event["type"] == "error":
+                    raise RuntimeError(event.get("detail", "Stream-Fehler"))
+        return {"ttft": ttft} if ttft is not None else None
+
+    return request
+
+
+def chat(client: httpx.AsyncClient, options: ScenarioOptions) -> RequestFn:
+    async def request(index: int):
+        response = await client.post(
+            "/api/v1/chat",
+            json=[
+                {"role": "system", "content": "Du bist ein hilfreicher Assistent."},
+                {"role": "user", "content": _prompt(index)},
+            ],
+            params={"model": options.ollama_models[0], "max_tokens": options.max_tokens},
+        )
+        response.raise_for_status()
+
+    return request
+
+
+# (Clip, Modus) im Wechsel: überwiegend kurze Diktate, dazu Streams und Langaudio
+TRANSCRIBE_MIX = [
+    ("short", "plain"),
+    ("short", "plain"),
+    ("medium", "plain"),
+    ("short", "stream"),
+    ("medium", "stream"),
+    ("long", "long_audio"),
+]
+
+
+def transcribe_mixed(client: httpx.AsyncClient, options: ScenarioOptions) -> RequestFn:
+    async def request(index: int):
+        clip, mode = TRANSCRIBE_MIX[index % len(TRANSCRIBE_MIX)]
+        await _transcribe(client, options.clip(clip), mode=mode)
+
+    return request
+
+
+def model_switch(client: httpx.AsyncClient, options: ScenarioOptions) -> RequestFn:
+    async def request(index: int):
+        turn = index // 2
+        if index % 2 == 0:
+            model = options.whisper_models[turn % len(options.whisper_models)]
+            await _transcribe(client, options.clip("short"), model=model)
+        else:
+            model = options.ollama_models[turn % len(options.ollama_models)]
+            response = await client.post(
+                "/api/v1/generate",
+                json={
+                    "prompt": _prompt(index),
+                    "model": model,
+                    "max_tokens": options.max_tokens,
+                },
+            )
+            response.raise_for_status()
+
+    return request
+
+
+SCENARIOS: dict[str, Callable[[httpx.AsyncClient, ScenarioOptions], RequestFn]] = {
+    "generate": generate,
+    "generate_stream": generate_stream,
+    "chat": chat,
+    "transcribe_mixed": transcribe_mixed,
+    "model_switch": model_switch,
+}
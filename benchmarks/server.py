@@ -0,0 +1,41 @@
+"""
+Everlast AI Backend - Benchmark-Server
+
+Startet den echten Server, aber mit Whisper-Stub statt faster-whisper-Modell.
+Wird von ``benchmarks.run`` als eigener Prozess gestartet, damit dessen
+Speicherverbrauch getrennt vom Lastgenerator gemessen werden kann.
+
+    python -m benchmarks.server --port 8090
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Projektverzeichnis für "import main" (Aufruf als Modul aus beliebigem Ordner)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backend mit Whisper-Stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    args = parser.parse_args()
+
+    # Worker-Prozesse würden das echte faster-whisper laden
+    os.environ["WHISPER_BACKEND"] = "thread"
+
+    from benchmarks import stub_whisper
+
+    stub_whisper.install()
+
+    import uvicorn
+
+    from main import app
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
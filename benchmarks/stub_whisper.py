@@ -0,0 +1,113 @@
+"""
+Everlast AI Backend - Whisper-Stub
+
+Ersetzt ``faster_whisper.WhisperModel`` für Benchmarks durch ein Modell, das
+Ladezeit und Rechenzeit nur simuliert. So lassen sich Scheduler, Pool,
+Caches und API messen, ohne dass Modell-Downloads oder eine GPU nötig sind.
+
+Audio wird trotzdem echt dekodiert (PyAV), damit Uploads und Dekodierung
+realistisch in die Messung eingehen.
+"""
+
+import os
+import time
+import types
+from typing import Any, Iterator
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+# Simulierte Rechenzeit pro Sekunde Audio (Real-Time-Factor) je Modellgröße
+DEFAULT_RTF = {
+    "tiny": 0.02,
+    "base": 0.03,
+    "small": 0.06,
+    "medium": 0.12,
+    "large-v2": 0.2,
+    "large-v3": 0.2,
+}
+
+# Länge eines simulierten Segments in Sekunden
+SEGMENT_SECONDS = 5.0
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+class StubSegment(types.SimpleNamespace):
+    """Segment mit denselben Attributen wie ``faster_whisper.Segment``."""
+
+
+class StubWhisperModel:
+    """
+    Simuliertes ``WhisperModel``.
+
+    Ladezeit (``BENCH_WHISPER_LOAD_MS``) und Real-Time-Factor
+    (``BENCH_WHISPER_RTF``, sonst ``DEFAULT_RTF``) kommen aus der Umgebung,
+    damit sie auch in Worker-Prozessen gelten.
+    """
+
+    def __init__(self, model_size_or_path: str, device: str = "cpu", **kwargs: Any):
+        self.model_size = model_size_or_path
+        self.device = device
+        self.rtf = _env_float(
+            "BENCH_WHISPER_RTF", DEFAULT_RTF.get(model_size_or_path, 0.1)
+        )
+        time.sleep(_env_float("BENCH_WHISPER_LOAD_MS", 300.0) / 1000)
+
+    def _decode(self, audio: Any) -> np.ndarray:
+        if isinstance(audio, np.ndarray):
+            return audio
+        from faster_whisper.audio import decode_audio
+
+        return decode_audio(audio, sampling_rate=SAMPLE_RATE)
+
+    def transcribe(
+        self, audio: Any, language: str | None = None, **kwargs: Any
+    ) -> tuple[Iterator[StubSegment], types.SimpleNamespace]:
+        samples = self._decode(audio)
+        duration = len(samples) / SAMPLE_RATE
+        info = types.SimpleNamespace(
+            language=language or "de",
+            language_probability=1.0,
+            duration=duration,
+            duration_after_vad=duration,
+        )
+
+        def segments() -> Iterator[StubSegment]:
+            start = 0.0
+            index = 0
+            while start < duration:
+                end = min(duration, start + SEGMENT_SECONDS)
+                # Rechenzeit fällt wie bei faster-whisper beim Iterieren an
+                time.sleep((end - start) * self.rtf)
+                yield StubSegment(
+                    id=index,
+                    seek=int(start * 100),
+                    start=start,
+                    end=end,
+                    text=f" Segment {index}",
+                    tokens=[],
+                    avg_logprob=-0.2,
+                    compression_ratio=1.0,
+                    no_speech_prob=0.0,
+                    words=None,
+                    temperature=0.0,
+                )
+                start = end
+                index += 1
+
+        return segments(), info
+
+    def detect_language(self, audio: Any = None, **kwargs: Any):
+        return "de", 1.0, [("de", 1.0)]
+
+
+def install():
+    """Ersetzt ``faster_whisper.WhisperModel`` im aktuellen Prozess."""
+    import faster_whisper
+
+    faster_whisper.WhisperModel = StubWhisperModel
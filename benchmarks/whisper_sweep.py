@@ -0,0 +1,322 @@
+"""
+Everlast AI Backend - Whisper-Sweep
+
+Misst Real-Time-Factor, Spitzen-RSS und Wortfehlerrate (WER) für
+Kombinationen aus Modellgröße, Compute-Type, Beam-Size, ``cpu_threads`` und
+VAD über einem Referenzkorpus und schreibt ein empfohlenes Profil, das der
+Server über ``WHISPER_PROFILE_FILE`` lädt.
+
+Korpus: ein Verzeichnis mit Audiodateien und gleichnamigen ``.txt``-Dateien
+mit dem Referenztext (``interview.wav`` + ``interview.txt``).
+
+    python -m benchmarks.whisper_sweep korpus/ --models small,medium \\
+        --compute-types int8,int8_float32,float32 --beam-sizes 1,5 \\
+        --cpu-threads 0,8 --vad on,off \\
+        --output sweep.json --profile-output whisper_profile.json
+
+Jede Kombination läuft in einem eigenen Prozess, damit der Spitzen-RSS
+nicht von vorherigen Modellen verfälscht wird.
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+SAMPLE_RATE = 16000
+AUDIO_EXTENSIONS = {".wav", ".mp3", ".flac", ".ogg", ".m4a", ".webm"}
+
+
+@dataclass(frozen=True)
+class SweepConfig:
+    """Eine gemessene Kombination."""
+
+    model: str
+    compute_type: str
+    beam_size: int
+    cpu_threads: int
+    vad_filter: bool
+    device: str = "cpu"
+
+    @property
+    def label(self) -> str:
+        vad = "vad" if self.vad_filter else "novad"
+        return (
+            f"{self.model}/{self.compute_type}/beam{self.beam_size}"
+            f"/t{self.cpu_threads}/{vad}"
+        )
+
+
+# ----------------------------------------------------------------------
+# Wortfehlerrate
+# ----------------------------------------------------------------------
+
+
+def normalize_words(text: str) -> list[str]:
+    """Kleinschreibung, ohne Satzzeichen, an Leerraum getrennt."""
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+
+def word_errors(reference: list[str], hypothesis: list[str]) -> int:
+    """Levenshtein-Distanz auf Wortebene (Ersetzungen, Einfügungen, Löschungen)."""
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hypothesis, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (ref_word != hyp_word),
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+# ----------------------------------------------------------------------
+# Korpus und Messung
+# ----------------------------------------------------------------------
+
+
+def load_corpus(directory: str) -> list[tuple[str, str]]:
+    """(Audiodatei, Referenztext) für alle Dateien mit ``.txt`` daneben."""
+    corpus = []
+    for path in sorted(Path(directory).iterdir()):
+        if path.suffix.lower() not in AUDIO_EXTENSIONS:
+            continue
+        reference = path.with_suffix(".txt")
+        if not reference.exists():
+            print(f"Übersprungen (keine Referenz): {path.name}", file=sys.stderr)
+            continue
+        corpus.append((str(path), reference.read_text(encoding="utf-8").strip()))
+    return corpus
+
+
+def _peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: kB, macOS: Bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _measure(
+    config: SweepConfig,
+    corpus: list[tuple[str, str]],
+    language: Optional[str],
+    warmup: int,
+    dry_run: bool,
+) -> dict:
+    """Läuft im Kind-Prozess: Modell laden, Korpus transkribieren, messen."""
+    if dry_run:
+        from benchmarks import stub_whisper
+
+        stub_whisper.install()
+
+    from faster_whisper import WhisperModel
+    from faster_whisper.audio import decode_audio
+
+    # Audio vorab dekodieren: gemessen wird nur die Transkription
+    clips = [(decode_audio(path, sampling_rate=SAMPLE_RATE), ref) for path, ref in corpus]
+
+    started = time.perf_counter()
+    model = WhisperModel(
+        config.model,
+        device=config.device,
+        compute_type=config.compute_type,
+        cpu_threads=config.cpu_threads,
+    )
+    load_seconds = time.perf_counter() - started
+
+    options = {"beam_size": config.beam_size, "vad_filter": config.vad_filter}
+
+    def transcribe(audio) -> str:
+        segments, _ = model.transcribe(audio, language=language, **options)
+        return " ".join(segment.text.strip() for segment in segments)
+
+    for audio, _ in clips[:warmup]:
+        transcribe(audio)
+
+    decode_seconds = 0.0
+    audio_seconds = 0.0
+    errors = 0
+    reference_words = 0
+    for audio, reference in clips:
+        started = time.perf_counter()
+        hypothesis = transcribe(audio)
+        decode_seconds += time.perf_counter() - started
+        audio_seconds += len(audio) / SAMPLE_RATE
+        ref_words = normalize_words(reference)
+        errors += word_errors(ref_words, normalize_words(hypothesis))
+        reference_words += len(ref_words)
+
+    return {
+        "load_seconds": round(load_seconds, 3),
+        "audio_seconds": round(audio_seconds, 2),
+        "decode_seconds": round(decode_seconds, 3),
+        "rtf": round(decode_seconds / audio_seconds, 4) if audio_seconds else None,
+        "wer": round(errors / reference_words, 4) if reference_words else None,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def run_config(
+    config: SweepConfig,
+    corpus: list[tuple[str, str]],
+    language: Optional[str],
+    warmup: int,
+    dry_run: bool,
+) -> dict:
+    """Misst eine Kombination in einem frischen Prozess."""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        future = executor.submit(_measure, config, corpus, language, warmup, dry_run)
+        try:
+            measured = future.result()
+        except Exception as e:
+            # z.B. float16 auf CPU oder fehlendes Modell
+            return {**asdict(config), "error": f"{type(e).__name__}: {e}"}
+    return {**asdict(config), **measured}
+
+
+# ----------------------------------------------------------------------
+# Empfehlung
+# ----------------------------------------------------------------------
+
+
+def recommend(
+    results: list[dict],
+    max_wer_delta: float,
+    max_rss_mb: Optional[float] = None,
+) -> dict | None:
+    """
+    Schnellste Kombination, deren WER höchstens ``max_wer_delta`` über der
+    besten gemessenen WER liegt (und optional unter ``max_rss_mb`` bleibt).
+    """
+    valid = [r for r in results if r.get("rtf") is not None and r.get("wer") is not None]
+    if max_rss_mb is not None:
+        valid = [r for r in valid if (r.get("peak_rss_mb") or 0) <= max_rss_mb]
+    if not valid:
+        return None
+    best_wer = min(r["wer"] for r in valid)
+    candidates = [r for r in valid if r["wer"] <= best_wer + max_wer_delta]
+    return min(candidates, key=lambda r: (r["rtf"], r["wer"]))
+
+
+def build_profile(best: dict, corpus_size: int) -> dict:
+    """Profil im Format von ``WHISPER_PROFILE_FILE``."""
+    return {
+        "model": best["model"],
+        "device": best["device"],
+        "compute_type": best["compute_type"],
+        "beam_size": best["beam_size"],
+        "vad_filter": best["vad_filter"],
+        "cpu_threads": best["cpu_threads"],
+        "measured": {
+            "rtf": best["rtf"],
+            "wer": best["wer"],
+            "peak_rss_mb": best["peak_rss_mb"],
+            "load_seconds": best["load_seconds"],
+            "corpus_files": corpus_size,
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+    }
+
+
+def _csv(cast):
+    return lambda value: [cast(item.strip()) for item in value.split(",") if item.strip()]
+
+
+def _on_off(value: str) -> bool:
+    if value.lower() in ("on", "true", "1", "yes"):
+        return True
+    if value.lower() in ("off", "false", "0", "no"):
+        return False
+    raise argparse.ArgumentTypeError(f"on/off erwartet, nicht '{value}'")
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Whisper RTF/WER-Sweep")
+    parser.add_argument("corpus", help="Verzeichnis mit Audio + .txt-Referenzen")
+    parser.add_argument("--models", type=_csv(str), default=["small"])
+    parser.add_argument(
+        "--compute-types", type=_csv(str), default=["int8", "int8_float32", "float32"]
+    )
+    parser.add_argument("--beam-sizes", type=_csv(int), default=[1, 5])
+    parser.add_argument("--cpu-threads", type=_csv(int), default=[0])
+    parser.add_argument("--vad", type=_csv(_on_off), default=[True, False])
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--language", default="de")
+    parser.add_argument(
+        "--warmup", type=int, default=1, help="Ungemessene Durchläufe pro Kombination"
+    )
+    parser.add_argument(
+        "--max-wer-delta",
+        type=float,
+        default=0.02,
+        help="Erlaubter WER-Abstand zur besten Kombination (absolut)",
+    )
+    parser.add_argument("--max-rss-mb", type=float, help="Speicherobergrenze")
+    parser.add_argument("--output", help="Alle Messwerte als JSON")
+    parser.add_argument("--profile-output", default="whisper_profile.json")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Whisper-Stub statt echter Modelle (prüft nur den Ablauf)",
+    )
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        parser.error(f"Kein Korpus in {args.corpus} (Audio + gleichnamige .txt)")
+
+    configs = [
+        SweepConfig(model, compute_type, beam, threads, vad, args.device)
+        for model, compute_type, beam, threads, vad in itertools.product(
+            args.models, args.compute_types, args.beam_sizes, args.cpu_threads, args.vad
+        )
+    ]
+    print(f"{len(configs)} Kombinationen, {len(corpus)} Dateien")
+
+    results = []
+    for config in configs:
+        result = run_config(config, corpus, args.language, args.warmup, args.dry_run)
+        results.append(result)
+        if "error" in result:
+            print(f"  {config.label:<40} Fehler: {result['error']}")
+        else:
+            print(
+                f"  {config.label:<40} RTF {result['rtf']:.3f}  "
+                f"WER {result['wer']:.3f}  RSS {result['peak_rss_mb']} MB"
+            )
+
+    if args.output:
+        Path(args.output).write_text(
+            json.dumps({"corpus": args.corpus, "results": results}, indent=2),
+            encoding="utf-8",
+        )
+
+    best = recommend(results, args.max_wer_delta, args.max_rss_mb)
+    if best is None:
+        print("Keine gültige Kombination gemessen", file=sys.stderr)
+        sys.exit(1)
+    profile = build_profile(best, len(corpus))
+    Path(args.profile_output).write_text(json.dumps(profile, indent=2), encoding="utf-8")
+    chosen = SweepConfig(**{f.name: best[f.name] for f in fields(SweepConfig)})
+    print(f"Empfehlung: {chosen.label}")
+    print(f"Profil geschrieben: {args.profile_output} (WHISPER_PROFILE_FILE)")
+
+
+if __name__ == "__main__":
+    main()
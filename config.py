@@ -4,10 +4,37 @@ Everlast AI Backend - Konfiguration
 Zentrale Konfiguration für lokales KI-Backend mit GPU-Profilen.
 """
 
+import json
+import logging
+from functools import lru_cache
 from typing import Optional
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
+from hardware import hardware_detector
+
+logger = logging.getLogger(__name__)
+
+
+def _split_list(value: Optional[str]) -> list[str]:
+    """Kommagetrennte Liste aus einer Umgebungsvariable."""
+    return [item.strip() for item in (value or "").split(",") if item.strip()]
+
+
+@lru_cache(maxsize=4)
+def _load_whisper_profile(path: str) -> dict:
+    """Liest ein Whisper-Profil (JSON aus ``benchmarks.whisper_sweep``)."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            profile = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Whisper-Profil {path} nicht lesbar: {e}")
+        return {}
+    if not isinstance(profile, dict):
+        logger.warning(f"Whisper-Profil {path} ist kein JSON-Objekt")
+        return {}
+    return profile
+
 
 # GPU-Profile mit Modell-Empfehlungen
 GPU_PROFILES = {
@@ -53,26 +80,8 @@ GPU_PROFILES = {
 
 
 def detect_gpu_profile() -> str:
-    """Automatische GPU-Erkennung und Profil-Auswahl."""
-    try:
-        import pynvml
-
-        pynvml.nvmlInit()
-        handle = pynvml.nvmlDeviceGetHandleByIndex(0)
-        info = pynvml.nvmlDeviceGetMemoryInfo(handle)
-        vram_gb = info.total // (1024**3)
-        pynvml.nvmlShutdown()
-
-        if vram_gb >= 24:
-            return "24gb"
-        elif vram_gb >= 16:
-            return "16gb"
-        elif vram_gb >= 8:
-            return "8gb"
-        else:
-            return "cpu"
-    except Exception:
-        return "cpu"
+    """Automatische GPU-Erkennung und Profil-Auswahl (erzwingt eine neue Erkennung)."""
+    return hardware_detector.refresh().profile
 
 
 class Settings(BaseSettings):
@@ -87,18 +96,167 @@ class Settings(BaseSettings):
     ollama_base_url: str = Field(
         default="http://localhost:11434", alias="OLLAMA_BASE_URL"
     )
+    # Mehrere Ollama-Server (kommagetrennt), überschreibt OLLAMA_BASE_URL
+    ollama_base_urls: Optional[str] = Field(default=None, alias="OLLAMA_BASE_URLS")
+    # Weitere Backends, die ein fehlgeschlagener Request versuchen darf
+    ollama_failover_retries: int = Field(default=1, alias="OLLAMA_FAILOVER_RETRIES")
+    # Read-Timeout (Wartezeit auf Antwortdaten, z.B. bis zum nächsten Token)
     ollama_timeout: float = Field(default=120.0, alias="OLLAMA_TIMEOUT")
+    # Verbindungsaufbau, Senden des Requests, Warten auf freie Pool-Verbindung
+    ollama_connect_timeout: float = Field(default=5.0, alias="OLLAMA_CONNECT_TIMEOUT")
+    ollama_write_timeout: float = Field(default=30.0, alias="OLLAMA_WRITE_TIMEOUT")
+    ollama_pool_timeout: float = Field(default=30.0, alias="OLLAMA_POOL_TIMEOUT")
+    # Connection-Pool: max. Verbindungen, davon offen gehaltene, Keep-Alive (Sekunden)
+    ollama_max_connections: int = Field(default=32, alias="OLLAMA_MAX_CONNECTIONS")
+    ollama_max_keepalive: int = Field(default=16, alias="OLLAMA_MAX_KEEPALIVE")
+    ollama_keepalive_expiry: float = Field(default=30.0, alias="OLLAMA_KEEPALIVE_EXPIRY")
+    # Wiederholungen beim Verbindungsaufbau (pro Backend, vor dem Senden)
+    ollama_connect_retries: int = Field(default=2, alias="OLLAMA_CONNECT_RETRIES")
+    # HTTP/2 (nur hinter einem Proxy mit h2 sinnvoll, benötigt das Paket "h2")
+    ollama_http2: bool = Field(default=False, alias="OLLAMA_HTTP2")
     ollama_default_model: Optional[str] = Field(
         default=None, alias="OLLAMA_DEFAULT_MODEL"
     )
+    # Health-Monitor: Prüfintervall und Gültigkeit des gecachten Status (Sekunden)
+    ollama_health_interval: float = Field(default=5.0, alias="OLLAMA_HEALTH_INTERVAL")
+    ollama_health_ttl: float = Field(default=10.0, alias="OLLAMA_HEALTH_TTL")
+    # Circuit Breaker: Fehler bis zum Öffnen und Wartezeit bis zum Probe-Request
+    ollama_circuit_failure_threshold: int = Field(
+        default=3, alias="OLLAMA_CIRCUIT_FAILURE_THRESHOLD"
+    )
+    ollama_circuit_reset_timeout: float = Field(
+        default=10.0, alias="OLLAMA_CIRCUIT_RESET_TIMEOUT"
+    )
+    # Parallele Requests, die Ollama bedient (wie OLLAMA_NUM_PARALLEL des Servers)
+    ollama_num_parallel: int = Field(default=4, alias="OLLAMA_NUM_PARALLEL")
+    # Antwort-Cache für Generierungen mit temperature == 0 (TTL in Sekunden)
+    ollama_cache_enabled: bool = Field(default=True, alias="OLLAMA_CACHE_ENABLED")
+    ollama_cache_max_entries: int = Field(default=512, alias="OLLAMA_CACHE_MAX_ENTRIES")
+    ollama_cache_ttl: float = Field(default=3600.0, alias="OLLAMA_CACHE_TTL")
+    # Optionale SQLite-Datei als Disk-Tier (überlebt Neustarts)
+    ollama_cache_db: Optional[str] = Field(default=None, alias="OLLAMA_CACHE_DB")
+    # Wie lange Ollama ein Modell nach einem Request geladen hält ("30m", "-1" = immer)
+    ollama_keep_alive: Optional[str] = Field(default="30m", alias="OLLAMA_KEEP_ALIVE")
 
     # Whisper
     whisper_model: Optional[str] = Field(default=None, alias="WHISPER_MODEL")
     whisper_device: str = Field(default="auto", alias="WHISPER_DEVICE")
     whisper_compute_type: str = Field(default="auto", alias="WHISPER_COMPUTE_TYPE")
+    # Backend für Transkriptionen: "thread" (Default) oder "process"
+    whisper_backend: str = Field(default="thread", alias="WHISPER_BACKEND")
+    # Prozess-Backend: max. gleichzeitig geladene Modelle pro Worker-Prozess
+    whisper_process_max_models: int = Field(
+        default=1, alias="WHISPER_PROCESS_MAX_MODELS"
+    )
+    # Worker-Pool: parallele Transkriptionen und max. wartende Requests
+    whisper_workers: int = Field(default=2, alias="WHISPER_WORKERS")
+    whisper_max_queue: int = Field(default=16, alias="WHISPER_MAX_QUEUE")
+    # CTranslate2-Tuning: Threads pro Modell (0 = Default) und parallele Decoder
+    whisper_cpu_threads: int = Field(default=0, alias="WHISPER_CPU_THREADS")
+    whisper_num_workers: int = Field(default=1, alias="WHISPER_NUM_WORKERS")
+    # Decoder-Optionen (leer = aus WHISPER_PROFILE_FILE, sonst Beam 5 mit VAD)
+    whisper_beam_size: Optional[int] = Field(default=None, alias="WHISPER_BEAM_SIZE")
+    whisper_vad_filter: Optional[bool] = Field(default=None, alias="WHISPER_VAD_FILTER")
+    # Gemessenes Profil (python -m benchmarks.whisper_sweep): Modell, Compute-Type,
+    # Beam-Size, VAD und Threads; explizite Einstellungen haben Vorrang
+    whisper_profile_file: Optional[str] = Field(
+        default=None, alias="WHISPER_PROFILE_FILE"
+    )
+    # Micro-Batching kurzer Clips (nur Thread-Backend): max. Batch-Größe und Sammelfenster
+    whisper_batch_enabled: bool = Field(default=False, alias="WHISPER_BATCH_ENABLED")
+    whisper_batch_max_size: int = Field(default=8, alias="WHISPER_BATCH_MAX_SIZE")
+    whisper_batch_max_wait_ms: float = Field(
+        default=20.0, alias="WHISPER_BATCH_MAX_WAIT_MS"
+    )
+    # Speicherbudget für gleichzeitig geladene Whisper-Modelle (0 = aus GPU-Profil)
+    whisper_memory_budget_mb: int = Field(default=0, alias="WHISPER_MEMORY_BUDGET_MB")
+    # Streaming (WebSocket): Pause bis zum finalen Segment, Abstand der
+    # Zwischenergebnisse und max. Segmentlänge
+    whisper_stream_end_silence_ms: int = Field(
+        default=400, alias="WHISPER_STREAM_END_SILENCE_MS"
+    )
+    whisper_stream_partial_interval_ms: int = Field(
+        default=1000, alias="WHISPER_STREAM_PARTIAL_INTERVAL_MS"
+    )
+    whisper_stream_max_segment_seconds: float = Field(
+        default=25.0, alias="WHISPER_STREAM_MAX_SEGMENT_SECONDS"
+    )
+    # Langaudio-Modus: Mindestlänge der parallel transkribierten Abschnitte
+    whisper_long_min_chunk_seconds: float = Field(
+        default=30.0, alias="WHISPER_LONG_MIN_CHUNK_SECONDS"
+    )
+    # Batch-Jobs: SQLite-Datei, Ablage für Uploads, parallele Dateien
+    whisper_jobs_db: str = Field(default="data/jobs.db", alias="WHISPER_JOBS_DB")
+    whisper_jobs_dir: str = Field(default="data/jobs", alias="WHISPER_JOBS_DIR")
+    whisper_jobs_concurrency: int = Field(default=1, alias="WHISPER_JOBS_CONCURRENCY")
+    # Wurzelverzeichnis für Server-Pfade in Jobs (leer = nur Uploads erlaubt)
+    whisper_jobs_allowed_root: Optional[str] = Field(
+        default=None, alias="WHISPER_JOBS_ALLOWED_ROOT"
+    )
+    # Transkript-Cache (Schlüssel: SHA-256 des Audios, Modell, Sprache, Optionen)
+    whisper_cache_enabled: bool = Field(default=True, alias="WHISPER_CACHE_ENABLED")
+    whisper_cache_max_entries: int = Field(
+        default=256, alias="WHISPER_CACHE_MAX_ENTRIES"
+    )
+    whisper_cache_ttl: float = Field(default=86400.0, alias="WHISPER_CACHE_TTL")
+    # Optionale SQLite-Datei als Disk-Tier (überlebt Neustarts)
+    whisper_cache_db: Optional[str] = Field(default=None, alias="WHISPER_CACHE_DB")
+    # Uploads bis zu dieser Größe bleiben im Speicher, größere werden auf Disk gespoolt
+    whisper_spool_max_bytes: int = Field(
+        default=16 * 1024 * 1024, alias="WHISPER_SPOOL_MAX_BYTES"
+    )
+    # Vorverarbeitung in eigenem Thread-Pool: Dekodieren zu 16 kHz Mono,
+    # Stille am Anfang/Ende abschneiden (Energie-Gate), leeres Audio abweisen
+    whisper_preprocess_enabled: bool = Field(
+        default=True, alias="WHISPER_PREPROCESS_ENABLED"
+    )
+    whisper_preprocess_workers: int = Field(
+        default=2, alias="WHISPER_PREPROCESS_WORKERS"
+    )
+    whisper_preprocess_silence_db: float = Field(
+        default=-50.0, alias="WHISPER_PREPROCESS_SILENCE_DB"
+    )
+    whisper_preprocess_pad_ms: int = Field(
+        default=300, alias="WHISPER_PREPROCESS_PAD_MS"
+    )
+    # language=auto: Spracherkennung auf den ersten Sekunden, Ergebnis pro
+    # Sitzung/Client gemerkt (ab Mindest-Konfidenz) und wiederverwendet
+    whisper_language_detect_seconds: float = Field(
+        default=10.0, alias="WHISPER_LANGUAGE_DETECT_SECONDS"
+    )
+    whisper_language_hint_ttl: float = Field(
+        default=3600.0, alias="WHISPER_LANGUAGE_HINT_TTL"
+    )
+    whisper_language_hint_max_entries: int = Field(
+        default=10000, alias="WHISPER_LANGUAGE_HINT_MAX_ENTRIES"
+    )
+    whisper_language_hint_min_probability: float = Field(
+        default=0.7, alias="WHISPER_LANGUAGE_HINT_MIN_PROBABILITY"
+    )
+
+    # Warm-Pool: beim Start vorgeladene Modelle (kommagetrennt), Prüfintervall
+    # für das erneute Aufwärmen und Zeitfenster "kürzlich benutzter" Modelle
+    warm_whisper_models: Optional[str] = Field(
+        default=None, alias="WARM_WHISPER_MODELS"
+    )
+    warm_ollama_models: Optional[str] = Field(default=None, alias="WARM_OLLAMA_MODELS")
+    warm_interval: float = Field(default=60.0, alias="WARM_INTERVAL")
+    warm_usage_window: float = Field(default=1800.0, alias="WARM_USAGE_WINDOW")
 
     # GPU
     gpu_profile: str = Field(default="auto", alias="GPU_PROFILE")
+    # Intervall für erneute Hardware-Erkennung in Sekunden (0 = nur beim Start)
+    hardware_refresh_interval: float = Field(
+        default=0.0, alias="HARDWARE_REFRESH_INTERVAL"
+    )
+
+    # Prometheus-Metriken unter /metrics
+    metrics_enabled: bool = Field(default=True, alias="METRICS_ENABLED")
+
+    # Tracing: Request-ID + Server-Timing-Header, optionaler OTLP/JSON-Export
+    tracing_enabled: bool = Field(default=True, alias="TRACING_ENABLED")
+    trace_export_file: Optional[str] = Field(default=None, alias="TRACE_EXPORT_FILE")
+    trace_export_url: Optional[str] = Field(default=None, alias="TRACE_EXPORT_URL")
 
     # Logging
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
@@ -112,23 +270,62 @@ class Settings(BaseSettings):
         extra = "ignore"
 
     def get_gpu_profile(self) -> dict:
-        """Gibt das aktive GPU-Profil zurück."""
+        """Gibt das aktive GPU-Profil zurück (Auto-Erkennung ist gecacht)."""
         profile_name = self.gpu_profile
         if profile_name == "auto":
-            profile_name = detect_gpu_profile()
+            profile_name = hardware_detector.profile
         return GPU_PROFILES.get(profile_name, GPU_PROFILES["cpu"])
 
+    def get_ollama_base_urls(self) -> list[str]:
+        """Liste der Ollama-Server (OLLAMA_BASE_URLS oder OLLAMA_BASE_URL)."""
+        return _split_list(self.ollama_base_urls) or [self.ollama_base_url]
+
+    def get_ollama_keep_alive(self) -> str | int | None:
+        """``keep_alive`` für Ollama-Requests (reine Zahlen als Sekunden)."""
+        value = (self.ollama_keep_alive or "").strip()
+        if not value:
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            return value
+
+    def get_warm_whisper_models(self) -> list[str]:
+        """Whisper-Modelle, die beim Start vorgeladen werden."""
+        return _split_list(self.warm_whisper_models)
+
+    def get_warm_ollama_models(self) -> list[str]:
+        """Ollama-Modelle, die beim Start vorgeladen werden."""
+        return _split_list(self.warm_ollama_models)
+
     def get_default_llm_model(self) -> str:
         """Gibt das empfohlene LLM-Modell für das aktive Profil zurück."""
         if self.ollama_default_model:
             return self.ollama_default_model
         return self.get_gpu_profile()["recommended_llm"]
 
+    def get_whisper_profile(self) -> dict:
+        """
+        Gemessenes Whisper-Profil aus ``WHISPER_PROFILE_FILE``.
+
+        Ein Profil gilt nur für das Device, auf dem es gemessen wurde.
+        """
+        if not self.whisper_profile_file:
+            return {}
+        profile = _load_whisper_profile(self.whisper_profile_file)
+        device = profile.get("device")
+        if device and device != self.get_whisper_device():
+            return {}
+        return profile
+
     def get_default_stt_model(self) -> str:
         """Gibt das empfohlene STT-Modell für das aktive Profil zurück."""
         if self.whisper_model:
             return self.whisper_model
-        return self.get_gpu_profile()["recommended_stt"]
+        return (
+            self.get_whisper_profile().get("model")
+            or self.get_gpu_profile()["recommended_stt"]
+        )
 
     def get_whisper_device(self) -> str:
         """Bestimmt das Device für Whisper."""
@@ -146,6 +343,8 @@ class Settings(BaseSettings):
         """
         if self.whisper_compute_type != "auto":
             return self.whisper_compute_type
+        if compute_type := self.get_whisper_profile().get("compute_type"):
+            return compute_type
 
         profile = self.get_gpu_profile()
         if profile["vram_gb"] >= 8:
@@ -155,6 +354,35 @@ class Settings(BaseSettings):
             # CPU: int8 für bessere Performance
             return "int8"
 
+    def get_whisper_cpu_threads(self) -> int:
+        """CTranslate2-Threads pro Modell (0 = Default der Bibliothek)."""
+        if self.whisper_cpu_threads > 0:
+            return self.whisper_cpu_threads
+        return int(self.get_whisper_profile().get("cpu_threads") or 0)
+
+    def get_whisper_decode_options(self) -> dict:
+        """Beam-Size und VAD für Transkriptionen (Einstellung > Profil > Default)."""
+        profile = self.get_whisper_profile()
+        beam_size = self.whisper_beam_size or profile.get("beam_size") or 5
+        vad_filter = self.whisper_vad_filter
+        if vad_filter is None:
+            vad_filter = profile.get("vad_filter", True)
+        return {"beam_size": int(beam_size), "vad_filter": bool(vad_filter)}
+
+    def get_whisper_memory_budget_mb(self) -> int:
+        """Speicherbudget für den Whisper-Modell-Pool in MB.
+
+        Ohne explizite Angabe die Hälfte des VRAMs (Rest bleibt für Ollama),
+        auf CPU 4 GB RAM.
+        """
+        if self.whisper_memory_budget_mb > 0:
+            return self.whisper_memory_budget_mb
+
+        profile = self.get_gpu_profile()
+        if profile["vram_gb"] > 0:
+            return profile["vram_gb"] * 1024 // 2
+        return 4096
+
 
 # Global settings instance
 settings = Settings()
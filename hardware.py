@@ -0,0 +1,218 @@
+"""
+Everlast AI Backend - Hardware-Erkennung
+
+Einmalige GPU-Erkennung beim Start mit gecachtem Ergebnis.
+
+Die Erkennung läuft über einen austauschbaren Provider (Standard: NVML),
+damit sie auch auf reinen CPU-Maschinen getestet werden kann. Das Ergebnis
+wird als Snapshot gecacht und nur bei explizitem oder periodischem Refresh
+neu ermittelt.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Protocol
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class GPUDevice:
+    """Eine erkannte GPU."""
+
+    index: int
+    name: str
+    vram_total_bytes: int
+    vram_free_bytes: int = 0
+
+    @property
+    def vram_gb(self) -> int:
+        """VRAM in ganzen GB (abgerundet)."""
+        return self.vram_total_bytes // (1024**3)
+
+
+@dataclass(frozen=True)
+class HardwareSnapshot:
+    """Ergebnis einer Hardware-Erkennung."""
+
+    gpus: tuple[GPUDevice, ...] = field(default_factory=tuple)
+    profile: str = "cpu"
+    provider: str = "none"
+    detected_at: float = 0.0
+
+    @property
+    def max_vram_gb(self) -> int:
+        """VRAM der größten GPU in GB (0 ohne GPU)."""
+        return max((gpu.vram_gb for gpu in self.gpus), default=0)
+
+
+class HardwareProvider(Protocol):
+    """Schnittstelle für GPU-Erkennung (austauschbar für Tests)."""
+
+    name: str
+
+    def probe(self) -> list[GPUDevice]:
+        """Liefert alle erkannten GPUs."""
+        ...
+
+
+class NvmlProvider:
+    """GPU-Erkennung über NVML (nvidia-ml-py)."""
+
+    name = "nvml"
+
+    def probe(self) -> list[GPUDevice]:
+        try:
+            import pynvml
+        except ImportError:
+            logger.info("pynvml nicht installiert, keine GPU-Erkennung möglich")
+            return []
+
+        try:
+            pynvml.nvmlInit()
+        except Exception as e:
+            logger.info(f"NVML nicht verfügbar: {e}")
+            return []
+
+        try:
+            gpus = []
+            for index in range(pynvml.nvmlDeviceGetCount()):
+                handle = pynvml.nvmlDeviceGetHandleByIndex(index)
+                info = pynvml.nvmlDeviceGetMemoryInfo(handle)
+                name = pynvml.nvmlDeviceGetName(handle)
+                if isinstance(name, bytes):
+                    name = name.decode("utf-8", errors="replace")
+                gpus.append(
+                    GPUDevice(
+                        index=index,
+                        name=name,
+                        vram_total_bytes=info.total,
+                        vram_free_bytes=info.free,
+                    )
+                )
+            return gpus
+        except Exception as e:
+            logger.warning(f"Fehler bei der GPU-Erkennung: {e}")
+            return []
+        finally:
+            try:
+                pynvml.nvmlShutdown()
+            except Exception:
+                pass
+
+
+class StaticProvider:
+    """Provider mit fest vorgegebenen GPUs (für Tests und CPU-Maschinen)."""
+
+    name = "static"
+
+    def __init__(self, gpus: Optional[list[GPUDevice]] = None):
+        self._gpus = list(gpus or [])
+
+    def probe(self) -> list[GPUDevice]:
+        return list(self._gpus)
+
+
+def profile_for_vram(vram_gb: int) -> str:
+    """Wählt das GPU-Profil passend zum VRAM."""
+    if vram_gb >= 24:
+        return "24gb"
+    elif vram_gb >= 16:
+        return "16gb"
+    elif vram_gb >= 8:
+        return "8gb"
+    else:
+        return "cpu"
+
+
+class HardwareDetector:
+    """Cacht die Hardware-Erkennung; Zugriffe auf ``snapshot`` sind kostenlos."""
+
+    def __init__(self, provider: Optional[HardwareProvider] = None):
+        self._provider: HardwareProvider = provider or NvmlProvider()
+        self._snapshot: Optional[HardwareSnapshot] = None
+        self._lock = threading.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def provider(self) -> HardwareProvider:
+        """Aktiver Provider."""
+        return self._provider
+
+    @property
+    def snapshot(self) -> HardwareSnapshot:
+        """Gecachter Snapshot (wird beim ersten Zugriff einmalig ermittelt)."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._snapshot = self._probe()
+                snapshot = self._snapshot
+        return snapshot
+
+    @property
+    def profile(self) -> str:
+        """Name des erkannten GPU-Profils."""
+        return self.snapshot.profile
+
+    def _probe(self) -> HardwareSnapshot:
+        gpus = tuple(self._provider.probe())
+        snapshot = HardwareSnapshot(
+            gpus=gpus,
+            profile=profile_for_vram(max((g.vram_gb for g in gpus), default=0)),
+            provider=self._provider.name,
+            detected_at=time.time(),
+        )
+        logger.info(
+            f"Hardware erkannt: {len(gpus)} GPU(s), Profil: {snapshot.profile}"
+        )
+        return snapshot
+
+    def refresh(self) -> HardwareSnapshot:
+        """Erkennt die Hardware neu und ersetzt den gecachten Snapshot."""
+        with self._lock:
+            previous = self._snapshot
+            self._snapshot = self._probe()
+            if previous is not None and previous.profile != self._snapshot.profile:
+                logger.warning(
+                    f"GPU-Profil geändert: {previous.profile} -> "
+                    f"{self._snapshot.profile}"
+                )
+            return self._snapshot
+
+    def set_provider(self, provider: HardwareProvider) -> HardwareSnapshot:
+        """Tauscht den Provider aus (z.B. in Tests) und erkennt neu."""
+        self._provider = provider
+        return self.refresh()
+
+    def start_periodic_refresh(self, interval: float):
+        """Startet einen Hintergrund-Task, der alle ``interval`` Sekunden neu erkennt."""
+        if interval <= 0 or self._refresh_task is not None:
+            return
+
+        async def _loop():
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    await asyncio.to_thread(self.refresh)
+                except Exception as e:
+                    logger.warning(f"Hardware-Refresh fehlgeschlagen: {e}")
+
+        self._refresh_task = asyncio.create_task(_loop())
+
+    async def stop_periodic_refresh(self):
+        """Stoppt den periodischen Refresh."""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+
+# Global detector instance
+hardware_detector = HardwareDetector()
@@ -12,15 +12,26 @@ from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
 from config import settings
+from hardware import hardware_detector
+from api.metrics import MetricsMiddleware
 from api.routes import router
+from api.tracing import TracingMiddleware
+from services.audio import configure_upload_spooling
+from services.ollama_service import ollama_service
+from services.tracing import RequestIdLogFilter, span_exporter
+from services.transcription_jobs import transcription_jobs
+from services.warm_pool import warm_pool
 from services.whisper_service import whisper_service
 
 # Logging konfigurieren
 logging.basicConfig(
     level=getattr(logging, settings.log_level.upper()),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    format="%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s",
     datefmt="%Y-%m-%d %H:%M:%S",
 )
+# Request-ID in jeder Log-Zeile ("-" außerhalb eines Requests)
+for handler in logging.getLogger().handlers:
+    handler.addFilter(RequestIdLogFilter())
 logger = logging.getLogger(__name__)
 
 
@@ -28,23 +39,50 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     # Startup
+    # Hardware einmalig erkennen, danach wird nur noch der Cache gelesen
+    hardware_detector.refresh()
+    hardware_detector.start_periodic_refresh(settings.hardware_refresh_interval)
+
     logger.info("=" * 60)
     logger.info("Everlast AI Backend startet...")
     logger.info(f"GPU-Profil: {settings.get_gpu_profile()['name']}")
-    logger.info(f"Ollama URL: {settings.ollama_base_url}")
+    logger.info(f"Ollama URL: {', '.join(settings.get_ollama_base_urls())}")
     logger.info(f"Whisper-Modell: {settings.get_default_stt_model()}")
     logger.info(f"Whisper-Device: {settings.get_whisper_device()}")
+    if settings.get_whisper_profile():
+        logger.info(f"Whisper-Profil: {settings.whisper_profile_file}")
     logger.info("=" * 60)
 
-    # Optional: Whisper-Modell vorladen
-    # await whisper_service.load_model()
+    # HTTP-Client samt Connection-Pool vorab öffnen
+    ollama_service.open()
+
+    # Ollama-Status im Hintergrund überwachen (statt Probe pro Request)
+    ollama_service.start_health_monitor()
+
+    # Prozess-Backend starten (Worker laden ihr Modell beim Start)
+    whisper_service.start()
+
+    # Batch-Jobs fortsetzen (auch nach einem Neustart)
+    transcription_jobs.start()
+
+    # Modelle vorladen und kürzlich benutzte Modelle warm halten
+    warm_pool.start()
 
     yield
 
     # Shutdown
     logger.info("Everlast AI Backend wird beendet...")
-    whisper_service.unload_model()
+    await hardware_detector.stop_periodic_refresh()
+    await warm_pool.stop()
+    await ollama_service.stop_health_monitor()
+    await ollama_service.close()
+    await transcription_jobs.stop()
+    whisper_service.shutdown()
+    span_exporter.shutdown()
+
 
+# Uploads bis WHISPER_SPOOL_MAX_BYTES im Speicher halten (keine Temp-Datei)
+configure_upload_spooling(settings.whisper_spool_max_bytes)
 
 # FastAPI App erstellen
 app = FastAPI(
@@ -67,8 +105,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID", "Server-Timing"],
 )
 
+# Request-Dauer pro Route für /metrics
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
+# Request-ID, Spans pro Stufe und Server-Timing-Header (äußerste Middleware)
+if settings.tracing_enabled:
+    app.add_middleware(TracingMiddleware)
+
 # API-Router einbinden
 app.include_router(router)
 
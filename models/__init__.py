@@ -5,17 +5,39 @@ Everlast AI Backend - Pydantic Models
 from models.schemas import (
     GenerateRequest,
     GenerateResponse,
+    GenerateBatchRequest,
+    GenerateBatchItem,
+    GenerateBatchResponse,
+    DecodeOptions,
     TranscribeResponse,
+    TranscriptSegment,
+    TranscriptionJob,
+    TranscriptionJobItem,
+    TranscriptionJobResults,
+    StreamTranscribeConfig,
     HealthResponse,
     ModelInfo,
     GPUProfile,
+    GPUDeviceInfo,
+    HardwareInfo,
 )
 
 __all__ = [
     "GenerateRequest",
     "GenerateResponse",
+    "GenerateBatchRequest",
+    "GenerateBatchItem",
+    "GenerateBatchResponse",
+    "DecodeOptions",
     "TranscribeResponse",
+    "TranscriptSegment",
+    "TranscriptionJob",
+    "TranscriptionJobItem",
+    "TranscriptionJobResults",
+    "StreamTranscribeConfig",
     "HealthResponse",
     "ModelInfo",
     "GPUProfile",
+    "GPUDeviceInfo",
+    "HardwareInfo",
 ]
@@ -2,8 +2,8 @@
 Everlast AI Backend - Request/Response Schemas
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Literal, Optional
 
 
 class GenerateRequest(BaseModel):
@@ -14,6 +14,9 @@ class GenerateRequest(BaseModel):
     model: Optional[str] = Field(None, description="Modell-ID (Default aus Config)")
     max_tokens: int = Field(2048, ge=1, le=8192, description="Max Tokens in Antwort")
     temperature: float = Field(0.7, ge=0.0, le=2.0, description="Sampling Temperature")
+    stream: bool = Field(
+        False, description="Token-Stream (SSE oder NDJSON, je nach Accept-Header)"
+    )
 
 
 class GenerateResponse(BaseModel):
@@ -23,6 +26,80 @@ class GenerateResponse(BaseModel):
     model: str = Field(..., description="Verwendetes Modell")
     tokens_used: Optional[int] = Field(None, description="Verbrauchte Tokens")
     eval_duration_ms: Optional[int] = Field(None, description="Generierungszeit in ms")
+    cached: bool = Field(False, description="Antwort stammt aus dem Cache")
+
+
+class GenerateBatchRequest(BaseModel):
+    """Mehrere Generierungen in einem Request."""
+
+    requests: list[GenerateRequest] = Field(
+        ..., min_length=1, max_length=256, description="Einzel-Requests (ohne stream)"
+    )
+    concurrency: Optional[int] = Field(
+        None, ge=1, le=64, description="Max. parallel (Default: OLLAMA_NUM_PARALLEL)"
+    )
+    stream: bool = Field(
+        False, description="Ergebnisse einzeln senden, sobald sie fertig sind"
+    )
+
+
+class GenerateBatchItem(BaseModel):
+    """Ergebnis eines Einzel-Requests im Batch."""
+
+    index: int = Field(..., description="Position im Batch")
+    result: Optional[GenerateResponse] = Field(None, description="Ergebnis")
+    error: Optional[str] = Field(None, description="Fehlermeldung")
+
+
+class GenerateBatchResponse(BaseModel):
+    """Alle Ergebnisse eines Batches in Request-Reihenfolge."""
+
+    results: list[GenerateBatchItem]
+    succeeded: int = Field(..., description="Erfolgreiche Requests")
+    failed: int = Field(..., description="Fehlgeschlagene Requests")
+
+
+class TranscriptSegment(BaseModel):
+    """Segment eines Transkripts mit Zeitstempeln."""
+
+    id: int = Field(..., description="Laufende Nummer")
+    text: str = Field(..., description="Text des Segments")
+    start: float = Field(..., description="Start in Sekunden")
+    end: float = Field(..., description="Ende in Sekunden")
+    avg_logprob: Optional[float] = Field(None, description="Mittlere Log-Wahrscheinlichkeit")
+
+
+class DecodeOptions(BaseModel):
+    """Decoder-Optionen einer Transkription: Preset plus einzelne Überschreibungen."""
+
+    # frozen: hashbar (Batch-Gruppen), extra=forbid: Tippfehler fallen auf
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+    preset: Literal["fast", "accurate"] = Field(
+        "accurate",
+        description="fast = Greedy (Beam 1, ohne Temperatur-Fallback), "
+        "accurate = Beam-Search wie konfiguriert",
+    )
+    beam_size: Optional[int] = Field(None, ge=1, le=10, description="Beam-Size")
+    initial_prompt: Optional[str] = Field(
+        None, max_length=1000, description="Kontext/Fachbegriffe für das erste Fenster"
+    )
+    condition_on_previous_text: Optional[bool] = Field(
+        None, description="Vorherigen Text als Kontext für das nächste Fenster nutzen"
+    )
+    without_timestamps: Optional[bool] = Field(
+        None, description="Ohne Zeitstempel-Tokens dekodieren (schneller)"
+    )
+    vad_filter: Optional[bool] = Field(None, description="Voice Activity Detection")
+    vad_threshold: Optional[float] = Field(
+        None, gt=0.0, lt=1.0, description="VAD: Sprach-Schwellwert"
+    )
+    vad_min_silence_ms: Optional[int] = Field(
+        None, ge=0, le=10000, description="VAD: Mindestlänge einer Pause"
+    )
+    vad_speech_pad_ms: Optional[int] = Field(
+        None, ge=0, le=2000, description="VAD: Rand um erkannte Sprache"
+    )
 
 
 class TranscribeResponse(BaseModel):
@@ -31,7 +108,79 @@ class TranscribeResponse(BaseModel):
     text: str = Field(..., description="Transkribierter Text")
     duration: Optional[float] = Field(None, description="Audio-Dauer in Sekunden")
     language: Optional[str] = Field(None, description="Erkannte Sprache")
+    language_probability: Optional[float] = Field(
+        None, description="Konfidenz der Spracherkennung (nur bei language=auto)"
+    )
+    language_source: Optional[Literal["detected", "session"]] = Field(
+        None,
+        description="detected = für diesen Request erkannt, "
+        "session = aus vorherigem Request der Sitzung übernommen",
+    )
     model: str = Field(..., description="Verwendetes Whisper-Modell")
+    cached: bool = Field(False, description="Transkript stammt aus dem Cache")
+    segments: Optional[list[TranscriptSegment]] = Field(
+        None, description="Segmente mit Zeitstempeln (nur Langaudio-Modus)"
+    )
+
+
+class StreamTranscribeConfig(BaseModel):
+    """Erste Nachricht einer Streaming-Transkription (WebSocket)."""
+
+    format: Literal["pcm_s16le", "webm"] = Field(
+        "pcm_s16le",
+        description="pcm_s16le (Mono, 16 Bit) oder webm/ogg-Container (z.B. MediaRecorder)",
+    )
+    sample_rate: int = Field(
+        16000, ge=8000, le=96000, description="Samplerate (nur pcm_s16le)"
+    )
+    language: str = Field("de", description="Sprache (ISO 639-1) oder auto")
+    model: Optional[str] = Field(None, description="Whisper-Modell (Default aus Config)")
+    end_silence_ms: Optional[int] = Field(
+        None, ge=100, le=5000, description="Pause, nach der ein Segment final ist"
+    )
+    partial_interval_ms: Optional[int] = Field(
+        None, ge=0, le=10000, description="Abstand der Zwischenergebnisse (0 = aus)"
+    )
+    decode: Optional[DecodeOptions] = Field(
+        None, description="Decoder-Optionen (z.B. {\"preset\": \"fast\"})"
+    )
+
+
+class TranscriptionJob(BaseModel):
+    """Zustand eines Batch-Transkriptions-Jobs."""
+
+    id: str = Field(..., description="Job-ID")
+    status: Literal["queued", "running", "completed", "cancelled"] = Field(
+        ..., description="Job-Status"
+    )
+    language: str = Field(..., description="Sprache (ISO 639-1)")
+    model: Optional[str] = Field(None, description="Whisper-Modell (Default aus Config)")
+    long_audio: bool = Field(False, description="Langaudio-Modus")
+    total: int = Field(..., description="Anzahl Dateien")
+    done: int = Field(0, description="Erfolgreich transkribiert")
+    failed: int = Field(0, description="Fehlgeschlagen")
+    pending: int = Field(0, description="Noch offen (wartend oder laufend)")
+    created_at: float = Field(..., description="Erstellt (Unix-Zeit)")
+    updated_at: float = Field(..., description="Letzte Änderung (Unix-Zeit)")
+
+
+class TranscriptionJobItem(BaseModel):
+    """Eine Datei eines Transkriptions-Jobs."""
+
+    index: int = Field(..., description="Position im Job")
+    filename: str = Field(..., description="Dateiname bzw. Server-Pfad")
+    status: Literal["pending", "running", "done", "failed", "cancelled"] = Field(
+        ..., description="Status der Datei"
+    )
+    result: Optional[TranscribeResponse] = Field(None, description="Transkript")
+    error: Optional[str] = Field(None, description="Fehlermeldung")
+
+
+class TranscriptionJobResults(BaseModel):
+    """Job-Zustand mit allen Ergebnissen."""
+
+    job: TranscriptionJob
+    items: list[TranscriptionJobItem]
 
 
 class ModelInfo(BaseModel):
@@ -54,6 +203,24 @@ class GPUProfile(BaseModel):
     available_stt_models: list[str] = Field(..., description="Kompatible STT-Modelle")
 
 
+class GPUDeviceInfo(BaseModel):
+    """Eine erkannte GPU."""
+
+    index: int = Field(..., description="GPU-Index")
+    name: str = Field(..., description="GPU-Name")
+    vram_gb: int = Field(..., description="VRAM in GB")
+    vram_free_mb: int = Field(..., description="Freier VRAM in MB (zum Erkennungszeitpunkt)")
+
+
+class HardwareInfo(BaseModel):
+    """Ergebnis der (gecachten) Hardware-Erkennung."""
+
+    profile: str = Field(..., description="Erkanntes GPU-Profil")
+    provider: str = Field(..., description="Erkennungs-Provider (z.B. 'nvml')")
+    detected_at: float = Field(..., description="Zeitpunkt der Erkennung (Unix-Zeit)")
+    gpus: list[GPUDeviceInfo] = Field(default_factory=list, description="Erkannte GPUs")
+
+
 class HealthResponse(BaseModel):
     """Health-Check Response."""
 
@@ -63,4 +230,7 @@ class HealthResponse(BaseModel):
     ollama_available: bool = Field(..., description="Ollama erreichbar")
     ollama_models: list[str] = Field(default_factory=list, description="Verfügbare LLM-Modelle")
     whisper_available: bool = Field(..., description="Whisper geladen")
-    whisper_model: Optional[str] = Field(None, description="Aktives Whisper-Modell")
+    whisper_model: Optional[str] = Field(None, description="Zuletzt verwendetes Whisper-Modell")
+    whisper_models: list[str] = Field(
+        default_factory=list, description="Geladene Whisper-Modelle"
+    )
@@ -0,0 +1,433 @@
+"""
+Everlast AI Backend - Audio-Ingestion
+
+Übergabe von Audio an faster-whisper ohne Umweg über temporäre Dateien.
+
+Uploads werden von Starlette bis ``WHISPER_SPOOL_MAX_BYTES`` im Speicher
+gehalten und erst darüber auf Disk ausgelagert. Das resultierende
+File-Objekt wird direkt an faster-whisper (PyAV) übergeben – ohne
+zusätzliches Kopieren, Schreiben und Wiederöffnen.
+
+Für Streaming-Clients werden Container-Chunks (z.B. webm von MediaRecorder)
+inkrementell dekodiert.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import threading
+from typing import BinaryIO, Callable, Optional, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Eingabeformate, die WhisperService.transcribe akzeptiert
+AudioInput = Union[bytes, bytearray, memoryview, BinaryIO, np.ndarray, str]
+
+# Samplerate, die Whisper für PCM-Eingaben erwartet
+WHISPER_SAMPLE_RATE = 16000
+
+
+def configure_upload_spooling(max_memory_bytes: int) -> bool:
+    """
+    Setzt die Größe, ab der Multipart-Uploads auf Disk ausgelagert werden.
+
+    ``spool_max_size`` ist ein internes Attribut von Starlette; fehlt es in
+    der installierten Version, bleibt deren Standard aktiv (Rückgabe False).
+    """
+    from starlette.formparsers import MultiPartParser
+
+    if not hasattr(MultiPartParser, "spool_max_size"):
+        logger.warning(
+            "Starlette unterstützt kein MultiPartParser.spool_max_size - "
+            "WHISPER_SPOOL_MAX_BYTES wird ignoriert"
+        )
+        return False
+    MultiPartParser.spool_max_size = max_memory_bytes
+    return True
+
+
+def as_whisper_input(audio: AudioInput) -> Union[str, BinaryIO, np.ndarray]:
+    """
+    Normalisiert eine Audio-Eingabe für ``WhisperModel.transcribe``.
+
+    - Bytes werden ohne Kopie in ein ``BytesIO`` verpackt
+    - File-Objekte werden an den Anfang gespult
+    - NumPy-Arrays müssen 16 kHz Mono-PCM sein und werden zu float32
+    - Strings gelten als Dateipfad
+    """
+    if isinstance(audio, (bytes, bytearray, memoryview)):
+        return io.BytesIO(audio)
+    if isinstance(audio, np.ndarray):
+        if audio.ndim != 1:
+            raise ValueError("PCM-Audio muss einkanalig (1D) sein")
+        return audio.astype(np.float32, copy=False)
+    if isinstance(audio, str):
+        return audio
+    audio.seek(0)
+    return audio
+
+
+def decode_to_pcm(audio: AudioInput) -> np.ndarray:
+    """Dekodiert beliebiges Audio zu 16 kHz Mono float32-PCM."""
+    source = as_whisper_input(audio)
+    if isinstance(source, np.ndarray):
+        return source
+
+    from faster_whisper.audio import decode_audio
+
+    return decode_audio(source, sampling_rate=WHISPER_SAMPLE_RATE)
+
+
+class EmptyAudioError(ValueError):
+    """Audio ohne verwertbares Signal (keine Samples oder nur Stille)."""
+
+
+def is_empty_input(audio: AudioInput) -> bool:
+    """Leere Datei, leerer Upload oder PCM ohne Samples (PyAV würde scheitern)."""
+    source = as_whisper_input(audio)
+    if isinstance(source, np.ndarray):
+        return not len(source)
+    if isinstance(source, str):
+        return os.path.getsize(source) == 0
+    source.seek(0, io.SEEK_END)
+    empty = source.tell() == 0
+    source.seek(0)
+    return empty
+
+
+def decode_resampled(audio: AudioInput) -> np.ndarray:
+    """
+    Dekodiert zu 16 kHz Mono float32-PCM (ohne Umweg über 16-Bit-Samples).
+
+    Downmix und Ratenwandlung übernimmt libswresample (mit Tiefpass gegen
+    Aliasing). PCM-Arrays werden unverändert durchgereicht.
+    """
+    source = as_whisper_input(audio)
+    if isinstance(source, np.ndarray):
+        return source
+    if is_empty_input(source):
+        return np.zeros(0, dtype=np.float32)
+
+    import av
+
+    resampler = av.audio.resampler.AudioResampler(
+        format="fltp", layout="mono", rate=WHISPER_SAMPLE_RATE
+    )
+    parts: list[np.ndarray] = []
+    try:
+        with av.open(source, mode="r", metadata_errors="ignore") as container:
+            for frame in container.decode(audio=0):
+                frame.pts = None
+                for out in resampler.resample(frame):
+                    parts.append(out.to_ndarray()[0])
+            for out in resampler.resample(None):
+                parts.append(out.to_ndarray()[0])
+    finally:
+        if not isinstance(source, str):
+            source.seek(0)
+
+    if not parts:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate(parts).astype(np.float32, copy=False)
+
+
+def trim_silence(
+    pcm: np.ndarray,
+    threshold_db: float = -50.0,
+    pad_seconds: float = 0.3,
+    frame_seconds: float = 0.02,
+) -> tuple[int, int]:
+    """
+    Energie-Gate: ``(start, end)`` vom ersten bis zum letzten lauten Frame.
+
+    Ein Frame ist laut, wenn sein RMS-Pegel über ``threshold_db`` (dBFS)
+    liegt; ``pad_seconds`` bleiben vor und nach der Sprache erhalten, damit
+    Wortanfänge und -enden nicht abgeschnitten werden. Bei reiner Stille
+    ``(0, 0)``.
+    """
+    frame = max(1, int(frame_seconds * WHISPER_SAMPLE_RATE))
+    count = -(-len(pcm) // frame)
+    if not count:
+        return 0, 0
+    padded = np.zeros(count * frame, dtype=np.float32)
+    padded[: len(pcm)] = pcm
+    frames = padded.reshape(count, frame)
+    # Summe der Quadrate pro Frame ohne Zwischenkopie des ganzen Signals
+    energy = np.einsum("ij,ij->i", frames, frames) / frame
+    loud = np.flatnonzero(energy > 10 ** (threshold_db / 10))
+    if not len(loud):
+        return 0, 0
+    pad = int(pad_seconds * WHISPER_SAMPLE_RATE)
+    start = max(0, int(loud[0]) * frame - pad)
+    end = min(len(pcm), (int(loud[-1]) + 1) * frame + pad)
+    return start, end
+
+
+def decode_window(audio: AudioInput, seconds: float) -> np.ndarray:
+    """
+    Dekodiert nur die ersten ``seconds`` Sekunden zu 16 kHz Mono float32-PCM.
+
+    Für Vorab-Analysen (z.B. Spracherkennung), ohne die ganze Datei zu
+    dekodieren. File-Objekte werden danach zurückgespult.
+    """
+    source = as_whisper_input(audio)
+    limit = int(seconds * WHISPER_SAMPLE_RATE)
+    if isinstance(source, np.ndarray):
+        return source[:limit]
+    if is_empty_input(source):
+        return np.zeros(0, dtype=np.float32)
+
+    import av
+
+    resampler = av.audio.resampler.AudioResampler(
+        format="s16", layout="mono", rate=WHISPER_SAMPLE_RATE
+    )
+    parts: list[np.ndarray] = []
+    total = 0
+    try:
+        with av.open(source, mode="r", metadata_errors="ignore") as container:
+            for frame in container.decode(audio=0):
+                frame.pts = None
+                for out in resampler.resample(frame):
+                    samples = out.to_ndarray().reshape(-1)
+                    parts.append(samples)
+                    total += len(samples)
+                if total >= limit:
+                    break
+    finally:
+        if not isinstance(source, str):
+            source.seek(0)
+
+    if not parts:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate(parts)[:limit].astype(np.float32) / 32768.0
+
+
+def pcm_from_s16le(data: bytes) -> np.ndarray:
+    """Wandelt rohe 16-Bit-Mono-Samples (little endian) in float32-PCM."""
+    return np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+
+
+class PcmResampler:
+    """
+    Wandelt 16-Bit-Mono-Chunks (little endian) fortlaufend in 16 kHz float32-PCM.
+
+    Andere Raten laufen durch libswresample (mit Tiefpass gegen Aliasing);
+    der Filterzustand bleibt über Chunk-Grenzen erhalten, ``flush`` liefert
+    die zurückgehaltenen Samples am Stream-Ende.
+    """
+
+    def __init__(self, sample_rate: int = WHISPER_SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self._resampler = None
+        if sample_rate != WHISPER_SAMPLE_RATE:
+            import av
+
+            self._resampler = av.audio.resampler.AudioResampler(
+                format="fltp", layout="mono", rate=WHISPER_SAMPLE_RATE
+            )
+
+    def _convert(self, frame) -> np.ndarray:
+        parts = [out.to_ndarray()[0] for out in self._resampler.resample(frame)]
+        if not parts:
+            return np.zeros(0, dtype=np.float32)
+        return np.concatenate(parts).astype(np.float32, copy=False)
+
+    def push(self, data: bytes) -> np.ndarray:
+        """Nimmt einen Chunk (gerade Byte-Anzahl) entgegen."""
+        if self._resampler is None:
+            return pcm_from_s16le(data)
+
+        import av
+
+        samples = np.frombuffer(data, dtype="<i2").reshape(1, -1)
+        frame = av.AudioFrame.from_ndarray(samples, format="s16", layout="mono")
+        frame.sample_rate = self.sample_rate
+        return self._convert(frame)
+
+    def flush(self) -> np.ndarray:
+        """Restliche Samples aus dem Filterpuffer (Stream-Ende)."""
+        if self._resampler is None:
+            return np.zeros(0, dtype=np.float32)
+        return self._convert(None)
+
+
+class _ChunkPipe(io.RawIOBase):
+    """Blockierender Lese-Puffer, in den Audio-Chunks nachgeschoben werden."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._cond = threading.Condition()
+        self._eof = False
+        self._closed = False
+
+    def readable(self) -> bool:
+        return True
+
+    def write_chunk(self, data: bytes):
+        with self._cond:
+            if self._closed:
+                return  # kein Leser mehr
+            self._buffer += data
+            self._cond.notify_all()
+
+    def finish(self):
+        with self._cond:
+            self._eof = True
+            self._cond.notify_all()
+
+    def close_reader(self):
+        """Leser beendet: Reste verwerfen, weitere Chunks ignorieren."""
+        with self._cond:
+            self._eof = True
+            self._closed = True
+            self._buffer.clear()
+            self._cond.notify_all()
+
+    def readinto(self, target) -> int:
+        with self._cond:
+            while not self._buffer and not self._eof:
+                self._cond.wait()
+            n = min(len(target), len(self._buffer))
+            target[:n] = self._buffer[:n]
+            del self._buffer[:n]
+            return n
+
+
+class ContainerStreamDecoder:
+    """
+    Inkrementeller Decoder für wachsende Container-Streams (z.B. webm/opus
+    von MediaRecorder), deren Chunks einzeln nicht dekodierbar sind.
+
+    PyAV liest in einem eigenen Thread aus einem blockierenden Puffer und
+    liefert jedes dekodierte Stück als 16 kHz float32-PCM an ``on_pcm``.
+    ``on_end`` wird nach dem letzten Stück mit ``None`` bzw. dem Fehler
+    aufgerufen. Beide Callbacks laufen im Decoder-Thread.
+    """
+
+    def __init__(
+        self,
+        on_pcm: Callable[[np.ndarray], None],
+        on_end: Callable[[Optional[Exception]], None],
+    ):
+        self._pipe = _ChunkPipe()
+        self._on_pcm = on_pcm
+        self._on_end = on_end
+        self._thread = threading.Thread(
+            target=self._run, name="audio-stream-decoder", daemon=True
+        )
+        self._thread.start()
+
+    def feed(self, data: bytes):
+        """Schiebt einen weiteren Container-Chunk nach."""
+        self._pipe.write_chunk(data)
+
+    def finish(self):
+        """Signalisiert das Stream-Ende; der Decoder leert seine Puffer."""
+        self._pipe.finish()
+
+    def _run(self):
+        import av
+
+        error: Optional[Exception] = None
+        resampler = av.audio.resampler.AudioResampler(
+            format="s16", layout="mono", rate=WHISPER_SAMPLE_RATE
+        )
+        try:
+            # Minimales Probing: sonst wartet PyAV auf Megabytes an Daten
+            with av.open(
+                self._pipe,
+                mode="r",
+                options={"probesize": "32", "analyzeduration": "0"},
+                metadata_errors="ignore",
+            ) as container:
+                for frame in container.decode(audio=0):
+                    frame.pts = None
+                    for out in resampler.resample(frame):
+                        self._emit(out)
+                for out in resampler.resample(None):
+                    self._emit(out)
+        except Exception as e:
+            error = e
+        finally:
+            # Reste verwerfen; spätere Chunks landen nicht mehr im Puffer
+            self._pipe.close_reader()
+            self._on_end(error)
+
+    def _emit(self, frame):
+        samples = frame.to_ndarray().reshape(-1).astype(np.float32) / 32768.0
+        if len(samples):
+            self._on_pcm(samples)
+
+
+def split_at_silences(
+    pcm: np.ndarray, target_seconds: float
+) -> list[tuple[int, int]]:
+    """
+    Teilt PCM-Audio in Abschnitte von etwa ``target_seconds`` Länge.
+
+    Geschnitten wird nur in der Mitte von Sprechpausen (Silero-VAD aus
+    faster-whisper), damit kein Wort auf zwei Abschnitte fällt. Liefert
+    ``(start, end)`` in Samples; die Abschnitte decken das Audio lückenlos ab.
+    """
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    total = len(pcm)
+    target = int(target_seconds * WHISPER_SAMPLE_RATE)
+    if total <= target:
+        return [(0, total)]
+
+    speech = get_speech_timestamps(
+        pcm, VadOptions(min_silence_duration_ms=300, speech_pad_ms=100)
+    )
+    chunks: list[tuple[int, int]] = []
+    chunk_start = 0
+    for current, following in zip(speech, speech[1:]):
+        if current["end"] - chunk_start >= target:
+            cut = (current["end"] + following["start"]) // 2
+            chunks.append((chunk_start, cut))
+            chunk_start = cut
+    chunks.append((chunk_start, total))
+    return chunks
+
+
+_HASH_CHUNK = 1024 * 1024
+
+
+def hash_audio(audio: AudioInput) -> str:
+    """
+    SHA-256 über den Audio-Inhalt (für inhaltsadressierte Caches).
+
+    File-Objekte werden blockweise gelesen und danach zurückgespult,
+    PCM-Arrays über ihre float32-Samples gehasht.
+    """
+    digest = hashlib.sha256()
+    if isinstance(audio, (bytes, bytearray, memoryview)):
+        digest.update(audio)
+    elif isinstance(audio, np.ndarray):
+        digest.update(b"pcm:")
+        digest.update(np.ascontiguousarray(audio, dtype=np.float32).data)
+    elif isinstance(audio, str):
+        with open(audio, "rb") as f:
+            while chunk := f.read(_HASH_CHUNK):
+                digest.update(chunk)
+    else:
+        audio.seek(0)
+        while chunk := audio.read(_HASH_CHUNK):
+            digest.update(chunk)
+        audio.seek(0)
+    return digest.hexdigest()
+
+
+def describe_input(audio: AudioInput) -> str:
+    """Kurzbeschreibung einer Audio-Eingabe für Logs."""
+    if isinstance(audio, str):
+        return audio
+    if isinstance(audio, np.ndarray):
+        return f"PCM ({len(audio) / WHISPER_SAMPLE_RATE:.1f}s)"
+    if isinstance(audio, (bytes, bytearray, memoryview)):
+        return f"{len(audio)} bytes (Speicher)"
+    return getattr(audio, "name", None) or type(audio).__name__
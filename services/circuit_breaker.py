@@ -0,0 +1,110 @@
+"""
+Everlast AI Backend - Circuit Breaker
+
+Schneller Fehlschlag bei wiederholt nicht erreichbaren Backends.
+"""
+
+import logging
+import time
+from enum import Enum
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, Enum):
+    """Zustände des Circuit Breakers."""
+
+    CLOSED = "closed"  # Normalbetrieb
+    OPEN = "open"  # Backend gilt als ausgefallen, Requests werden abgewiesen
+    HALF_OPEN = "half_open"  # Probe-Request nach Ablauf des Reset-Timeouts
+
+
+class CircuitBreaker:
+    """
+    Einfacher Circuit Breaker.
+
+    Nach ``failure_threshold`` aufeinanderfolgenden Fehlern wird der Breaker
+    geöffnet. Nach ``reset_timeout`` Sekunden wird ein einzelner Probe-Request
+    durchgelassen; ist er erfolgreich, schließt der Breaker wieder.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        reset_timeout: float = 10.0,
+    ):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> CircuitState:
+        """Aktueller Zustand (OPEN geht nach dem Timeout in HALF_OPEN über)."""
+        if (
+            self._state == CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self.reset_timeout
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    @property
+    def consecutive_failures(self) -> int:
+        """Anzahl aufeinanderfolgender Fehler."""
+        return self._failures
+
+    def retry_after(self) -> float:
+        """Sekunden bis zum nächsten Probe-Request (0 wenn nicht offen)."""
+        if self.state != CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def can_attempt(self) -> bool:
+        """Wie ``allow_request``, meldet aber keinen Probe-Request an."""
+        state = self.state
+        return state == CircuitState.CLOSED or (
+            state == CircuitState.HALF_OPEN and not self._probe_in_flight
+        )
+
+    def allow_request(self) -> bool:
+        """Prüft, ob ein Request durchgelassen werden darf."""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def release_probe(self):
+        """Gibt einen abgebrochenen Probe-Request ohne Ergebnis wieder frei."""
+        self._probe_in_flight = False
+
+    def record_success(self):
+        """Erfolgreicher Request: Breaker schließen."""
+        if self._state != CircuitState.CLOSED:
+            logger.info(f"Circuit '{self.name}' geschlossen")
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        """Fehlgeschlagener Request: ggf. Breaker öffnen."""
+        self._failures += 1
+        self._probe_in_flight = False
+        if self._state == CircuitState.HALF_OPEN or (
+            self._state == CircuitState.CLOSED
+            and self._failures >= self.failure_threshold
+        ):
+            if self._state != CircuitState.OPEN:
+                logger.warning(
+                    f"Circuit '{self.name}' geöffnet nach "
+                    f"{self._failures} Fehlern"
+                )
+            self._state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
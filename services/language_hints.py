@@ -0,0 +1,69 @@
+"""
+Everlast AI Backend - Language Hints
+
+Merkt sich die erkannte Sprache pro Client bzw. Sitzung, damit bei
+``language=auto`` nur der erste Request einer Sitzung die Spracherkennung
+bezahlt. Einträge verfallen nach ``ttl`` Sekunden; bei mehr als
+``max_entries`` Sitzungen wird die am längsten unbenutzte verdrängt.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+
+@dataclass
+class LanguageHint:
+    """Erkannte Sprache einer Sitzung."""
+
+    language: str
+    probability: float
+    detected_at: float
+
+
+class LanguageHintCache:
+    """LRU-Cache Sitzung -> Sprache mit Ablaufzeit."""
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 3600.0):
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self._hints: OrderedDict[str, LanguageHint] = OrderedDict()
+
+        # Statistiken
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> LanguageHint | None:
+        """Sprache der Sitzung (None, wenn unbekannt oder abgelaufen)."""
+        hint = self._hints.get(key)
+        if hint is not None and time.monotonic() - hint.detected_at > self.ttl:
+            del self._hints[key]
+            hint = None
+        if hint is None:
+            self.misses += 1
+            return None
+        self._hints.move_to_end(key)
+        self.hits += 1
+        return hint
+
+    def put(self, key: str, language: str, probability: float):
+        """Speichert die erkannte Sprache einer Sitzung."""
+        self._hints[key] = LanguageHint(language, probability, time.monotonic())
+        self._hints.move_to_end(key)
+        while len(self._hints) > self.max_entries:
+            self._hints.popitem(last=False)
+
+    def clear(self):
+        self._hints.clear()
+
+    def stats(self) -> dict:
+        """Einträge und Trefferquote."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._hints),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else None,
+        }
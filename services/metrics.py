@@ -0,0 +1,287 @@
+"""
+Everlast AI Backend - Metrics
+
+Schlanke Prometheus-Metriken ohne externe Abhängigkeit.
+
+- Counter und Histogramme mit festen Buckets (eine Lock-Operation pro Messung)
+- Callback-Metriken, die erst beim Abruf von ``/metrics`` ausgewertet werden
+  (Queue-Tiefe, Cache-Kennzahlen, ...)
+- Ausgabe im Prometheus-Textformat (Version 0.0.4)
+"""
+
+import bisect
+import math
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Iterable, Sequence
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Sekunden: von schnellen Cache-Treffern bis zu langen Transkriptionen
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+LOAD_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+TOKENS_PER_SECOND_BUCKETS = (1, 2, 5, 10, 15, 20, 30, 50, 75, 100, 150, 200, 300)
+RTF_BUCKETS = (0.01, 0.02, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 5.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    @abstractmethod
+    def render(self) -> list[str]:
+        """Zeilen im Prometheus-Textformat (inkl. HELP/TYPE)."""
+
+
+class Counter(_Metric):
+    """Monoton steigender Zähler."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = list(self._values.items())
+        lines = self._header()
+        for key, value in values:
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Histogramm mit festen Bucket-Grenzen."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> (Zähler pro Bucket + Überlauf, Summe)
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> list[str]:
+        with self._lock:
+            snapshot = [
+                (key, list(counts), total)
+                for key, (counts, total) in self._series.items()
+            ]
+        lines = self._header()
+        for key, counts, total in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                labels = _format_labels(self.labelnames, key, le)
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class CallbackMetric(_Metric):
+    """Wert(e) werden erst beim Abruf über eine Funktion ermittelt."""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str],
+        collect: Callable[[], Iterable[tuple[Sequence[str], float]]],
+        kind: str = "gauge",
+    ):
+        super().__init__(name, help, labelnames)
+        self.kind = kind
+        self._collect = collect
+
+    def render(self) -> list[str]:
+        lines = self._header()
+        for key, value in self._collect():
+            if value is None:
+                continue
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Sammlung aller Metriken eines Prozesses."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metrik '{metric.name}' ist bereits registriert")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def callback(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str],
+        collect: Callable[[], Iterable[tuple[Sequence[str], float]]],
+        kind: str = "gauge",
+    ) -> CallbackMetric:
+        return self._register(CallbackMetric(name, help, labelnames, collect, kind))
+
+    def render(self) -> str:
+        """Alle Metriken im Prometheus-Textformat."""
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Global registry
+registry = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "everlast_http_request_duration_seconds",
+    "Dauer der HTTP-Requests nach Route (bis zum Ende der Antwort)",
+    ("method", "route", "status"),
+)
+OLLAMA_TTFT_SECONDS = registry.histogram(
+    "everlast_ollama_ttft_seconds",
+    "Zeit bis zum ersten Token bei gestreamten Generierungen",
+    ("model",),
+)
+OLLAMA_TOKENS_PER_SECOND = registry.histogram(
+    "everlast_ollama_tokens_per_second",
+    "Generierungsgeschwindigkeit laut Ollama (eval_count / eval_duration)",
+    ("model",),
+    buckets=TOKENS_PER_SECOND_BUCKETS,
+)
+OLLAMA_TOKENS = registry.counter(
+    "everlast_ollama_tokens_total", "Von Ollama generierte Tokens", ("model",)
+)
+WHISPER_QUEUE_WAIT_SECONDS = registry.histogram(
+    "everlast_whisper_queue_wait_seconds",
+    "Wartezeit auf einen freien Transkriptions-Worker",
+    ("priority",),
+)
+WHISPER_DECODE_SECONDS = registry.histogram(
+    "everlast_whisper_decode_seconds",
+    "Reine Transkriptionsdauer im Worker",
+    ("model", "preset"),
+)
+WHISPER_REAL_TIME_FACTOR = registry.histogram(
+    "everlast_whisper_real_time_factor",
+    "Transkriptionsdauer / Audiodauer (< 1 = schneller als Echtzeit)",
+    ("model", "preset"),
+    buckets=RTF_BUCKETS,
+)
+WHISPER_AUDIO_SECONDS = registry.counter(
+    "everlast_whisper_audio_seconds_total", "Transkribierte Audiodauer", ("model",)
+)
+WHISPER_LANGUAGE_DETECTIONS = registry.counter(
+    "everlast_whisper_language_total",
+    "Sprachen bei language=auto (detected = erkannt, session = aus Sitzung übernommen)",
+    ("language", "source"),
+)
+MODEL_LOAD_SECONDS = registry.histogram(
+    "everlast_model_load_seconds",
+    "Ladezeit von Modellen",
+    ("kind", "model"),
+    buckets=LOAD_BUCKETS,
+)
+
+
+def observe_generation(
+    model: str, eval_count: int | None, eval_duration_ns: int | None
+):
+    """Erfasst Tokens und Tokens/s einer Ollama-Generierung."""
+    if not eval_count:
+        return
+    OLLAMA_TOKENS.inc(eval_count, model=model)
+    if eval_duration_ns:
+        tokens_per_second = eval_count / (eval_duration_ns / 1e9)
+        OLLAMA_TOKENS_PER_SECOND.observe(tokens_per_second, model=model)
+
+
+def observe_transcription(
+    model: str,
+    decode_seconds: float,
+    audio_seconds: float,
+    preset: str = "accurate",
+):
+    """Erfasst Dauer und Real-Time-Factor einer Transkription (pro Decoder-Preset)."""
+    WHISPER_DECODE_SECONDS.observe(decode_seconds, model=model, preset=preset)
+    if audio_seconds > 0:
+        WHISPER_AUDIO_SECONDS.inc(audio_seconds, model=model)
+        WHISPER_REAL_TIME_FACTOR.observe(
+            decode_seconds / audio_seconds, model=model, preset=preset
+        )
+
+
+def observe_language_detection(language: str, source: str):
+    """Zählt eine automatisch bestimmte Sprache nach Herkunft."""
+    WHISPER_LANGUAGE_DETECTIONS.inc(language=language, source=source)
@@ -0,0 +1,285 @@
+"""
+Everlast AI Backend - Ollama Backends
+
+Verwaltung mehrerer Ollama-Server (z.B. ein Ollama pro GPU-Knoten).
+
+- Pro Backend: eigener HTTP-Client, Circuit Breaker und Health-Status
+- Modell-Liste pro Backend aus ``/api/tags``
+- Routing nach den wenigsten laufenden Requests (Least Outstanding Requests),
+  bevorzugt auf Backends, die das angefragte Modell installiert haben
+"""
+
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Iterable, Optional
+
+import httpx
+
+from config import settings
+from models.schemas import ModelInfo
+from services.circuit_breaker import CircuitBreaker, CircuitState
+
+logger = logging.getLogger(__name__)
+
+# Gewicht neuer Messwerte im gleitenden Latenz-Mittel
+_LATENCY_ALPHA = 0.2
+
+
+class OllamaUnavailableError(RuntimeError):
+    """Kein Ollama-Backend kann den Request annehmen."""
+
+
+def parse_models(data: dict) -> list[ModelInfo]:
+    """Wandelt die Antwort von ``/api/tags`` in ModelInfo-Objekte."""
+    models = []
+    for m in data.get("models", []):
+        # Modellgröße aus Name extrahieren (z.B. "llama3.2:8b" -> "8B")
+        name = m.get("name", "")
+        size = None
+        if ":" in name:
+            size_part = name.split(":")[-1].upper()
+            if any(c.isdigit() for c in size_part):
+                size = size_part
+
+        models.append(
+            ModelInfo(
+                name=name,
+                size=size,
+                modified_at=m.get("modified_at"),
+                digest=m.get("digest"),
+            )
+        )
+    return models
+
+
+def normalize_model(model: str) -> str:
+    """Vollständiger Modellname wie in ``/api/tags`` (ohne Tag = ``:latest``)."""
+    return model if ":" in model else f"{model}:latest"
+
+
+def contains_model(names: Iterable[str], model: str) -> bool:
+    """Prüft, ob ``model`` in ``names`` vorkommt (ohne Tag = ``:latest``)."""
+    names = set(names)
+    return model in names or normalize_model(model) in names
+
+
+def is_retryable(error: Exception) -> bool:
+    """Fehler, bei denen ein anderes Backend den Request übernehmen kann."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return isinstance(error, (httpx.TransportError, OllamaUnavailableError))
+
+
+class OllamaBackend:
+    """Ein einzelner Ollama-Server mit eigenem Client und Health-Status."""
+
+    def __init__(self, url: str, timeout: float):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self._client: httpx.AsyncClient | None = None
+        self.breaker = CircuitBreaker(
+            f"ollama:{self.url}",
+            failure_threshold=settings.ollama_circuit_failure_threshold,
+            reset_timeout=settings.ollama_circuit_reset_timeout,
+        )
+
+        self.available: bool | None = None
+        self.checked_at = 0.0
+        self.last_error: str | None = None
+        self.models: list[ModelInfo] = []
+
+        # Statistiken
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.latency_ms: float | None = None
+
+    # ------------------------------------------------------------------
+    # HTTP-Client
+    # ------------------------------------------------------------------
+
+    def _build_client(self) -> httpx.AsyncClient:
+        """Erzeugt den HTTP-Client mit Pool-, Timeout- und Retry-Einstellungen."""
+        http2 = settings.ollama_http2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("OLLAMA_HTTP2 gesetzt, aber 'h2' fehlt - nutze HTTP/1.1")
+                http2 = False
+
+        limits = httpx.Limits(
+            max_connections=settings.ollama_max_connections,
+            max_keepalive_connections=settings.ollama_max_keepalive,
+            keepalive_expiry=settings.ollama_keepalive_expiry,
+        )
+        timeout = httpx.Timeout(
+            connect=settings.ollama_connect_timeout,
+            read=self.timeout,
+            write=settings.ollama_write_timeout,
+            pool=settings.ollama_pool_timeout,
+        )
+        # retries greift nur bei ConnectError/ConnectTimeout
+        transport = httpx.AsyncHTTPTransport(
+            limits=limits,
+            http2=http2,
+            retries=settings.ollama_connect_retries,
+        )
+        return httpx.AsyncClient(
+            base_url=self.url, timeout=timeout, transport=transport
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP-Client (wird bei Bedarf geöffnet)."""
+        if self._client is None:
+            self._client = self._build_client()
+        return self._client
+
+    async def close(self):
+        """Schließt den HTTP-Client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # ------------------------------------------------------------------
+    # Health-Status
+    # ------------------------------------------------------------------
+
+    def health_is_fresh(self) -> bool:
+        return (
+            self.available is not None
+            and time.monotonic() - self.checked_at < settings.ollama_health_ttl
+        )
+
+    def mark_up(self):
+        if self.available is False:
+            logger.info(f"Ollama-Backend {self.url} wieder erreichbar")
+        self.available = True
+        self.checked_at = time.monotonic()
+        self.last_error = None
+        self.breaker.record_success()
+
+    def mark_down(self, error: Exception):
+        if self.available is not False:
+            logger.warning(f"Ollama-Backend {self.url} nicht erreichbar: {error}")
+        self.available = False
+        self.checked_at = time.monotonic()
+        self.last_error = str(error)
+        self.breaker.record_failure()
+
+    def is_routable(self) -> bool:
+        """Prüft ohne Seiteneffekte, ob das Backend Requests annehmen kann."""
+        state = self.breaker.state
+        if state == CircuitState.CLOSED:
+            return not (self.health_is_fresh() and self.available is False)
+        return self.breaker.can_attempt()
+
+    def has_model(self, model: str) -> bool:
+        """Prüft, ob das Modell laut ``/api/tags`` installiert ist."""
+        return contains_model((m.name for m in self.models), model)
+
+    async def check_health(self) -> bool:
+        """Fragt ``/api/tags`` ab und aktualisiert Status und Modell-Liste."""
+        try:
+            response = await self.client.get("/api/tags")
+            response.raise_for_status()
+            self.models = parse_models(response.json())
+            self.mark_up()
+        except Exception as e:
+            self.mark_down(e)
+        return bool(self.available)
+
+    async def running_models(self) -> set[str]:
+        """Aktuell im Speicher geladene Modelle laut ``/api/ps`` (leer bei Fehler)."""
+        try:
+            response = await self.client.get("/api/ps")
+            response.raise_for_status()
+        except httpx.HTTPError:
+            return set()
+        return {m.get("name", "") for m in response.json().get("models", [])}
+
+    @asynccontextmanager
+    async def track(self):
+        """
+        Zählt einen laufenden Request und wertet ihn für den Health-Status aus.
+
+        4xx-Antworten (z.B. unbekanntes Modell) zählen als erreichbar.
+        """
+        self.in_flight += 1
+        self.requests += 1
+        started = time.perf_counter()
+        try:
+            yield
+        except httpx.HTTPStatusError as e:
+            self.failures += 1
+            if e.response.status_code < 500:
+                self.mark_up()
+            else:
+                self.mark_down(e)
+            raise
+        except httpx.TransportError as e:
+            self.failures += 1
+            self.mark_down(e)
+            raise
+        except BaseException:
+            # Abbruch (CancelledError, GeneratorExit) oder sonstiger Fehler:
+            # kein Urteil über das Backend, aber den Probe-Slot freigeben
+            self.breaker.release_probe()
+            raise
+        else:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if self.latency_ms is None:
+                self.latency_ms = elapsed_ms
+            else:
+                self.latency_ms += _LATENCY_ALPHA * (elapsed_ms - self.latency_ms)
+            self.mark_up()
+        finally:
+            self.in_flight -= 1
+
+    def stats(self) -> dict:
+        """Kennzahlen und Status des Backends."""
+        return {
+            "url": self.url,
+            "available": self.available,
+            "circuit_state": self.breaker.state.value,
+            "consecutive_failures": self.breaker.consecutive_failures,
+            "last_error": self.last_error,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "failures": self.failures,
+            "latency_ms": (
+                round(self.latency_ms, 1) if self.latency_ms is not None else None
+            ),
+            "models": [m.name for m in self.models],
+        }
+
+
+def pick_backend(
+    backends: Iterable[OllamaBackend],
+    model: Optional[str] = None,
+    exclude: Iterable[OllamaBackend] = (),
+) -> OllamaBackend | None:
+    """
+    Wählt das Backend mit den wenigsten laufenden Requests.
+
+    Backends, die das Modell installiert haben, werden bevorzugt; meldet kein
+    Backend das Modell (z.B. Modell-Liste noch unbekannt), kommen alle in
+    Frage. Bei Gleichstand entscheidet die gemessene Latenz. Das gewählte
+    Backend hat den Request bereits beim Circuit Breaker angemeldet.
+    """
+    excluded = set(map(id, exclude))
+    candidates = [b for b in backends if id(b) not in excluded and b.is_routable()]
+    if model:
+        with_model = [b for b in candidates if b.has_model(model)]
+        candidates = with_model or candidates
+
+    candidates.sort(
+        key=lambda b: (b.in_flight, b.latency_ms if b.latency_ms is not None else 0.0)
+    )
+    for backend in candidates:
+        # HALF_OPEN: nur ein Probe-Request, ggf. nächstes Backend
+        if backend.breaker.allow_request():
+            return backend
+    return None
@@ -2,15 +2,32 @@
 Everlast AI Backend - Ollama Service
 
 HTTP-Wrapper für die Ollama API zur LLM-Generierung.
+
+Mit mehreren Ollama-Servern (``OLLAMA_BASE_URLS``) wird jeder Request an das
+Backend mit den wenigsten laufenden Requests geleitet; fällt es aus, übernimmt
+ein anderes Backend.
 """
 
+import asyncio
+import json
 import logging
-from typing import Optional
-
-import httpx
+import time
+from typing import AsyncIterator, Awaitable, Callable, Optional
 
 from config import settings
-from models.schemas import GenerateResponse, ModelInfo
+from models.schemas import GenerateRequest, GenerateResponse, ModelInfo
+from services.circuit_breaker import CircuitState
+from services.metrics import OLLAMA_TTFT_SECONDS, observe_generation
+from services.ollama_backends import (
+    OllamaBackend,
+    OllamaUnavailableError,
+    contains_model,
+    is_retryable,
+    normalize_model,
+    pick_backend,
+)
+from services.response_cache import ResponseCache, make_cache_key
+from services.tracing import add_span, outgoing_headers, span
 
 logger = logging.getLogger(__name__)
 
@@ -24,72 +41,333 @@ class OllamaService:
         timeout: float | None = None,
         default_model: str | None = None,
     ):
-        self.base_url = base_url or settings.ollama_base_url
         self.timeout = timeout or settings.ollama_timeout
+        urls = [base_url] if base_url else settings.get_ollama_base_urls()
+        self.backends = [OllamaBackend(url, self.timeout) for url in urls]
+        self.base_url = self.backends[0].url
         self._default_model = default_model
-        self._client: httpx.AsyncClient | None = None
+
+        # Gecachter Health-Status pro Backend (aktiv per Monitor, passiv per
+        # echten Calls); hier die zusammengeführte Modell-Liste
+        self._models: list[ModelInfo] = []
+        self._last_used: dict[str, float] = {}
+        self._monitor_task: asyncio.Task | None = None
+
+        # Antwort-Cache für deterministische Generierungen (temperature == 0)
+        self._digests: dict[str, str] = {}
+        self._cache: ResponseCache | None = None
+        if settings.ollama_cache_enabled:
+            self._cache = ResponseCache(
+                "ollama",
+                max_entries=settings.ollama_cache_max_entries,
+                ttl=settings.ollama_cache_ttl,
+                db_path=settings.ollama_cache_db,
+            )
 
     @property
     def default_model(self) -> str:
         """Gibt das Standard-Modell zurück."""
         return self._default_model or settings.get_default_llm_model()
 
-    def _get_client(self) -> httpx.AsyncClient:
-        """Lazy-initialisiere den HTTP-Client."""
-        if self._client is None:
-            self._client = httpx.AsyncClient(
-                base_url=self.base_url,
-                timeout=self.timeout,
-            )
-        return self._client
+    def open(self):
+        """Öffnet die HTTP-Clients vorab (der erste Request baut sie nicht auf)."""
+        for backend in self.backends:
+            backend.client
+        logger.info(
+            f"Ollama-Clients: {len(self.backends)} Backend(s), max. "
+            f"{settings.ollama_max_connections} Verbindungen, "
+            f"Keep-Alive {settings.ollama_keepalive_expiry}s"
+        )
+
+    # ------------------------------------------------------------------
+    # Health-Status
+    # ------------------------------------------------------------------
+
+    @property
+    def circuit_state(self) -> CircuitState:
+        """Zustand der Circuit Breaker (CLOSED, solange ein Backend geschlossen ist)."""
+        states = {b.breaker.state for b in self.backends}
+        for state in (CircuitState.CLOSED, CircuitState.HALF_OPEN):
+            if state in states:
+                return state
+        return CircuitState.OPEN
+
+    @property
+    def cached_models(self) -> list[ModelInfo]:
+        """Zuletzt von ``/api/tags`` gemeldete Modelle (aller Backends)."""
+        return list(self._models)
+
+    @property
+    def _available(self) -> bool | None:
+        states = [b.available for b in self.backends]
+        if any(states):
+            return True
+        return None if all(a is None for a in states) else False
+
+    def allow_request(self) -> bool:
+        """
+        Prüft ohne Netzwerkzugriff, ob ein Request an Ollama sinnvoll ist.
+
+        Abgewiesen wird nur, wenn bei allen Backends der Circuit Breaker offen
+        ist oder der gecachte Status (innerhalb der TTL) "nicht erreichbar" meldet.
+        """
+        return any(b.is_routable() for b in self.backends)
+
+    def retry_after(self) -> int:
+        """Empfohlene Wartezeit in Sekunden für abgewiesene Requests."""
+        wait = min(b.breaker.retry_after() for b in self.backends)
+        return max(1, int(wait + 0.999))
+
+    async def check_health(self) -> bool:
+        """Fragt ``/api/tags`` aller Backends ab und aktualisiert den Status."""
+        await asyncio.gather(*(b.check_health() for b in self.backends))
+        models: dict[str, ModelInfo] = {}
+        for backend in self.backends:
+            if backend.available:
+                for m in backend.models:
+                    models.setdefault(m.name, m)
+        self._update_models(list(models.values()))
+        return bool(self._available)
 
     async def is_available(self) -> bool:
-        """Prüft, ob Ollama erreichbar ist."""
-        try:
-            client = self._get_client()
-            response = await client.get("/api/tags")
-            return response.status_code == 200
-        except Exception as e:
-            logger.warning(f"Ollama nicht erreichbar: {e}")
+        """Prüft, ob Ollama erreichbar ist (gecacht für ``OLLAMA_HEALTH_TTL``)."""
+        if all(b.health_is_fresh() for b in self.backends):
+            return bool(self._available)
+        return await self.check_health()
+
+    def health_info(self) -> dict:
+        """Health-Details für Diagnose-Endpoints."""
+        checked = [b.checked_at for b in self.backends if b.available is not None]
+        errors = [b.last_error for b in self.backends if b.last_error]
+        return {
+            "available": self._available,
+            "age_seconds": (
+                round(time.monotonic() - min(checked), 1) if checked else None
+            ),
+            "circuit_state": self.circuit_state.value,
+            "consecutive_failures": min(
+                b.breaker.consecutive_failures for b in self.backends
+            ),
+            "last_error": errors[0] if errors else None,
+            "backends": self.backend_stats(),
+        }
+
+    def backend_stats(self) -> list[dict]:
+        """Status, laufende Requests und Latenz pro Backend."""
+        return [b.stats() for b in self.backends]
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+
+    def _prepare(self, payload: dict):
+        """Setzt ``keep_alive`` und merkt sich die Nutzung des Modells."""
+        keep_alive = settings.get_ollama_keep_alive()
+        if keep_alive is not None:
+            payload.setdefault("keep_alive", keep_alive)
+        self._last_used[payload["model"]] = time.monotonic()
+
+    def _pick(
+        self, model: Optional[str], tried: list[OllamaBackend]
+    ) -> OllamaBackend | None:
+        backend = pick_backend(self.backends, model, exclude=tried)
+        if backend is not None:
+            tried.append(backend)
+        return backend
+
+    def _can_fail_over(self, error: Exception, tried: list[OllamaBackend]) -> bool:
+        """Ein anderes Backend versuchen? (nur vor der ersten Antwort)"""
+        if not is_retryable(error) or len(tried) > settings.ollama_failover_retries:
             return False
+        # Ohne Seiteneffekt prüfen (pick_backend meldet Probe-Requests an)
+        if not any(b not in tried and b.is_routable() for b in self.backends):
+            return False
+        logger.warning(
+            f"Ollama-Backend {tried[-1].url} fehlgeschlagen ({error}), Failover"
+        )
+        return True
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        model: Optional[str] = None,
+        payload: Optional[dict] = None,
+    ) -> dict:
+        """
+        Führt einen Request auf dem am wenigsten ausgelasteten Backend aus.
+
+        Alle genutzten Ollama-Calls sind idempotent; bei Verbindungsfehlern
+        oder 5xx wird daher bis zu ``OLLAMA_FAILOVER_RETRIES`` mal auf ein
+        anderes Backend gewechselt.
+        """
+        if payload is not None and "model" in payload:
+            self._prepare(payload)
+        tried: list[OllamaBackend] = []
+        error: Exception = OllamaUnavailableError("Kein Ollama-Backend verfügbar")
+        while (backend := self._pick(model, tried)) is not None:
+            try:
+                with span("ollama", backend=backend.url, path=path):
+                    async with backend.track():
+                        response = await backend.client.request(
+                            method, path, json=payload, headers=outgoing_headers()
+                        )
+                        response.raise_for_status()
+                return response.json()
+            except Exception as e:
+                error = e
+                if not self._can_fail_over(e, tried):
+                    raise
+        raise error
+
+    def start_health_monitor(self, interval: float | None = None):
+        """Startet den Hintergrund-Monitor für den Health-Status."""
+        interval = interval if interval is not None else settings.ollama_health_interval
+        if interval <= 0 or self._monitor_task is not None:
+            return
+
+        async def _loop():
+            while True:
+                await self.check_health()
+                await asyncio.sleep(interval)
+
+        self._monitor_task = asyncio.create_task(_loop())
+
+    async def stop_health_monitor(self):
+        """Stoppt den Hintergrund-Monitor."""
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            try:
+                await self._monitor_task
+            except asyncio.CancelledError:
+                pass
+            self._monitor_task = None
+
+    # ------------------------------------------------------------------
+    # Modelle
+    # ------------------------------------------------------------------
+
+    def _update_models(self, models: list[ModelInfo]):
+        """Übernimmt die Modell-Liste; geänderte Digests invalidieren den Cache."""
+        self._models = models
+        for m in models:
+            if not m.digest:
+                continue
+            name = normalize_model(m.name)
+            previous = self._digests.get(name)
+            if previous is not None and previous != m.digest:
+                logger.info(f"Modell '{m.name}' wurde aktualisiert (neuer Digest)")
+                if self._cache is not None:
+                    self._cache.invalidate_tag(name)
+            self._digests[name] = m.digest
 
     async def list_models(self) -> list[ModelInfo]:
         """Liste aller installierten Modelle."""
-        try:
-            client = self._get_client()
-            response = await client.get("/api/tags")
-            response.raise_for_status()
-            data = response.json()
-
-            models = []
-            for m in data.get("models", []):
-                # Modellgröße aus Name extrahieren (z.B. "llama3.2:8b" -> "8B")
-                name = m.get("name", "")
-                size = None
-                if ":" in name:
-                    size_part = name.split(":")[-1].upper()
-                    if any(c.isdigit() for c in size_part):
-                        size = size_part
-
-                models.append(
-                    ModelInfo(
-                        name=name,
-                        size=size,
-                        modified_at=m.get("modified_at"),
-                        digest=m.get("digest"),
-                    )
-                )
-
-            return models
-        except Exception as e:
-            logger.error(f"Fehler beim Abrufen der Modelle: {e}")
-            return []
+        if not await self.check_health():
+            logger.error("Fehler beim Abrufen der Modelle: kein Backend erreichbar")
+        return self.cached_models
 
     async def list_model_names(self) -> list[str]:
         """Liste aller Modellnamen (nur Namen)."""
         models = await self.list_models()
         return [m.name for m in models]
 
+    # ------------------------------------------------------------------
+    # Vorladen
+    # ------------------------------------------------------------------
+
+    def recently_used(self, window: float) -> list[str]:
+        """Modelle, die in den letzten ``window`` Sekunden angefragt wurden."""
+        cutoff = time.monotonic() - window
+        return [model for model, used in self._last_used.items() if used >= cutoff]
+
+    async def warm_model(self, model: str, only_cold: bool = False) -> dict[str, float]:
+        """
+        Lädt ein Modell auf allen Backends, die es installiert haben.
+
+        Ein Request ohne Prompt lädt das Modell nur (mit ``keep_alive``). Mit
+        ``only_cold`` werden Backends übersprungen, auf denen es laut
+        ``/api/ps`` bereits geladen ist. Liefert die Ladezeit pro Backend.
+        """
+        backends = [
+            b
+            for b in self.backends
+            if b.is_routable() and (b.has_model(model) or not b.models)
+        ]
+        results = await asyncio.gather(
+            *(self._warm_on(b, model, only_cold) for b in backends)
+        )
+        return {b.url: t for b, t in zip(backends, results) if t is not None}
+
+    async def _warm_on(
+        self, backend: OllamaBackend, model: str, only_cold: bool
+    ) -> float | None:
+        if only_cold and contains_model(await backend.running_models(), model):
+            return None
+        payload = {"model": model}
+        keep_alive = settings.get_ollama_keep_alive()
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
+        started = time.perf_counter()
+        try:
+            response = await backend.client.post("/api/generate", json=payload)
+            response.raise_for_status()
+        except Exception as e:
+            logger.warning(
+                f"Vorladen von '{model}' auf {backend.url} fehlgeschlagen: {e}"
+            )
+            return None
+        # Ollama meldet die reine Ladezeit in ns (ohne Netzwerk)
+        load_duration = response.json().get("load_duration")
+        if load_duration is not None:
+            return load_duration / 1e9
+        return time.perf_counter() - started
+
+    # ------------------------------------------------------------------
+    # Antwort-Cache
+    # ------------------------------------------------------------------
+
+    @property
+    def cache(self) -> ResponseCache | None:
+        """Antwort-Cache (None, wenn deaktiviert)."""
+        return self._cache
+
+    def _is_cacheable(self, temperature: float) -> bool:
+        # Nur deterministische Generierungen sind wiederverwendbar
+        return self._cache is not None and temperature == 0
+
+    def _cache_key(self, endpoint: str, model: str, **request) -> str:
+        return make_cache_key(
+            {
+                "endpoint": endpoint,
+                "model": model,
+                "digest": self._digests.get(normalize_model(model)),
+                **request,
+            }
+        )
+
+    async def _cached(
+        self,
+        key: str,
+        model: str,
+        compute: Callable[[], Awaitable[GenerateResponse]],
+    ) -> GenerateResponse:
+        """Liefert die Antwort aus dem Cache oder berechnet sie genau einmal."""
+
+        async def _compute() -> dict:
+            return (await compute()).model_dump(exclude={"cached"})
+
+        data, cached = await self._cache.get_or_compute(
+            key, _compute, tag=normalize_model(model)
+        )
+        if cached:
+            logger.info(f"Antwort aus Cache: {model}")
+        return GenerateResponse(**data, cached=cached)
+
+    # ------------------------------------------------------------------
+    # Generierung
+    # ------------------------------------------------------------------
+
     async def generate(
         self,
         prompt: str,
@@ -112,8 +390,35 @@ class OllamaService:
             GenerateResponse mit generiertem Text
         """
         model = model or self.default_model
-        client = self._get_client()
+        if not self._is_cacheable(temperature):
+            return await self._generate_uncached(
+                prompt, system_prompt, model, max_tokens, temperature
+            )
 
+        key = self._cache_key(
+            "generate",
+            model,
+            prompt=prompt,
+            system=system_prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+        )
+        return await self._cached(
+            key,
+            model,
+            lambda: self._generate_uncached(
+                prompt, system_prompt, model, max_tokens, temperature
+            ),
+        )
+
+    async def _generate_uncached(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        model: str,
+        max_tokens: int,
+        temperature: float,
+    ) -> GenerateResponse:
         logger.info(f"Generiere mit Modell: {model}")
 
         # Request-Payload aufbauen
@@ -131,15 +436,14 @@ class OllamaService:
             payload["system"] = system_prompt
 
         # API-Aufruf
-        response = await client.post("/api/generate", json=payload)
-        response.raise_for_status()
-        data = response.json()
+        data = await self._request("POST", "/api/generate", model, payload)
 
         # Response parsen
         text = data.get("response", "")
         actual_model = data.get("model", model)
         eval_count = data.get("eval_count")
         eval_duration = data.get("eval_duration")
+        observe_generation(model, eval_count, eval_duration)
 
         # Dauer in ms konvertieren (Ollama gibt ns zurück)
         eval_duration_ms = None
@@ -158,6 +462,54 @@ class OllamaService:
             eval_duration_ms=eval_duration_ms,
         )
 
+    async def generate_batch(
+        self,
+        requests: list[GenerateRequest],
+        concurrency: Optional[int] = None,
+    ) -> AsyncIterator[tuple[int, GenerateResponse | Exception]]:
+        """
+        Führt mehrere Generierungen mit begrenzter Parallelität aus.
+
+        Liefert ``(index, ergebnis)`` in Fertigstellungs-Reihenfolge; ein
+        Fehler betrifft nur sein eigenes Element und wird als Exception
+        geliefert. Öffnet der Circuit Breaker während des Batches, schlagen
+        die restlichen Elemente sofort fehl.
+
+        Args:
+            requests: Einzel-Requests (``stream`` wird ignoriert)
+            concurrency: Max. gleichzeitige Requests (Default: ``OLLAMA_NUM_PARALLEL``)
+        """
+        limit = asyncio.Semaphore(max(1, concurrency or settings.ollama_num_parallel))
+
+        async def run(index: int, request: GenerateRequest):
+            async with limit:
+                if not self.allow_request():
+                    return index, RuntimeError("Ollama nicht erreichbar")
+                try:
+                    return index, await self.generate(
+                        prompt=request.prompt,
+                        system_prompt=request.system_prompt,
+                        model=request.model,
+                        max_tokens=request.max_tokens,
+                        temperature=request.temperature,
+                    )
+                except Exception as e:
+                    logger.warning(f"Batch-Element {index} fehlgeschlagen: {e}")
+                    return index, e
+
+        logger.info(f"Batch-Generierung: {len(requests)} Requests")
+        tasks = [
+            asyncio.ensure_future(run(index, request))
+            for index, request in enumerate(requests)
+        ]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            # Vorzeitig geschlossen (z.B. Client getrennt): Rest abbrechen
+            for task in tasks:
+                task.cancel()
+
     async def generate_chat(
         self,
         messages: list[dict],
@@ -178,24 +530,41 @@ class OllamaService:
             GenerateResponse
         """
         model = model or self.default_model
-        client = self._get_client()
+        if not self._is_cacheable(temperature):
+            return await self._chat_uncached(messages, model, max_tokens, temperature)
+
+        key = self._cache_key(
+            "chat",
+            model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+        )
+        return await self._cached(
+            key,
+            model,
+            lambda: self._chat_uncached(messages, model, max_tokens, temperature),
+        )
 
+    async def _chat_uncached(
+        self,
+        messages: list[dict],
+        model: str,
+        max_tokens: int,
+        temperature: float,
+    ) -> GenerateResponse:
         logger.info(f"Chat mit Modell: {model}, {len(messages)} Messages")
 
-        response = await client.post(
-            "/api/chat",
-            json={
-                "model": model,
-                "messages": messages,
-                "stream": False,
-                "options": {
-                    "num_predict": max_tokens,
-                    "temperature": temperature,
-                },
+        payload = {
+            "model": model,
+            "messages": messages,
+            "stream": False,
+            "options": {
+                "num_predict": max_tokens,
+                "temperature": temperature,
             },
-        )
-        response.raise_for_status()
-        data = response.json()
+        }
+        data = await self._request("POST", "/api/chat", model, payload)
 
         # Response parsen
         message = data.get("message", {})
@@ -203,6 +572,7 @@ class OllamaService:
         actual_model = data.get("model", model)
         eval_count = data.get("eval_count")
         eval_duration = data.get("eval_duration")
+        observe_generation(model, eval_count, eval_duration)
 
         eval_duration_ms = None
         if eval_duration:
@@ -215,11 +585,186 @@ class OllamaService:
             eval_duration_ms=eval_duration_ms,
         )
 
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        model: Optional[str] = None,
+        max_tokens: int = 2048,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[dict]:
+        """
+        Generiere Text mit Ollama als Token-Stream.
+
+        Liefert ``{"type": "token", "text": ...}`` Events und zum Abschluss
+        ein ``{"type": "done", ...}`` Event mit Time-to-first-Token und den
+        Ollama-Statistiken (``eval_count``/``eval_duration``).
+
+        Wird der Generator vorzeitig geschlossen (z.B. Client-Disconnect),
+        wird die Verbindung zu Ollama geschlossen und die Generierung dort
+        abgebrochen.
+        """
+        model = model or self.default_model
+
+        logger.info(f"Streame Generierung mit Modell: {model}")
+
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": True,
+            "options": {
+                "num_predict": max_tokens,
+                "temperature": temperature,
+            },
+        }
+
+        if system_prompt:
+            payload["system"] = system_prompt
+
+        async for event in self._stream(
+            "/api/generate", payload, lambda data: data.get("response", "")
+        ):
+            yield event
+
+    async def generate_chat_stream(
+        self,
+        messages: list[dict],
+        model: Optional[str] = None,
+        max_tokens: int = 2048,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[dict]:
+        """
+        Chat-Completion als Token-Stream.
+
+        Event-Format wie bei ``generate_stream``.
+        """
+        model = model or self.default_model
+
+        logger.info(f"Streame Chat mit Modell: {model}, {len(messages)} Messages")
+
+        payload = {
+            "model": model,
+            "messages": messages,
+            "stream": True,
+            "options": {
+                "num_predict": max_tokens,
+                "temperature": temperature,
+            },
+        }
+
+        async for event in self._stream(
+            "/api/chat",
+            payload,
+            lambda data: data.get("message", {}).get("content", ""),
+        ):
+            yield event
+
+    async def _stream(
+        self,
+        path: str,
+        payload: dict,
+        extract_text: Callable[[dict], str],
+    ) -> AsyncIterator[dict]:
+        """
+        Relayt die NDJSON-Chunks eines Ollama-Streaming-Calls als Events.
+
+        Ein Failover auf ein anderes Backend ist nur möglich, solange noch
+        kein Event an den Client gegangen ist.
+        """
+        self._prepare(payload)
+        tried: list[OllamaBackend] = []
+        error: Exception = OllamaUnavailableError("Kein Ollama-Backend verfügbar")
+        while (backend := self._pick(payload["model"], tried)) is not None:
+            events = self._stream_from(backend, path, payload, extract_text)
+            try:
+                try:
+                    first = await anext(events)
+                except StopAsyncIteration:
+                    return
+                except Exception as e:
+                    error = e
+                    if not self._can_fail_over(e, tried):
+                        raise
+                    continue
+                yield first
+                async for event in events:
+                    yield event
+                return
+            finally:
+                await events.aclose()
+        raise error
+
+    async def _stream_from(
+        self,
+        backend: OllamaBackend,
+        path: str,
+        payload: dict,
+        extract_text: Callable[[dict], str],
+    ) -> AsyncIterator[dict]:
+        started = time.perf_counter()
+        started_ns = time.time_ns()
+        ttft_ms: Optional[int] = None
+        chars = 0
+        headers = outgoing_headers()
+
+        async with (
+            backend.track(),
+            backend.client.stream(
+                "POST", path, json=payload, headers=headers
+            ) as response,
+        ):
+            response.raise_for_status()
+
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+
+                data = json.loads(line)
+                if data.get("error"):
+                    raise RuntimeError(f"Ollama-Fehler: {data['error']}")
+
+                text = extract_text(data)
+                if text:
+                    if ttft_ms is None:
+                        ttft = time.perf_counter() - started
+                        ttft_ms = int(ttft * 1000)
+                        OLLAMA_TTFT_SECONDS.observe(ttft, model=payload["model"])
+                        add_span("ollama_ttft", started_ns, backend=backend.url)
+                    chars += len(text)
+                    yield {"type": "token", "text": text}
+
+                if data.get("done"):
+                    eval_count = data.get("eval_count")
+                    eval_duration = data.get("eval_duration")
+                    observe_generation(payload["model"], eval_count, eval_duration)
+                    eval_duration_ms = None
+                    if eval_duration:
+                        eval_duration_ms = eval_duration // 1_000_000
+
+                    total_ms = int((time.perf_counter() - started) * 1000)
+                    add_span("ollama", started_ns, backend=backend.url, path=path)
+                    ttft_text = ttft_ms if ttft_ms is not None else "?"
+                    logger.info(
+                        f"Stream abgeschlossen: {chars} Zeichen, "
+                        f"{eval_count or '?'} Tokens, TTFT {ttft_text}ms, "
+                        f"gesamt {total_ms}ms"
+                    )
+
+                    yield {
+                        "type": "done",
+                        "model": data.get("model", payload["model"]),
+                        "tokens_used": eval_count,
+                        "eval_duration_ms": eval_duration_ms,
+                        "ttft_ms": ttft_ms,
+                        "total_duration_ms": total_ms,
+                        "done_reason": data.get("done_reason"),
+                    }
+                    return
+
     async def close(self):
-        """Schließe den HTTP-Client."""
-        if self._client:
-            await self._client.aclose()
-            self._client = None
+        """Schließe die HTTP-Clients."""
+        for backend in self.backends:
+            await backend.close()
 
 
 # Global service instance
@@ -0,0 +1,251 @@
+"""
+Everlast AI Backend - Response Cache
+
+Zweistufiger Cache für deterministische Ergebnisse (LLM-Antworten, Transkripte).
+
+- Speicher-Tier: LRU mit fester Maximalgröße
+- Disk-Tier (optional): SQLite-Datei, überlebt Neustarts
+- TTL pro Eintrag, Invalidierung per Tag (z.B. Modellname)
+- Identische, gleichzeitig laufende Anfragen werden zusammengelegt,
+  sodass nur eine davon tatsächlich berechnet wird
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(payload: dict) -> str:
+    """Kanonischer SHA-256-Hash eines Request-Payloads."""
+    canonical = json.dumps(
+        payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """LRU-Speicher-Cache mit optionalem SQLite-Tier und In-Flight-Deduplizierung."""
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = 512,
+        ttl: float = 3600.0,
+        db_path: Optional[str] = None,
+    ):
+        self.name = name
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        # key -> (expires_at, tag, value)
+        self._memory: OrderedDict[str, tuple[float, Optional[str], dict]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._open_db(db_path)
+
+        # Statistiken
+        self._hits_memory = 0
+        self._hits_disk = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._evictions = 0
+
+    # ------------------------------------------------------------------
+    # Disk-Tier
+    # ------------------------------------------------------------------
+
+    def _open_db(self, db_path: str):
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " namespace TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " tag TEXT,"
+            " expires_at REAL NOT NULL,"
+            " value TEXT NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        self._db.commit()
+        logger.info(f"Cache '{self.name}': Disk-Tier {db_path}")
+
+    def _disk_get(self, key: str) -> Optional[tuple[float, Optional[str], dict]]:
+        if self._db is None:
+            return None
+        with self._lock:
+            row = self._db.execute(
+                "SELECT expires_at, tag, value FROM cache WHERE namespace = ? AND key = ?",
+                (self.name, key),
+            ).fetchone()
+        if row is None:
+            return None
+        expires_at, tag, value = row
+        if expires_at < time.time():
+            with self._lock:
+                self._db.execute(
+                    "DELETE FROM cache WHERE namespace = ? AND key = ?", (self.name, key)
+                )
+                self._db.commit()
+            return None
+        return expires_at, tag, json.loads(value)
+
+    def _disk_set(self, key: str, expires_at: float, tag: Optional[str], value: dict):
+        if self._db is None:
+            return
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, tag, expires_at, value)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (self.name, key, tag, expires_at, json.dumps(value, ensure_ascii=False)),
+            )
+            self._db.commit()
+
+    # ------------------------------------------------------------------
+    # Öffentliche API
+    # ------------------------------------------------------------------
+
+    def _lookup(self, key: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] >= time.time():
+                    self._memory.move_to_end(key)
+                    self._hits_memory += 1
+                    return entry[2]
+                del self._memory[key]
+
+        entry = self._disk_get(key)
+        if entry is not None:
+            self._hits_disk += 1
+            self._memory_set(key, *entry)
+            return entry[2]
+        return None
+
+    def get(self, key: str) -> Optional[dict]:
+        """Liefert einen gültigen Eintrag (Speicher, dann Disk) oder None."""
+        value = self._lookup(key)
+        if value is None:
+            self._misses += 1
+        return value
+
+    def _memory_set(self, key: str, expires_at: float, tag: Optional[str], value: dict):
+        with self._lock:
+            self._memory[key] = (expires_at, tag, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+                self._evictions += 1
+
+    def set(self, key: str, value: dict, tag: Optional[str] = None):
+        """Speichert einen Eintrag in beiden Tiers."""
+        expires_at = time.time() + self.ttl
+        self._memory_set(key, expires_at, tag, value)
+        self._disk_set(key, expires_at, tag, value)
+
+    def invalidate_tag(self, tag: str) -> int:
+        """Entfernt alle Einträge mit dem Tag (z.B. nach Modell-Update)."""
+        with self._lock:
+            keys = [k for k, (_, t, _) in self._memory.items() if t == tag]
+            for k in keys:
+                del self._memory[k]
+            removed = len(keys)
+            if self._db is not None:
+                cursor = self._db.execute(
+                    "DELETE FROM cache WHERE namespace = ? AND tag = ?", (self.name, tag)
+                )
+                self._db.commit()
+                removed = max(removed, cursor.rowcount)
+        if removed:
+            logger.info(f"Cache '{self.name}': {removed} Einträge für '{tag}' invalidiert")
+        return removed
+
+    def clear(self):
+        """Leert den Cache vollständig."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM cache WHERE namespace = ?", (self.name,))
+                self._db.commit()
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[dict]],
+        tag: Optional[str] = None,
+    ) -> tuple[dict, bool]:
+        """
+        Liefert ``(wert, aus_cache)``.
+
+        Bei einem Miss berechnet nur der erste Aufrufer den Wert; gleichzeitige
+        Aufrufer mit demselben Schlüssel warten auf dessen Ergebnis.
+        """
+        while True:
+            if self._db is None:
+                value = self._lookup(key)
+            else:
+                value = await asyncio.to_thread(self._lookup, key)
+            if value is not None:
+                return value, True
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            try:
+                value = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise  # dieser Aufrufer wurde abgebrochen
+                continue  # der berechnende Aufrufer wurde abgebrochen: selbst rechnen
+            self._coalesced += 1
+            return value, True
+
+        self._misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await compute()
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # kein "never retrieved", falls niemand wartet
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(value)
+            if self._db is None:
+                self.set(key, value, tag)
+            else:
+                await asyncio.to_thread(self.set, key, value, tag)
+            return value, False
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> dict:
+        """Kennzahlen des Caches."""
+        hits = self._hits_memory + self._hits_disk + self._coalesced
+        lookups = hits + self._misses
+        return {
+            "name": self.name,
+            "entries": len(self._memory),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "disk": self._db is not None,
+            "hits_memory": self._hits_memory,
+            "hits_disk": self._hits_disk,
+            "coalesced": self._coalesced,
+            "misses": self._misses,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "evictions": self._evictions,
+        }
@@ -0,0 +1,292 @@
+"""
+Everlast AI Backend - Tracing
+
+Leichtgewichtige Spans pro Request (ohne OpenTelemetry-SDK).
+
+- Request-ID aus ``X-Request-ID`` (oder neu erzeugt); wird an Ollama
+  weitergereicht und in jeder Log-Zeile ausgegeben
+- Spans über contextvars; Worker-Threads des Schedulers übernehmen den
+  Kontext des Aufrufers
+- Dauer pro Stufe als ``Server-Timing``-Header
+- Optionaler Export im OTLP/JSON-Format (Datei mit einer Zeile pro Trace
+  oder HTTP-Collector unter ``/v1/traces``)
+"""
+
+import json
+import logging
+import re
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "everlast-ai-backend"
+
+# W3C Trace Context: version-traceid-parentid-flags
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+# OTLP Span-Kinds
+_KIND_INTERNAL = 1
+_KIND_SERVER = 2
+
+
+@dataclass
+class Span:
+    """Ein abgeschlossener (oder laufender) Abschnitt eines Requests."""
+
+    name: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        return max(0, self.end_ns - self.start_ns) / 1e6
+
+
+class Trace:
+    """Alle Spans eines Requests."""
+
+    def __init__(
+        self,
+        name: str,
+        request_id: Optional[str] = None,
+        traceparent: Optional[str] = None,
+    ):
+        parent_id = None
+        match = _TRACEPARENT.match(traceparent or "")
+        if match:
+            self.trace_id, parent_id = match.groups()
+        else:
+            self.trace_id = secrets.token_hex(16)
+        self.request_id = request_id or self.trace_id
+        self.root = Span(name, secrets.token_hex(8), parent_id, time.time_ns())
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def add(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    def server_timing(self) -> str:
+        """``Server-Timing``-Header: Summe pro Stufe plus Gesamtdauer."""
+        with self._lock:
+            spans = list(self.spans)
+        totals: dict[str, float] = {}
+        for span in spans:
+            totals[span.name] = totals.get(span.name, 0.0) + span.duration_ms
+        total_ms = (time.time_ns() - self.root.start_ns) / 1e6
+        parts = [f"{name};dur={ms:.1f}" for name, ms in totals.items()]
+        parts.append(f"total;dur={total_ms:.1f}")
+        return ", ".join(parts)
+
+    def to_otlp(self) -> dict:
+        """Trace im OTLP/JSON-Format (``ExportTraceServiceRequest``)."""
+        with self._lock:
+            spans = [self.root, *self.spans]
+
+        def otlp_span(span: Span) -> dict:
+            attributes = dict(span.attributes)
+            if span is self.root:
+                attributes["request.id"] = self.request_id
+            data = {
+                "traceId": self.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": _KIND_SERVER if span is self.root else _KIND_INTERNAL,
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns or time.time_ns()),
+                "attributes": [_otlp_attribute(k, v) for k, v in attributes.items()],
+            }
+            if span.parent_id:
+                data["parentSpanId"] = span.parent_id
+            return data
+
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [_otlp_attribute("service.name", SERVICE_NAME)]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "everlast.tracing"},
+                            "spans": [otlp_span(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+
+def _otlp_attribute(key: str, value: Any) -> dict:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("trace", default=None)
+_current_span: ContextVar[Optional[str]] = ContextVar("span", default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    """Trace des laufenden Requests (None außerhalb eines Requests)."""
+    return _current_trace.get()
+
+
+def current_request_id() -> Optional[str]:
+    """Request-ID des laufenden Requests."""
+    trace = _current_trace.get()
+    return trace.request_id if trace is not None else None
+
+
+def start_trace(
+    name: str,
+    request_id: Optional[str] = None,
+    traceparent: Optional[str] = None,
+) -> Trace:
+    """
+    Startet den Trace eines Requests (Root-Span) im aktuellen Kontext.
+
+    Gedacht für ASGI-Middlewares: jeder Request läuft in einem eigenen
+    Task und damit in einem eigenen Kontext.
+    """
+    trace = Trace(name, request_id, traceparent)
+    _current_trace.set(trace)
+    _current_span.set(trace.root.span_id)
+    return trace
+
+
+def finish_trace(trace: Trace):
+    """Beendet den Root-Span und löst den Trace vom aktuellen Kontext."""
+    trace.root.end_ns = time.time_ns()
+    if _current_trace.get() is trace:
+        _current_trace.set(None)
+        _current_span.set(None)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Misst einen Abschnitt als Kind-Span des aktuellen Spans.
+
+    Außerhalb eines Requests (z.B. in Worker-Prozessen) ein No-Op.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    parent_id = _current_span.get()
+    current = Span(
+        name, secrets.token_hex(8), parent_id, time.time_ns(), attributes=attributes
+    )
+    # set statt reset: Async-Generatoren können in einem anderen Kontext enden
+    _current_span.set(current.span_id)
+    try:
+        yield current
+    finally:
+        current.end_ns = time.time_ns()
+        _current_span.set(parent_id)
+        trace.add(current)
+
+
+def add_span(
+    name: str, start_ns: int, end_ns: Optional[int] = None, **attributes: Any
+):
+    """Erfasst einen bereits abgeschlossenen Abschnitt (z.B. aus Zeitstempeln)."""
+    trace = _current_trace.get()
+    if trace is None:
+        return
+    trace.add(
+        Span(
+            name,
+            secrets.token_hex(8),
+            _current_span.get(),
+            start_ns,
+            end_ns or time.time_ns(),
+            attributes,
+        )
+    )
+
+
+def outgoing_headers() -> dict[str, str]:
+    """Header für Aufrufe anderer Dienste (Request-ID und W3C ``traceparent``)."""
+    trace = _current_trace.get()
+    if trace is None:
+        return {}
+    parent = _current_span.get() or trace.root.span_id
+    return {
+        "X-Request-ID": trace.request_id,
+        "traceparent": f"00-{trace.trace_id}-{parent}-01",
+    }
+
+
+class RequestIdLogFilter(logging.Filter):
+    """Ergänzt Log-Records um ``request_id`` (``-`` außerhalb eines Requests)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = current_request_id() or "-"
+        return True
+
+
+class SpanExporter:
+    """Schreibt abgeschlossene Traces im Hintergrund (OTLP/JSON)."""
+
+    def __init__(self, file_path: Optional[str] = None, url: Optional[str] = None):
+        self.file_path = file_path
+        self.url = url
+        self._executor: ThreadPoolExecutor | None = None
+        if file_path or url:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="trace-export"
+            )
+        if file_path:
+            Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self._executor is not None
+
+    def export(self, trace: Trace):
+        """Übergibt einen Trace an den Export-Thread (blockiert nicht)."""
+        if self._executor is not None:
+            self._executor.submit(self._write, trace.to_otlp())
+
+    def _write(self, payload: dict):
+        try:
+            if self.file_path:
+                with open(self.file_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(payload, ensure_ascii=False) + "\n")
+            if self.url:
+                import httpx
+
+                httpx.post(self.url, json=payload, timeout=2.0).raise_for_status()
+        except Exception as e:
+            logger.warning(f"Trace-Export fehlgeschlagen: {e}")
+
+    def shutdown(self):
+        """Wartet auf ausstehende Exporte."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+# Global exporter instance
+span_exporter = SpanExporter(settings.trace_export_file, settings.trace_export_url)
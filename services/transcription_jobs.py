@@ -0,0 +1,477 @@
+"""
+Everlast AI Backend - Transkriptions-Jobs
+
+Asynchrone Batch-Transkription für Archive mit vielen Dateien.
+
+Ein Job besteht aus mehreren Dateien (Uploads oder Server-Pfade). Zustand
+und Ergebnisse liegen in einer lokalen SQLite-Datenbank und überstehen
+Neustarts: beim Start werden unterbrochene Dateien erneut eingeplant.
+Die Dateien laufen über den Whisper-Worker-Pool mit ``PRIORITY_BATCH``,
+interaktive Requests werden also immer zuerst bedient.
+"""
+
+import asyncio
+import json
+import logging
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from config import settings
+from models.schemas import (
+    TranscribeResponse,
+    TranscriptionJob,
+    TranscriptionJobItem,
+)
+from services.whisper_scheduler import PRIORITY_BATCH, WhisperBusyError
+from services.whisper_service import whisper_service
+
+logger = logging.getLogger(__name__)
+
+
+class JobNotFoundError(Exception):
+    """Der Job existiert nicht."""
+
+
+class JobSourceError(ValueError):
+    """Ungültige Datei-Angabe (z.B. Pfad außerhalb des erlaubten Verzeichnisses)."""
+
+
+# ============================================================================
+# SQLite-Store
+# ============================================================================
+
+
+class JobStore:
+    """Persistenter Job-Zustand (SQLite, thread-sicher)."""
+
+    def __init__(self, db_path: str):
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    language TEXT NOT NULL,
+                    model TEXT,
+                    long_audio INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS job_items (
+                    job_id TEXT NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+                    idx INTEGER NOT NULL,
+                    source TEXT NOT NULL,
+                    filename TEXT NOT NULL,
+                    uploaded INTEGER NOT NULL DEFAULT 0,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    result TEXT,
+                    error TEXT,
+                    finished_at REAL,
+                    PRIMARY KEY (job_id, idx)
+                );
+                CREATE INDEX IF NOT EXISTS job_items_status ON job_items(status);
+                """
+            )
+            self._db.commit()
+
+    def create(
+        self,
+        job_id: str,
+        language: str,
+        model: Optional[str],
+        long_audio: bool,
+        items: list[tuple[str, str, bool]],
+    ):
+        """Legt einen Job mit seinen Dateien ``(source, filename, uploaded)`` an."""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (id, status, language, model, long_audio,"
+                " created_at, updated_at) VALUES (?, 'queued', ?, ?, ?, ?, ?)",
+                (job_id, language, model, int(long_audio), now, now),
+            )
+            self._db.executemany(
+                "INSERT INTO job_items (job_id, idx, source, filename, uploaded)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [
+                    (job_id, idx, source, filename, int(uploaded))
+                    for idx, (source, filename, uploaded) in enumerate(items)
+                ],
+            )
+            self._db.commit()
+
+    def requeue_interrupted(self) -> int:
+        """Setzt nach einem Neustart unterbrochene Dateien zurück auf 'pending'."""
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE job_items SET status = 'pending' WHERE status = 'running'"
+            )
+            self._db.execute(
+                "UPDATE jobs SET status = 'queued' WHERE status = 'running'"
+            )
+            self._db.commit()
+            return cursor.rowcount
+
+    def claim_next(self) -> Optional[sqlite3.Row]:
+        """Markiert die älteste wartende Datei als 'running' und liefert sie."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT i.job_id, i.idx, i.source, i.uploaded,"
+                " j.language, j.model, j.long_audio"
+                " FROM job_items i JOIN jobs j ON j.id = i.job_id"
+                " WHERE i.status = 'pending' AND j.status IN ('queued', 'running')"
+                " ORDER BY j.created_at, i.idx LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE job_items SET status = 'running' WHERE job_id = ? AND idx = ?",
+                (row["job_id"], row["idx"]),
+            )
+            self._db.execute(
+                "UPDATE jobs SET status = 'running', updated_at = ? WHERE id = ?",
+                (time.time(), row["job_id"]),
+            )
+            self._db.commit()
+            return row
+
+    def finish_item(
+        self,
+        job_id: str,
+        idx: int,
+        result: Optional[dict] = None,
+        error: Optional[str] = None,
+    ):
+        """Speichert Ergebnis bzw. Fehler einer Datei und schließt ggf. den Job ab."""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "UPDATE job_items SET status = ?, result = ?, error = ?, finished_at = ?"
+                " WHERE job_id = ? AND idx = ?",
+                (
+                    "failed" if error is not None else "done",
+                    json.dumps(result, ensure_ascii=False) if result else None,
+                    error,
+                    now,
+                    job_id,
+                    idx,
+                ),
+            )
+            open_items = self._db.execute(
+                "SELECT COUNT(*) FROM job_items WHERE job_id = ?"
+                " AND status IN ('pending', 'running')",
+                (job_id,),
+            ).fetchone()[0]
+            self._db.execute(
+                "UPDATE jobs SET status = CASE WHEN ? = 0 AND status != 'cancelled'"
+                " THEN 'completed' ELSE status END, updated_at = ? WHERE id = ?",
+                (open_items, now, job_id),
+            )
+            self._db.commit()
+
+    def release_item(self, job_id: str, idx: int):
+        """Gibt eine Datei zurück in die Warteschlange (z.B. beim Herunterfahren)."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE job_items SET status = 'pending'"
+                " WHERE job_id = ? AND idx = ? AND status = 'running'",
+                (job_id, idx),
+            )
+            self._db.commit()
+
+    def cancel(self, job_id: str) -> bool:
+        """Bricht einen Job ab; noch wartende Dateien werden nicht mehr bearbeitet."""
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET status = 'cancelled', updated_at = ?"
+                " WHERE id = ? AND status IN ('queued', 'running')",
+                (time.time(), job_id),
+            )
+            self._db.execute(
+                "UPDATE job_items SET status = 'cancelled'"
+                " WHERE job_id = ? AND status = 'pending'",
+                (job_id,),
+            )
+            self._db.commit()
+            return cursor.rowcount > 0
+
+    def delete(self, job_id: str) -> list[str]:
+        """Löscht einen Job; liefert die Pfade seiner hochgeladenen Dateien."""
+        with self._lock:
+            uploads = [
+                row["source"]
+                for row in self._db.execute(
+                    "SELECT source FROM job_items WHERE job_id = ? AND uploaded = 1",
+                    (job_id,),
+                )
+            ]
+            self._db.execute("DELETE FROM job_items WHERE job_id = ?", (job_id,))
+            self._db.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+            self._db.commit()
+            return uploads
+
+    def get(self, job_id: str) -> Optional[TranscriptionJob]:
+        """Job-Zustand inkl. Fortschritt."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            return self._to_job(row)
+
+    def recent(self, limit: int = 50) -> list[TranscriptionJob]:
+        """Die neuesten Jobs."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+            return [self._to_job(row) for row in rows]
+
+    def items(self, job_id: str) -> list[TranscriptionJobItem]:
+        """Alle Dateien eines Jobs mit Ergebnissen."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT * FROM job_items WHERE job_id = ? ORDER BY idx", (job_id,)
+            ).fetchall()
+        return [
+            TranscriptionJobItem(
+                index=row["idx"],
+                filename=row["filename"],
+                status=row["status"],
+                result=(
+                    TranscribeResponse(**json.loads(row["result"]))
+                    if row["result"]
+                    else None
+                ),
+                error=row["error"],
+            )
+            for row in rows
+        ]
+
+    def _to_job(self, row: sqlite3.Row) -> TranscriptionJob:
+        counts = dict(
+            self._db.execute(
+                "SELECT status, COUNT(*) FROM job_items WHERE job_id = ?"
+                " GROUP BY status",
+                (row["id"],),
+            ).fetchall()
+        )
+        return TranscriptionJob(
+            id=row["id"],
+            status=row["status"],
+            language=row["language"],
+            model=row["model"],
+            long_audio=bool(row["long_audio"]),
+            total=sum(counts.values()),
+            done=counts.get("done", 0),
+            failed=counts.get("failed", 0),
+            pending=counts.get("pending", 0) + counts.get("running", 0),
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+        )
+
+
+# ============================================================================
+# Job-Manager
+# ============================================================================
+
+
+class TranscriptionJobManager:
+    """Nimmt Jobs an und arbeitet sie im Hintergrund ab."""
+
+    def __init__(self):
+        self._store: Optional[JobStore] = None
+        self._workers: list[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    @property
+    def store(self) -> JobStore:
+        """SQLite-Store (wird beim ersten Zugriff geöffnet)."""
+        if self._store is None:
+            self._store = JobStore(settings.whisper_jobs_db)
+        return self._store
+
+    @property
+    def upload_dir(self) -> Path:
+        """Ablage für hochgeladene Job-Dateien."""
+        return Path(settings.whisper_jobs_dir)
+
+    def start(self):
+        """Startet die Job-Worker; unterbrochene Dateien werden neu eingeplant."""
+        if self._workers:
+            return
+        requeued = self.store.requeue_interrupted()
+        if requeued:
+            logger.info(f"{requeued} unterbrochene Job-Dateien neu eingeplant")
+        self._wakeup = asyncio.Event()
+        self._wakeup.set()
+        concurrency = max(1, settings.whisper_jobs_concurrency)
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(concurrency)
+        ]
+
+    async def stop(self):
+        """Stoppt die Job-Worker (laufende Dateien werden beim Neustart wiederholt)."""
+        for task in self._workers:
+            task.cancel()
+        for task in self._workers:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._workers = []
+
+    # ------------------------------------------------------------------
+    # Jobs anlegen
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def resolve_server_path(path: str) -> Path:
+        """Prüft einen Server-Pfad gegen ``WHISPER_JOBS_ALLOWED_ROOT``."""
+        if not settings.whisper_jobs_allowed_root:
+            raise JobSourceError(
+                "Server-Pfade sind deaktiviert (WHISPER_JOBS_ALLOWED_ROOT nicht gesetzt)"
+            )
+        root = Path(settings.whisper_jobs_allowed_root).resolve()
+        resolved = (root / path).resolve()
+        if not resolved.is_relative_to(root):
+            raise JobSourceError(f"Pfad außerhalb von {root}: {path}")
+        if not resolved.is_file():
+            raise JobSourceError(f"Datei nicht gefunden: {path}")
+        return resolved
+
+    def _save_upload(self, job_id: str, idx: int, filename: str, file: BinaryIO) -> str:
+        target_dir = self.upload_dir / job_id
+        target_dir.mkdir(parents=True, exist_ok=True)
+        target = target_dir / f"{idx:05d}_{Path(filename).name or 'audio'}"
+        file.seek(0)
+        with open(target, "wb") as out:
+            shutil.copyfileobj(file, out)
+        return str(target)
+
+    async def submit(
+        self,
+        uploads: list[tuple[str, BinaryIO]],
+        paths: list[str],
+        language: str = "de",
+        model: Optional[str] = None,
+        long_audio: bool = False,
+    ) -> TranscriptionJob:
+        """Legt einen Job aus Uploads ``(filename, file)`` und Server-Pfaden an."""
+        resolved = [self.resolve_server_path(path) for path in paths]
+        if not uploads and not resolved:
+            raise JobSourceError("Keine Dateien angegeben")
+
+        job_id = uuid.uuid4().hex
+        items: list[tuple[str, str, bool]] = []
+        for filename, file in uploads:
+            source = await asyncio.to_thread(
+                self._save_upload, job_id, len(items), filename, file
+            )
+            items.append((source, filename, True))
+        for path, original in zip(resolved, paths):
+            items.append((str(path), original, False))
+
+        await asyncio.to_thread(
+            self.store.create, job_id, language, model, long_audio, items
+        )
+        logger.info(f"Transkriptions-Job {job_id}: {len(items)} Dateien")
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return await self.get(job_id)
+
+    # ------------------------------------------------------------------
+    # Abfragen
+    # ------------------------------------------------------------------
+
+    async def get(self, job_id: str) -> TranscriptionJob:
+        """Job-Zustand (JobNotFoundError, falls unbekannt)."""
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if job is None:
+            raise JobNotFoundError(job_id)
+        return job
+
+    async def recent(self, limit: int = 50) -> list[TranscriptionJob]:
+        """Die neuesten Jobs."""
+        return await asyncio.to_thread(self.store.recent, limit)
+
+    async def items(self, job_id: str) -> list[TranscriptionJobItem]:
+        """Alle Dateien eines Jobs mit Ergebnissen."""
+        await self.get(job_id)
+        return await asyncio.to_thread(self.store.items, job_id)
+
+    async def cancel(self, job_id: str) -> TranscriptionJob:
+        """Bricht einen Job ab (laufende Dateien werden noch fertig)."""
+        await self.get(job_id)
+        await asyncio.to_thread(self.store.cancel, job_id)
+        return await self.get(job_id)
+
+    async def delete(self, job_id: str):
+        """Löscht einen Job samt hochgeladener Dateien."""
+        await self.get(job_id)
+        await asyncio.to_thread(self.store.cancel, job_id)
+        await asyncio.to_thread(self.store.delete, job_id)
+        await asyncio.to_thread(
+            shutil.rmtree, self.upload_dir / job_id, ignore_errors=True
+        )
+
+    # ------------------------------------------------------------------
+    # Abarbeitung
+    # ------------------------------------------------------------------
+
+    async def _worker(self):
+        while True:
+            item = await asyncio.to_thread(self.store.claim_next)
+            if item is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            await self._process(item)
+
+    async def _process(self, item: sqlite3.Row):
+        job_id, idx = item["job_id"], item["idx"]
+        while True:
+            try:
+                result = await whisper_service.transcribe_file(
+                    item["source"],
+                    language=item["language"],
+                    model=item["model"],
+                    long_audio=bool(item["long_audio"]),
+                    priority=PRIORITY_BATCH,
+                )
+            except WhisperBusyError as e:
+                # Queue voll: später erneut versuchen statt die Datei aufzugeben
+                await asyncio.sleep(e.retry_after)
+                continue
+            except asyncio.CancelledError:
+                await asyncio.to_thread(self.store.release_item, job_id, idx)
+                raise
+            except Exception as e:
+                logger.error(f"Job {job_id}, Datei {idx} fehlgeschlagen: {e}")
+                await asyncio.to_thread(
+                    self.store.finish_item, job_id, idx, None, str(e)
+                )
+                break
+            await asyncio.to_thread(
+                self.store.finish_item, job_id, idx, result.model_dump()
+            )
+            break
+
+        if item["uploaded"]:
+            # Ergebnis ist gespeichert, der Upload wird nicht mehr gebraucht
+            await asyncio.to_thread(Path(item["source"]).unlink, missing_ok=True)
+
+
+# Global manager instance
+transcription_jobs = TranscriptionJobManager()
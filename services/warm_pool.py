@@ -0,0 +1,223 @@
+"""
+Everlast AI Backend - Warm Pool
+
+Hält Whisper- und Ollama-Modelle geladen, damit der erste Request nach dem
+Start oder nach einer Pause keine Ladezeit zahlt.
+
+- Beim Start: konfigurierte Modelle vorladen (``WARM_WHISPER_MODELS``,
+  ``WARM_OLLAMA_MODELS``)
+- Im Hintergrund: kürzlich benutzte Modelle erneut laden, falls sie in der
+  Zwischenzeit entladen wurden (Ollama ``keep_alive``, Neustart, Verdrängung)
+- Ladezeiten pro Modell als Kennzahlen
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from config import settings
+from services.metrics import MODEL_LOAD_SECONDS
+from services.ollama_service import ollama_service
+from services.whisper_pool import estimate_memory_mb
+from services.whisper_service import whisper_service
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _LoadStats:
+    loads: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    last_seconds: float | None = None
+    last_loaded_at: float | None = None
+
+
+class WarmPoolManager:
+    """Lädt Modelle vor und wärmt kürzlich benutzte Modelle erneut auf."""
+
+    def __init__(
+        self,
+        interval: float | None = None,
+        usage_window: float | None = None,
+    ):
+        self.interval = interval if interval is not None else settings.warm_interval
+        self.usage_window = (
+            usage_window if usage_window is not None else settings.warm_usage_window
+        )
+        self._task: asyncio.Task | None = None
+        # (art, modell) -> Ladezeiten
+        self._stats: dict[tuple[str, str], _LoadStats] = {}
+
+    # ------------------------------------------------------------------
+    # Kennzahlen
+    # ------------------------------------------------------------------
+
+    def _record(self, kind: str, model: str, seconds: float | None):
+        stats = self._stats.setdefault((kind, model), _LoadStats())
+        if seconds is None:
+            stats.errors += 1
+            return
+        stats.loads += 1
+        stats.total_seconds += seconds
+        stats.last_seconds = seconds
+        stats.last_loaded_at = time.time()
+
+    def load_stats(self) -> list[dict]:
+        """Ladezeiten pro Modell (nur Ladevorgänge des Warm-Pools)."""
+        return [
+            {
+                "kind": kind,
+                "model": model,
+                "loads": stats.loads,
+                "errors": stats.errors,
+                "last_seconds": (
+                    round(stats.last_seconds, 3)
+                    if stats.last_seconds is not None
+                    else None
+                ),
+                "avg_seconds": (
+                    round(stats.total_seconds / stats.loads, 3) if stats.loads else None
+                ),
+                "last_loaded_at": stats.last_loaded_at,
+            }
+            for (kind, model), stats in self._stats.items()
+        ]
+
+    # ------------------------------------------------------------------
+    # Laden
+    # ------------------------------------------------------------------
+
+    async def warm_whisper(self, model_size: str) -> float | None:
+        """Lädt ein Whisper-Modell und liefert die Ladezeit in Sekunden."""
+        started = time.perf_counter()
+        try:
+            await whisper_service.load_model(model_size)
+        except Exception as e:
+            logger.warning(f"Vorladen von Whisper '{model_size}' fehlgeschlagen: {e}")
+            self._record("whisper", model_size, None)
+            return None
+        seconds = time.perf_counter() - started
+        self._record("whisper", model_size, seconds)
+        return seconds
+
+    async def warm_ollama(self, model: str, only_cold: bool = False):
+        """Lädt ein Ollama-Modell auf allen Backends, die es installiert haben."""
+        if not ollama_service.allow_request():
+            return
+        loads = await ollama_service.warm_model(model, only_cold=only_cold)
+        for url, seconds in loads.items():
+            logger.info(f"Ollama-Modell '{model}' auf {url} geladen ({seconds:.1f}s)")
+            self._record("ollama", model, seconds)
+            MODEL_LOAD_SECONDS.observe(seconds, kind="ollama", model=model)
+
+    def _whisper_fits(self, model_size: str) -> bool:
+        """Passt das Modell ohne Verdrängung in den Pool?"""
+        loaded = whisper_service.loaded_models
+        if whisper_service.uses_processes:
+            return len(loaded) < settings.whisper_process_max_models
+        pool = whisper_service.pool
+        memory_mb = estimate_memory_mb(whisper_service.model_key(model_size))
+        return pool.used_memory_mb + memory_mb <= pool.memory_budget_mb
+
+    async def preload(self):
+        """Lädt die konfigurierten Modelle (Whisper und Ollama parallel)."""
+        whisper_models = settings.get_warm_whisper_models()
+        ollama_models = settings.get_warm_ollama_models()
+        if not whisper_models and not ollama_models:
+            return
+        logger.info(
+            f"Warm-Pool: lade Whisper {whisper_models or '-'}, "
+            f"Ollama {ollama_models or '-'} vor"
+        )
+
+        async def whisper():
+            for size in whisper_models:
+                if size not in whisper_service.loaded_models:
+                    await self.warm_whisper(size)
+
+        async def ollama():
+            if ollama_models:
+                await ollama_service.is_available()
+            for model in ollama_models:
+                await self.warm_ollama(model)
+
+        await asyncio.gather(whisper(), ollama())
+
+    async def rewarm(self):
+        """
+        Lädt kürzlich benutzte und konfigurierte Modelle erneut, falls entladen.
+
+        Whisper-Modelle werden nur geladen, wenn sie ohne Verdrängung eines
+        anderen Modells in den Pool passen.
+        """
+        whisper_models = dict.fromkeys(
+            settings.get_warm_whisper_models()
+            + whisper_service.recently_used(self.usage_window)
+        )
+        for size in whisper_models:
+            if size not in whisper_service.loaded_models and self._whisper_fits(size):
+                logger.info(f"Warm-Pool: Whisper '{size}' wird erneut geladen")
+                await self.warm_whisper(size)
+
+        ollama_models = dict.fromkeys(
+            settings.get_warm_ollama_models()
+            + ollama_service.recently_used(self.usage_window)
+        )
+        for model in ollama_models:
+            await self.warm_ollama(model, only_cold=True)
+
+    # ------------------------------------------------------------------
+    # Hintergrund-Task
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Startet Vorladen und periodisches Aufwärmen im Hintergrund."""
+        if self._task is not None:
+            return
+
+        async def _loop():
+            await self.preload()
+            if self.interval <= 0:
+                return
+            while True:
+                await asyncio.sleep(self.interval)
+                try:
+                    await self.rewarm()
+                except Exception as e:
+                    logger.error(f"Warm-Pool: Fehler beim Aufwärmen: {e}")
+
+        self._task = asyncio.create_task(_loop())
+
+    async def stop(self):
+        """Stoppt den Hintergrund-Task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        """Konfiguration, geladene Modelle und Ladezeiten."""
+        return {
+            "interval_seconds": self.interval,
+            "usage_window_seconds": self.usage_window,
+            "keep_alive": settings.get_ollama_keep_alive(),
+            "whisper": {
+                "configured": settings.get_warm_whisper_models(),
+                "recently_used": whisper_service.recently_used(self.usage_window),
+                "loaded": whisper_service.loaded_models,
+            },
+            "ollama": {
+                "configured": settings.get_warm_ollama_models(),
+                "recently_used": ollama_service.recently_used(self.usage_window),
+            },
+            "loads": self.load_stats(),
+        }
+
+
+# Global manager instance
+warm_pool = WarmPoolManager()
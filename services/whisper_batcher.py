@@ -0,0 +1,130 @@
+"""
+Everlast AI Backend - Whisper Micro-Batching
+
+Sammelt gleichzeitig eintreffende kurze Clips und transkribiert sie gemeinsam.
+
+Requests mit gleichem Modell und gleicher Sprache werden höchstens
+``max_wait_ms`` lang bzw. bis ``max_batch_size`` gesammelt und dann als ein
+Batch ausgeführt. Die Ergebnisse werden an die wartenden Requests verteilt.
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Pending:
+    item: Any
+    future: asyncio.Future
+    enqueued: float
+
+
+class TranscriptionBatcher:
+    """Asynchroner Micro-Batcher mit Größen- und Zeitfenster."""
+
+    def __init__(
+        self,
+        run_batch: Callable[[Hashable, list[Any]], Awaitable[list[Any]]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 20.0,
+    ):
+        self._run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._groups: dict[Hashable, list[_Pending]] = {}
+        self._timers: dict[Hashable, asyncio.TimerHandle] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+        # Statistiken
+        self._batches = 0
+        self._items = 0
+        self._sizes: Counter[int] = Counter()
+        self._latency_total = 0.0
+        self._latency_last = 0.0
+        self._queue_wait_total = 0.0
+
+    async def submit(self, group: Hashable, item: Any) -> Any:
+        """Reiht ein Element in den Batch seiner Gruppe ein und wartet aufs Ergebnis."""
+        loop = asyncio.get_running_loop()
+        pending = _Pending(item, loop.create_future(), time.perf_counter())
+        batch = self._groups.setdefault(group, [])
+        batch.append(pending)
+
+        if len(batch) >= self.max_batch_size:
+            self._flush(group)
+        elif len(batch) == 1:
+            self._timers[group] = loop.call_later(self.max_wait, self._flush, group)
+
+        return await pending.future
+
+    def _flush(self, group: Hashable):
+        timer = self._timers.pop(group, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._groups.pop(group, None)
+        if not batch:
+            return
+        task = asyncio.get_running_loop().create_task(self._dispatch(group, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, group: Hashable, batch: list[_Pending]):
+        # Bereits abgebrochene Requests nicht mehr rechnen
+        batch = [p for p in batch if not p.future.done()]
+        if not batch:
+            return
+
+        started = time.perf_counter()
+        try:
+            results = await self._run_batch(group, [p.item for p in batch])
+        except Exception as e:
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+            return
+        except BaseException:
+            # Dispatch abgebrochen (z.B. Shutdown): Wartende nicht hängen lassen
+            for pending in batch:
+                pending.future.cancel()
+            raise
+        finally:
+            latency = time.perf_counter() - started
+            self._batches += 1
+            self._items += len(batch)
+            self._sizes[len(batch)] += 1
+            self._latency_total += latency
+            self._latency_last = latency
+            self._queue_wait_total += sum(started - p.enqueued for p in batch)
+
+        logger.debug(f"Batch mit {len(batch)} Clips in {latency * 1000:.0f}ms")
+        for pending, result in zip(batch, results):
+            if not pending.future.done():
+                pending.future.set_result(result)
+
+    def stats(self) -> dict:
+        """Kennzahlen: Batch-Größen und Latenzen."""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": round(self.max_wait * 1000, 1),
+            "batches": self._batches,
+            "items": self._items,
+            "avg_batch_size": round(self._items / self._batches, 2) if self._batches else 0.0,
+            "batch_sizes": dict(sorted(self._sizes.items())),
+            "avg_batch_latency_ms": (
+                round(self._latency_total / self._batches * 1000, 1)
+                if self._batches
+                else 0.0
+            ),
+            "last_batch_latency_ms": round(self._latency_last * 1000, 1),
+            "avg_collect_wait_ms": (
+                round(self._queue_wait_total / self._items * 1000, 1)
+                if self._items
+                else 0.0
+            ),
+        }
@@ -0,0 +1,257 @@
+"""
+Everlast AI Backend - Whisper Model Pool
+
+Registry für mehrere gleichzeitig geladene Whisper-Modelle.
+
+Modelle werden über (Größe, Device, Compute-Type) adressiert, innerhalb
+eines Speicherbudgets gehalten und nach LRU verdrängt. Jedes Modell wird
+genau einmal geladen, auch wenn viele Requests gleichzeitig danach fragen.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, NamedTuple
+
+from services.metrics import MODEL_LOAD_SECONDS
+from services.tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+class ModelKey(NamedTuple):
+    """Schlüssel eines geladenen Whisper-Modells."""
+
+    size: str
+    device: str
+    compute_type: str
+
+
+# Geschätzter Speicherbedarf der Modelle bei float16 in MB
+MODEL_MEMORY_MB = {
+    "tiny": 150,
+    "base": 300,
+    "small": 1000,
+    "medium": 2600,
+    "large-v2": 4700,
+    "large-v3": 4700,
+}
+
+
+def estimate_memory_mb(key: ModelKey) -> int:
+    """Schätzt den Speicherbedarf eines Modells (unbekannte Modelle wie large)."""
+    memory = MODEL_MEMORY_MB.get(key.size, MODEL_MEMORY_MB["large-v3"])
+    if key.compute_type.startswith("int8"):
+        return memory // 2
+    if key.compute_type == "float32":
+        return memory * 2
+    return memory
+
+
+def _default_loader(key: ModelKey) -> Any:
+    from faster_whisper import WhisperModel
+
+    return WhisperModel(key.size, device=key.device, compute_type=key.compute_type)
+
+
+def _release_gpu_memory():
+    """Gibt gecachten GPU-Speicher frei (falls torch verfügbar ist)."""
+    try:
+        import torch
+
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    except ImportError:
+        pass
+
+
+@dataclass
+class _PoolEntry:
+    model: Any
+    memory_mb: int
+    load_seconds: float
+    in_use: int = 0
+    last_used: float = 0.0
+
+
+class WhisperModelPool:
+    """Thread-sichere LRU-Registry für Whisper-Modelle mit Speicherbudget."""
+
+    def __init__(
+        self,
+        memory_budget_mb: int,
+        loader: Callable[[ModelKey], Any] | None = None,
+    ):
+        self.memory_budget_mb = memory_budget_mb
+        self._loader = loader or _default_loader
+        self._entries: OrderedDict[ModelKey, _PoolEntry] = OrderedDict()
+        self._loading: dict[ModelKey, Future] = {}
+        self._lock = threading.Lock()
+        self._loads = 0
+        self._evictions = 0
+
+    @property
+    def used_memory_mb(self) -> int:
+        """Geschätzter Speicherbedarf aller geladenen Modelle."""
+        return sum(entry.memory_mb for entry in self._entries.values())
+
+    def loaded_keys(self) -> list[ModelKey]:
+        """Geladene Modelle, zuletzt benutztes zuletzt."""
+        with self._lock:
+            return list(self._entries)
+
+    def is_loaded(self, key: ModelKey) -> bool:
+        """Prüft, ob ein Modell geladen ist."""
+        return key in self._entries
+
+    def get(self, key: ModelKey) -> Any:
+        """
+        Liefert das Modell zum Schlüssel und lädt es bei Bedarf.
+
+        Gleichzeitige Anfragen nach demselben Modell warten auf einen
+        einzigen Ladevorgang.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                entry.last_used = time.monotonic()
+                return entry.model
+
+            future = self._loading.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._loading[key] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            model = self._load(key)
+            future.set_result(model)
+            return model
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+
+    @contextmanager
+    def lease(self, key: ModelKey) -> Iterator[Any]:
+        """Leiht ein Modell aus; ausgeliehene Modelle werden nicht verdrängt."""
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.in_use += 1
+                    entry.last_used = time.monotonic()
+                    self._entries.move_to_end(key)
+                    break
+            # Laden außerhalb des Locks; danach erneut (verdrängungssicher) leasen
+            self.get(key)
+        try:
+            yield entry.model
+        finally:
+            with self._lock:
+                entry.in_use -= 1
+
+    def _load(self, key: ModelKey) -> Any:
+        memory_mb = estimate_memory_mb(key)
+        with self._lock:
+            self._evict_for(memory_mb)
+
+        logger.info(
+            f"Lade Whisper-Modell: {key.size} "
+            f"(device={key.device}, compute_type={key.compute_type})"
+        )
+        started = time.perf_counter()
+        try:
+            with span("model_load", model=key.size):
+                model = self._loader(key)
+        except Exception as e:
+            logger.error(f"Fehler beim Laden des Whisper-Modells: {e}")
+            raise
+        load_seconds = time.perf_counter() - started
+        MODEL_LOAD_SECONDS.observe(load_seconds, kind="whisper", model=key.size)
+
+        with self._lock:
+            self._entries[key] = _PoolEntry(
+                model=model,
+                memory_mb=memory_mb,
+                load_seconds=load_seconds,
+                last_used=time.monotonic(),
+            )
+            self._loads += 1
+
+        logger.info(
+            f"Whisper-Modell '{key.size}' erfolgreich geladen ({load_seconds:.1f}s)"
+        )
+        return model
+
+    def _evict_for(self, memory_mb: int):
+        """Verdrängt LRU-Modelle, bis ``memory_mb`` ins Budget passt (Lock gehalten)."""
+        evicted = False
+        for key in list(self._entries):
+            if self.used_memory_mb + memory_mb <= self.memory_budget_mb:
+                break
+            if self._entries[key].in_use:
+                continue
+            logger.info(f"Verdränge Whisper-Modell (LRU): {key.size}")
+            del self._entries[key]
+            self._evictions += 1
+            evicted = True
+
+        if self.used_memory_mb + memory_mb > self.memory_budget_mb:
+            logger.warning(
+                f"Whisper-Speicherbudget überschritten: "
+                f"{self.used_memory_mb + memory_mb} > {self.memory_budget_mb} MB"
+            )
+        if evicted:
+            _release_gpu_memory()
+
+    def unload(self, key: ModelKey | None = None) -> list[ModelKey]:
+        """Entlädt ein Modell (oder alle ohne ``key``); ausgeliehene bleiben."""
+        with self._lock:
+            keys = [key] if key is not None else list(self._entries)
+            removed = []
+            for k in keys:
+                entry = self._entries.get(k)
+                if entry is None:
+                    continue
+                if entry.in_use:
+                    logger.warning(f"Whisper-Modell '{k.size}' in Benutzung, bleibt geladen")
+                    continue
+                logger.info(f"Entlade Whisper-Modell: {k.size}")
+                del self._entries[k]
+                removed.append(k)
+
+        if removed:
+            _release_gpu_memory()
+        return removed
+
+    def stats(self) -> dict:
+        """Kennzahlen des Pools."""
+        with self._lock:
+            return {
+                "memory_budget_mb": self.memory_budget_mb,
+                "used_memory_mb": self.used_memory_mb,
+                "loads": self._loads,
+                "evictions": self._evictions,
+                "models": [
+                    {
+                        "model": key.size,
+                        "device": key.device,
+                        "compute_type": key.compute_type,
+                        "memory_mb": entry.memory_mb,
+                        "load_seconds": round(entry.load_seconds, 2),
+                        "in_use": entry.in_use,
+                    }
+                    for key, entry in self._entries.items()
+                ],
+            }
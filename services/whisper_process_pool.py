@@ -0,0 +1,515 @@
+"""
+Everlast AI Backend - Whisper Process Pool
+
+Optionales Prozess-Backend für Transkriptionen (``WHISPER_BACKEND=process``).
+
+Jeder Worker-Prozess hält seine eigenen, warmen Modelle. Audio wird über
+Shared Memory übergeben statt als gepickelte Bytes. Stirbt ein Worker
+(z.B. Absturz in CTranslate2), wird der Pool automatisch neu gestartet und
+die betroffenen Requests einmal wiederholt – der API-Prozess bleibt stehen.
+"""
+
+import asyncio
+import io
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Any, BinaryIO, Callable, Iterator
+
+import numpy as np
+
+from models.schemas import DecodeOptions, TranscribeResponse
+from services.metrics import MODEL_LOAD_SECONDS
+from services.whisper_pool import ModelKey
+
+logger = logging.getLogger(__name__)
+
+# Gestreamte Segment-Events zwischen Worker und API-Prozess: begrenzt, damit
+# ein langsamer Client den Worker bremst statt Speicher zu füllen
+STREAM_QUEUE_SIZE = 32
+
+# Wartezeit pro Versuch beim Lesen/Schreiben der Event-Queue (Abbruch-Prüfung)
+_STREAM_POLL_SECONDS = 0.25
+
+
+# ============================================================================
+# Worker-Prozess
+# ============================================================================
+
+# Pro Prozess geladene Modelle (LRU) und Konfiguration aus dem Initializer
+_worker_models: "OrderedDict[ModelKey, Any]" = OrderedDict()
+_worker_config: dict = {}
+
+
+class _SharedMemoryReader(io.RawIOBase):
+    """Lesbares, seekbares File-Objekt über einem Shared-Memory-Puffer (ohne Kopie)."""
+
+    def __init__(self, buffer: memoryview):
+        self._buffer = buffer
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, target) -> int:
+        n = min(len(target), len(self._buffer) - self._pos)
+        target[:n] = self._buffer[self._pos : self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos += offset
+        else:
+            self._pos = len(self._buffer) + offset
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def close(self):
+        self._buffer = memoryview(b"")
+        super().close()
+
+
+def _worker_init(config: dict, warm_key: ModelKey | None):
+    """Initializer der Worker-Prozesse: Konfiguration setzen, Modell vorwärmen."""
+    _worker_config.update(config)
+    logging.basicConfig(level=config.get("log_level", "INFO"))
+    if warm_key is not None:
+        try:
+            _worker_model(warm_key)
+        except Exception as e:
+            logger.error(f"Vorwärmen in Worker {os.getpid()} fehlgeschlagen: {e}")
+
+
+def _worker_model(key: ModelKey) -> Any:
+    model = _worker_models.get(key)
+    if model is not None:
+        _worker_models.move_to_end(key)
+        return model
+
+    from services.whisper_service import create_whisper_model
+
+    while len(_worker_models) >= _worker_config.get("max_models", 1):
+        _worker_models.popitem(last=False)
+
+    logger.info(f"Worker {os.getpid()}: lade Whisper-Modell {key.size}")
+    model = create_whisper_model(
+        key,
+        cpu_threads=_worker_config.get("cpu_threads", 0),
+        num_workers=_worker_config.get("num_workers", 1),
+    )
+    _worker_models[key] = model
+    return model
+
+
+def _worker_load(key: ModelKey) -> int:
+    _worker_model(key)
+    return os.getpid()
+
+
+@contextmanager
+def _open_source(source: str | tuple[str, int, str]) -> Iterator[Any]:
+    """
+    Öffnet die Audio-Quelle eines Auftrags im Worker.
+
+    ``source`` ist ein Dateipfad oder ``(shm_name, size, kind)`` mit
+    ``kind`` = "encoded" (Container-Bytes) bzw. "pcm" (float32-Samples).
+    """
+    if isinstance(source, str):
+        yield source
+        return
+
+    shm_name, size, kind = source
+    shm = shared_memory.SharedMemory(name=shm_name)
+    buffer = shm.buf[:size]
+    try:
+        if kind == "pcm":
+            yield np.frombuffer(buffer, dtype=np.float32)
+        else:
+            yield _SharedMemoryReader(buffer)
+    finally:
+        try:
+            buffer.release()
+            shm.close()
+        except BufferError:
+            # Noch referenziert (z.B. von faster-whisper gehalten): beim GC frei
+            logger.debug("Shared-Memory-Puffer noch referenziert")
+
+
+def _worker_transcribe(
+    source: str | tuple[str, int, str],
+    key: ModelKey,
+    language: str,
+    options: DecodeOptions | None = None,
+) -> TranscribeResponse:
+    """Transkription im Worker-Prozess."""
+    from services.whisper_service import DEFAULT_DECODE, run_transcription
+
+    model = _worker_model(key)
+    with _open_source(source) as audio:
+        result = run_transcription(
+            model, audio, language, key.size, options or DEFAULT_DECODE
+        )
+        del audio  # Puffer-Referenz vor dem Schließen freigeben
+    return result
+
+
+def _worker_segments(
+    source: str | tuple[str, int, str],
+    key: ModelKey,
+    language: str,
+    word_timestamps: bool,
+    options: DecodeOptions | None = None,
+) -> list[dict]:
+    """Segment-Events (``info`` + ``segment``) einer Transkription im Worker."""
+    from services.whisper_service import DEFAULT_DECODE, iter_segment_events
+
+    model = _worker_model(key)
+    with _open_source(source) as audio:
+        events = list(
+            iter_segment_events(
+                model,
+                audio,
+                language,
+                key.size,
+                word_timestamps,
+                options or DEFAULT_DECODE,
+            )
+        )
+        del audio  # Puffer-Referenz vor dem Schließen freigeben
+    return events
+
+
+def _put_event(events: Any, stop: Any, event: dict | None) -> bool:
+    """Legt ein Event in die Queue; False, wenn der Stream abgebrochen wurde."""
+    while not stop.is_set():
+        try:
+            events.put(event, timeout=_STREAM_POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _worker_stream_segments(
+    source: str | tuple[str, int, str],
+    key: ModelKey,
+    language: str,
+    word_timestamps: bool,
+    options: DecodeOptions | None,
+    events: Any,
+    stop: Any,
+) -> None:
+    """
+    Segment-Events im Worker, jeweils sofort in ``events`` (Manager-Queue).
+
+    ``None`` markiert das Ende. Ist ``stop`` gesetzt (Client getrennt),
+    bricht der Worker nach dem aktuellen Segment ab.
+    """
+    from services.whisper_service import DEFAULT_DECODE, iter_segment_events
+
+    model = _worker_model(key)
+    with _open_source(source) as audio:
+        for event in iter_segment_events(
+            model,
+            audio,
+            language,
+            key.size,
+            word_timestamps,
+            options or DEFAULT_DECODE,
+        ):
+            if not _put_event(events, stop, event):
+                break
+        del audio  # Puffer-Referenz vor dem Schließen freigeben
+    _put_event(events, stop, None)
+
+
+def _worker_detect_language(
+    source: str | tuple[str, int, str], key: ModelKey
+) -> tuple[str, float]:
+    """Spracherkennung auf einem PCM-Fenster im Worker-Prozess."""
+    from services.whisper_service import detect_language
+
+    model = _worker_model(key)
+    with _open_source(source) as audio:
+        result = detect_language(model, audio)
+        del audio  # Puffer-Referenz vor dem Schließen freigeben
+    return result
+
+
+# ============================================================================
+# Parent-Seite
+# ============================================================================
+
+_COPY_CHUNK = 1024 * 1024
+
+
+def _to_shared_memory(
+    audio: BinaryIO | np.ndarray,
+) -> tuple[shared_memory.SharedMemory, int, str]:
+    """Kopiert Audio einmalig in ein neues Shared-Memory-Segment."""
+    if isinstance(audio, np.ndarray):
+        data = np.ascontiguousarray(audio, dtype=np.float32)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, data.nbytes))
+        np.ndarray(data.shape, dtype=np.float32, buffer=shm.buf)[:] = data
+        return shm, data.nbytes, "pcm"
+
+    audio.seek(0, io.SEEK_END)
+    size = audio.tell()
+    audio.seek(0)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, size))
+    pos = 0
+    while pos < size:
+        chunk = audio.read(min(_COPY_CHUNK, size - pos))
+        if not chunk:
+            break
+        shm.buf[pos : pos + len(chunk)] = chunk
+        pos += len(chunk)
+    return shm, pos, "encoded"
+
+
+def _release_shared_memory(shm: shared_memory.SharedMemory):
+    try:
+        shm.close()
+    finally:
+        shm.unlink()
+
+
+class WhisperProcessPool:
+    """Prozess-Pool mit warmen Modellen pro Worker und automatischem Neustart."""
+
+    def __init__(
+        self,
+        processes: int,
+        warm_key: ModelKey | None = None,
+        cpu_threads: int = 0,
+        num_workers: int = 1,
+        max_models: int = 1,
+        log_level: str = "INFO",
+    ):
+        self.processes = max(1, processes)
+        self._warm_key = warm_key
+        self._config = {
+            "cpu_threads": cpu_threads,
+            "num_workers": num_workers,
+            "max_models": max(1, max_models),
+            "log_level": log_level.upper(),
+        }
+        self._executor: ProcessPoolExecutor | None = None
+        self._generation = 0
+        self._restarts = 0
+        self._loaded_keys: set[ModelKey] = set()
+        # Manager-Prozess für Event-Queues des Segment-Streamings (bei Bedarf)
+        self._manager = None
+        self._manager_lock = threading.Lock()
+
+    @property
+    def loaded_keys(self) -> list[ModelKey]:
+        """Modelle, die in mindestens einem Worker geladen wurden."""
+        return list(self._loaded_keys)
+
+    def start(self):
+        """Startet die Worker-Prozesse (idempotent)."""
+        if self._executor is not None:
+            return
+        # spawn statt fork: sicher mit Threads und CUDA im Parent-Prozess
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_worker_init,
+            initargs=(self._config, self._warm_key),
+        )
+        self._generation += 1
+        logger.info(f"Whisper-Prozess-Pool gestartet ({self.processes} Prozesse)")
+
+    def _restart(self, generation: int):
+        """Startet den Pool nach einem Worker-Absturz neu (einmal pro Generation)."""
+        if generation != self._generation:
+            return  # bereits von einem anderen Request neu gestartet
+        logger.error("Whisper-Worker-Prozess abgestürzt, starte Pool neu")
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._loaded_keys.clear()
+        self._restarts += 1
+        self.start()
+
+    async def _submit(self, fn, *args, retry: bool = True) -> Any:
+        """
+        Führt ``fn`` in einem Worker aus; bei Absturz Neustart und eine
+        Wiederholung (ohne ``retry`` nur Neustart, z.B. wenn bereits Events
+        gestreamt wurden).
+        """
+        for attempt in range(2):
+            self.start()
+            generation = self._generation
+            try:
+                future = self._executor.submit(fn, *args)
+                return await asyncio.wrap_future(future)
+            except BrokenProcessPool:
+                self._restart(generation)
+                if not retry:
+                    raise RuntimeError("Whisper-Worker-Prozess abgestürzt") from None
+                if attempt == 1:
+                    raise RuntimeError(
+                        "Whisper-Worker-Prozess wiederholt abgestürzt"
+                    ) from None
+
+    async def load(self, key: ModelKey):
+        """Lädt ein Modell in die Worker (best effort: ein Auftrag pro Prozess)."""
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(self._submit(_worker_load, key) for _ in range(self.processes))
+        )
+        if key not in self._loaded_keys:
+            MODEL_LOAD_SECONDS.observe(
+                time.perf_counter() - started, kind="whisper", model=key.size
+            )
+        self._loaded_keys.add(key)
+
+    async def _run_with_audio(
+        self,
+        fn,
+        audio: str | BinaryIO | np.ndarray,
+        key: ModelKey,
+        *args,
+        retry: bool = True,
+    ) -> Any:
+        """Führt ``fn(source, key, *args)`` aus; Audio geht über Shared Memory."""
+        if isinstance(audio, str):
+            result = await self._submit(fn, audio, key, *args, retry=retry)
+        else:
+            shm, size, kind = await asyncio.to_thread(_to_shared_memory, audio)
+            try:
+                result = await self._submit(
+                    fn, (shm.name, size, kind), key, *args, retry=retry
+                )
+            finally:
+                _release_shared_memory(shm)
+        self._loaded_keys.add(key)
+        return result
+
+    async def transcribe(
+        self,
+        audio: str | BinaryIO | np.ndarray,
+        key: ModelKey,
+        language: str,
+        options: DecodeOptions | None = None,
+    ) -> TranscribeResponse:
+        """Transkribiert in einem Worker-Prozess."""
+        return await self._run_with_audio(
+            _worker_transcribe, audio, key, language, options
+        )
+
+    async def transcribe_segments(
+        self,
+        audio: str | BinaryIO | np.ndarray,
+        key: ModelKey,
+        language: str,
+        word_timestamps: bool = False,
+        options: DecodeOptions | None = None,
+    ) -> list[dict]:
+        """Segment-Events einer Transkription (gesammelt, nicht inkrementell)."""
+        return await self._run_with_audio(
+            _worker_segments, audio, key, language, word_timestamps, options
+        )
+
+    async def detect_language(
+        self, audio: np.ndarray, key: ModelKey
+    ) -> tuple[str, float]:
+        """Erkennt die Sprache eines PCM-Fensters in einem Worker-Prozess."""
+        return await self._run_with_audio(_worker_detect_language, audio, key)
+
+    def _stream_channel(self) -> tuple[Any, Any]:
+        """Event-Queue und Stop-Signal eines Streams (Manager beim ersten Bedarf)."""
+        with self._manager_lock:
+            if self._manager is None:
+                self._manager = multiprocessing.get_context("spawn").Manager()
+            return self._manager.Queue(maxsize=STREAM_QUEUE_SIZE), self._manager.Event()
+
+    async def stream_segments(
+        self,
+        audio: str | BinaryIO | np.ndarray,
+        key: ModelKey,
+        language: str,
+        word_timestamps: bool,
+        options: DecodeOptions | None,
+        emit: Callable[[dict], None],
+        stop: threading.Event,
+    ):
+        """
+        Segment-Events einer Transkription, sobald der Worker sie erzeugt.
+
+        Der Worker schreibt in eine begrenzte Manager-Queue, die hier gelesen
+        und an ``emit`` weitergereicht wird. Ist ``stop`` gesetzt (Client
+        getrennt), bricht der Worker nach dem aktuellen Segment ab. Nach
+        einem Absturz wird nicht wiederholt, da schon Events gesendet wurden.
+        """
+        events, worker_stop = await asyncio.to_thread(self._stream_channel)
+        task = asyncio.ensure_future(
+            self._run_with_audio(
+                _worker_stream_segments,
+                audio,
+                key,
+                language,
+                word_timestamps,
+                options,
+                events,
+                worker_stop,
+                retry=False,
+            )
+        )
+        try:
+            while not stop.is_set():
+                try:
+                    event = await asyncio.to_thread(
+                        events.get, True, _STREAM_POLL_SECONDS
+                    )
+                except queue.Empty:
+                    if task.done():
+                        break  # Worker beendet, ohne das Ende zu melden
+                    continue
+                if event is None:
+                    break
+                emit(event)
+            if not stop.is_set():
+                await task  # Fehler des Workers weiterreichen
+        finally:
+            worker_stop.set()
+            if not task.done():
+                # Worker beendet nur noch das aktuelle Segment
+                task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    def stats(self) -> dict:
+        """Kennzahlen des Prozess-Pools."""
+        return {
+            "processes": self.processes,
+            "running": self._executor is not None,
+            "restarts": self._restarts,
+            "loaded_models": [key.size for key in self._loaded_keys],
+        }
+
+    def shutdown(self):
+        """Beendet alle Worker-Prozesse (und damit alle geladenen Modelle)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._loaded_keys.clear()
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
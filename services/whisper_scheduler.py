@@ -0,0 +1,224 @@
+"""
+Everlast AI Backend - Whisper Scheduler
+
+Worker-Pool für Transkriptionen mit begrenzter Warteschlange und Backpressure.
+
+Transkriptionen laufen auf einer festen Anzahl Worker-Threads. Ist die
+Warteschlange voll, wird sofort ``WhisperBusyError`` ausgelöst (die API
+antwortet dann mit 503 und ``Retry-After``), statt Requests unbegrenzt zu
+stapeln. Modell-Ladevorgänge laufen auf einer eigenen Spur und blockieren
+keine laufenden Transkriptionen.
+
+Wartende Aufträge werden nach Priorität vergeben: interaktive Requests
+(``PRIORITY_INTERACTIVE``) kommen vor Hintergrund-Jobs (``PRIORITY_BATCH``),
+bei gleicher Priorität gilt die Reihenfolge des Eintreffens.
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable
+
+from services.metrics import WHISPER_QUEUE_WAIT_SECONDS
+from services.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Kleinere Werte werden zuerst bedient
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 10
+PRIORITY_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_BATCH: "batch"}
+
+
+class WhisperBusyError(Exception):
+    """Die Transkriptions-Warteschlange ist voll."""
+
+    def __init__(self, queue_depth: int, retry_after: int):
+        super().__init__(
+            f"Transkriptions-Warteschlange voll ({queue_depth} wartend)"
+        )
+        self.queue_depth = queue_depth
+        self.retry_after = retry_after
+
+
+class WhisperScheduler:
+    """Begrenzter Worker-Pool mit separater Lade-Spur."""
+
+    def __init__(self, workers: int = 2, max_queue: int = 16, load_workers: int = 1):
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="whisper"
+        )
+        self._load_executor = ThreadPoolExecutor(
+            max_workers=max(1, load_workers), thread_name_prefix="whisper-load"
+        )
+        self._running = 0
+        # Heap aus (Priorität, Reihenfolge, Future)
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+        # Statistiken
+        self._completed = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._run_avg = 0.0  # gleitender Mittelwert der Laufzeit (Sekunden)
+
+    @property
+    def queue_depth(self) -> int:
+        """Anzahl wartender Aufträge."""
+        return len(self._waiters)
+
+    @property
+    def running(self) -> int:
+        """Anzahl laufender Aufträge."""
+        return self._running
+
+    def retry_after(self) -> int:
+        """Geschätzte Sekunden, bis wieder ein Platz frei wird."""
+        if self._run_avg <= 0:
+            return 1
+        rounds = self.queue_depth / self.workers + 1
+        return max(1, math.ceil(rounds * self._run_avg))
+
+    def _is_full(self) -> bool:
+        """Ein neuer Auftrag müsste warten, die Warteschlange ist aber voll."""
+        busy = self._running >= self.workers or bool(self._waiters)
+        return busy and len(self._waiters) >= self.max_queue
+
+    def check_capacity(self):
+        """
+        Weist sofort ab, wenn ein neuer Auftrag nicht angenommen würde.
+
+        Für Vorarbeiten vor ``run`` (z.B. Modell laden), die sich für einen
+        abgewiesenen Request nicht lohnen.
+        """
+        if self._is_full():
+            self._rejected += 1
+            raise WhisperBusyError(len(self._waiters), self.retry_after())
+
+    async def _acquire(self, priority: int):
+        if self._running < self.workers and not self._waiters:
+            self._running += 1
+            return
+
+        self.check_capacity()
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._sequence), waiter)
+        heapq.heappush(self._waiters, entry)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Platz wurde bereits übergeben -> weiterreichen
+                self._release()
+            else:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+            raise
+
+    def _release(self):
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                # Platz direkt an den wichtigsten Wartenden übergeben
+                waiter.set_result(None)
+                return
+        self._running -= 1
+
+    async def _enter(self, priority: int) -> float:
+        """Wartet auf einen freien Platz; liefert den Startzeitpunkt."""
+        enqueued = time.perf_counter()
+        with span("queue", priority=priority):
+            await self._acquire(priority)
+        started = time.perf_counter()
+        waited = started - enqueued
+        WHISPER_QUEUE_WAIT_SECONDS.observe(
+            waited, priority=PRIORITY_NAMES.get(priority, str(priority))
+        )
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        return started
+
+    def _exit(self, started: float):
+        """Gibt den Platz frei und aktualisiert die Laufzeit-Statistik."""
+        elapsed = time.perf_counter() - started
+        self._run_avg = (
+            elapsed if self._completed == 0 else 0.8 * self._run_avg + 0.2 * elapsed
+        )
+        self._completed += 1
+        self._release()
+
+    async def run(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> Any:
+        """Führt ``fn(*args)`` auf einem Worker-Thread aus (mit Backpressure)."""
+        started = await self._enter(priority)
+        loop = asyncio.get_running_loop()
+        # Worker-Thread übernimmt den Kontext (Trace) des Aufrufers
+        context = contextvars.copy_context()
+        future = loop.run_in_executor(self._executor, context.run, fn, *args)
+        # Platz erst freigeben, wenn der Worker wirklich fertig ist – auch wenn
+        # der aufrufende Request vorher abgebrochen wurde
+        future.add_done_callback(lambda f: self._finish(f, started))
+        return await asyncio.shield(future)
+
+    def _finish(self, future: asyncio.Future, started: float):
+        if not future.cancelled():
+            future.exception()  # als abgerufen markieren
+        self._exit(started)
+
+    async def run_async(
+        self,
+        fn: Callable[..., Awaitable[Any]],
+        *args: Any,
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> Any:
+        """Führt eine Coroutine-Funktion unter denselben Worker-Limits aus.
+
+        Für Backends, die selbst asynchron auf ihre Worker warten
+        (z.B. den Prozess-Pool).
+        """
+        started = await self._enter(priority)
+        try:
+            return await fn(*args)
+        finally:
+            self._exit(started)
+
+    async def run_load(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Führt einen Modell-Ladevorgang auf der Lade-Spur aus."""
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self._load_executor, context.run, fn, *args)
+
+    def stats(self) -> dict:
+        """Kennzahlen des Schedulers."""
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "running": self._running,
+            "queue_depth": self.queue_depth,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "avg_wait_ms": (
+                round(self._wait_total / self._completed * 1000, 1)
+                if self._completed
+                else 0.0
+            ),
+            "max_wait_ms": round(self._wait_max * 1000, 1),
+            "avg_run_ms": round(self._run_avg * 1000, 1),
+        }
+
+    def shutdown(self):
+        """Beendet die Worker-Threads."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._load_executor.shutdown(wait=False, cancel_futures=True)
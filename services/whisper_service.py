@@ -4,19 +4,380 @@ Everlast AI Backend - Whisper Service
 faster-whisper basierter STT-Service für lokale Audio-Transkription.
 """
 
-import logging
-import tempfile
 import asyncio
-from pathlib import Path
+import bisect
+import logging
+import threading
+import time
+from collections import Counter
 from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    BinaryIO,
+    Callable,
+    Hashable,
+    Iterator,
+)
+
+import numpy as np
 
 from config import settings
-from models.schemas import TranscribeResponse
+from models.schemas import DecodeOptions, TranscribeResponse, TranscriptSegment
+from services.audio import (
+    WHISPER_SAMPLE_RATE,
+    AudioInput,
+    EmptyAudioError,
+    as_whisper_input,
+    decode_resampled,
+    decode_to_pcm,
+    decode_window,
+    describe_input,
+    hash_audio,
+    is_empty_input,
+    split_at_silences,
+    trim_silence,
+)
+from services.language_hints import LanguageHintCache
+from services.metrics import observe_language_detection, observe_transcription
+from services.response_cache import ResponseCache, make_cache_key
+from services.tracing import span
+from services.whisper_batcher import TranscriptionBatcher
+from services.whisper_pool import ModelKey, WhisperModelPool
+from services.whisper_process_pool import WhisperProcessPool
+from services.whisper_scheduler import PRIORITY_INTERACTIVE, WhisperScheduler
 
 logger = logging.getLogger(__name__)
 
-# Thread-Pool für CPU-intensive Whisper-Operationen
-_executor = ThreadPoolExecutor(max_workers=2)
+# Clips bis zu dieser Länge passen in ein Whisper-Fenster und können gebatcht werden
+BATCH_MAX_CLIP_SECONDS = 30.0
+
+# Decoder-Optionen des Presets "accurate": Beam-Size und Voice Activity
+# Detection, ggf. aus WHISPER_PROFILE_FILE
+DECODE_OPTIONS = settings.get_whisper_decode_options()
+
+# Presets für DecodeOptions.preset
+DECODE_PRESETS = {
+    "accurate": DECODE_OPTIONS,
+    # Greedy ohne Temperatur-Fallback und ohne Kontext aus dem Vorfenster:
+    # für kurze Kommandos, bei denen die Beam-Search kaum etwas gewinnt
+    "fast": {
+        "beam_size": 1,
+        "best_of": 1,
+        "temperature": 0.0,
+        "condition_on_previous_text": False,
+        "vad_filter": DECODE_OPTIONS["vad_filter"],
+    },
+}
+
+DEFAULT_DECODE = DecodeOptions()
+
+# DecodeOptions-Feld -> Feld von faster-whispers VadOptions
+_VAD_PARAMETERS = {
+    "vad_threshold": "threshold",
+    "vad_min_silence_ms": "min_silence_duration_ms",
+    "vad_speech_pad_ms": "speech_pad_ms",
+}
+
+# Im Batch legen clip_timestamps die Abschnitte fest, VAD entfällt
+_BATCH_EXCLUDED = {"vad_filter", "vad_parameters"}
+
+
+# language=auto: Sprache vorab auf einem kurzen Fenster erkennen
+LANGUAGE_AUTO = "auto"
+
+
+def decode_kwargs(options: DecodeOptions = DEFAULT_DECODE) -> dict:
+    """Argumente für ``WhisperModel.transcribe``: Preset plus Überschreibungen."""
+    kwargs = dict(DECODE_PRESETS[options.preset])
+    overrides = options.model_dump(exclude={"preset"}, exclude_none=True)
+    vad_parameters = {
+        name: overrides.pop(field)
+        for field, name in _VAD_PARAMETERS.items()
+        if field in overrides
+    }
+    kwargs.update(overrides)
+    if vad_parameters:
+        kwargs["vad_parameters"] = vad_parameters
+    return kwargs
+
+
+@dataclass
+class PreparedAudio:
+    """
+    Ergebnis der Vorverarbeitung: Audio für die Modell-Worker.
+
+    ``audio`` ist 16 kHz Mono-PCM ohne Stille am Rand (bzw. die unveränderte
+    Eingabe, wenn die Vorverarbeitung aus ist). ``offset`` ist die am Anfang
+    entfernte Stille, ``duration`` die Dauer vor dem Zuschneiden.
+    """
+
+    audio: str | BinaryIO | np.ndarray
+    offset: float = 0.0
+    duration: float | None = None
+
+    def restore(self, result: TranscribeResponse) -> TranscribeResponse:
+        """Bezieht Dauer und Segment-Zeitstempel wieder auf das Original."""
+        if self.duration is None:
+            return result
+        update: dict[str, Any] = {"duration": self.duration}
+        if result.segments and self.offset:
+            update["segments"] = [
+                segment.model_copy(
+                    update={
+                        "start": round(segment.start + self.offset, 2),
+                        "end": round(segment.end + self.offset, 2),
+                    }
+                )
+                for segment in result.segments
+            ]
+        return result.model_copy(update=update)
+
+
+def preprocess_audio(audio: str | BinaryIO | np.ndarray) -> PreparedAudio:
+    """
+    Dekodiert zu 16 kHz Mono float32 und schneidet Stille am Rand ab.
+
+    PCM-Eingaben (z.B. Segmente der WebSocket-Streams) sind bereits
+    segmentiert und werden nur auf Inhalt geprüft. Wirft
+    ``EmptyAudioError`` bei leerem Audio oder reiner Stille.
+    """
+    if isinstance(audio, np.ndarray):
+        if not len(audio):
+            raise EmptyAudioError("Audio ist leer")
+        return PreparedAudio(audio)
+
+    pcm = decode_resampled(audio)
+    start, end = trim_silence(
+        pcm,
+        threshold_db=settings.whisper_preprocess_silence_db,
+        pad_seconds=settings.whisper_preprocess_pad_ms / 1000,
+    )
+    if end <= start:
+        raise EmptyAudioError(
+            "Audio ist leer" if not len(pcm) else "Audio enthält nur Stille"
+        )
+    duration = len(pcm) / WHISPER_SAMPLE_RATE
+    if start or end < len(pcm):
+        logger.debug(
+            f"Stille abgeschnitten: {start / WHISPER_SAMPLE_RATE:.2f}s am Anfang, "
+            f"{(len(pcm) - end) / WHISPER_SAMPLE_RATE:.2f}s am Ende"
+        )
+    return PreparedAudio(pcm[start:end], start / WHISPER_SAMPLE_RATE, duration)
+
+
+def create_whisper_model(
+    key: ModelKey, cpu_threads: int = 0, num_workers: int = 1
+) -> Any:
+    """Erzeugt ein WhisperModel (im API-Prozess oder in einem Worker-Prozess)."""
+    from faster_whisper import WhisperModel
+
+    return WhisperModel(
+        key.size,
+        device=key.device,
+        compute_type=key.compute_type,
+        cpu_threads=cpu_threads,
+        num_workers=num_workers,
+    )
+
+
+def run_transcription(
+    model: Any,
+    audio: str | BinaryIO | np.ndarray,
+    language: str,
+    model_name: str,
+    options: DecodeOptions = DEFAULT_DECODE,
+) -> TranscribeResponse:
+    """Transkribiert mit einem geladenen Modell (Thread- und Prozess-Backend)."""
+    logger.info(
+        f"Transkribiere: {describe_input(audio)}, Sprache: {language}, "
+        f"Modell: {model_name}, Preset: {options.preset}"
+    )
+
+    # Transkription durchführen (Pfad, File-Objekt oder PCM); transcribe()
+    # dekodiert das Audio, führt VAD aus und berechnet die Mel-Features
+    # sofort, die Segmente entstehen erst beim Iterieren
+    with span("features"):
+        segments, info = model.transcribe(
+            audio, language=language, **decode_kwargs(options)
+        )
+
+    # Segmente zusammenführen
+    text_parts = []
+    with span("decode", model=model_name, preset=options.preset):
+        for segment in segments:
+            text_parts.append(segment.text.strip())
+
+    text = " ".join(text_parts)
+
+    logger.info(
+        f"Transkription abgeschlossen: {len(text)} Zeichen, "
+        f"Dauer: {info.duration:.1f}s, Sprache: {info.language}"
+    )
+
+    return TranscribeResponse(
+        text=text,
+        duration=info.duration,
+        language=info.language,
+        model=model_name,
+    )
+
+
+def detect_language(model: Any, pcm: np.ndarray) -> tuple[str, float]:
+    """
+    Erkennt die Sprache eines (kurzen) PCM-Fensters.
+
+    Nutzt ``WhisperModel.detect_language`` – ein Encoder-Durchlauf über das
+    Fenster statt der Erkennung über die ersten 30 s in ``transcribe``.
+    """
+    if not len(pcm):
+        raise EmptyAudioError("Kein Audio für die Spracherkennung")
+    if hasattr(model, "detect_language"):
+        language, probability, _ = model.detect_language(pcm)
+    else:
+        # Ältere faster-whisper-Versionen: Info aus transcribe (ohne Segmente)
+        _, info = model.transcribe(pcm, language=None, beam_size=1)
+        language, probability = info.language, info.language_probability
+    return language, round(float(probability), 3)
+
+
+def with_language(
+    result: TranscribeResponse, detected: tuple[str, float, str] | None
+) -> TranscribeResponse:
+    """Ergänzt Konfidenz und Herkunft einer automatisch erkannten Sprache."""
+    if detected is None:
+        return result
+    _, probability, source = detected
+    return result.model_copy(
+        update={"language_probability": probability, "language_source": source}
+    )
+
+
+def segment_event(segment: Any) -> dict:
+    """Wandelt ein faster-whisper-Segment in ein Stream-Event."""
+    event = {
+        "type": "segment",
+        "id": segment.id,
+        "text": segment.text.strip(),
+        "start": round(segment.start, 2),
+        "end": round(segment.end, 2),
+        "avg_logprob": round(segment.avg_logprob, 4),
+    }
+    if segment.words:
+        event["words"] = [
+            {
+                "word": word.word,
+                "start": round(word.start, 2),
+                "end": round(word.end, 2),
+                "probability": round(word.probability, 3),
+            }
+            for word in segment.words
+        ]
+    return event
+
+
+def iter_segment_events(
+    model: Any,
+    audio: str | BinaryIO | np.ndarray,
+    language: str,
+    model_name: str,
+    word_timestamps: bool = False,
+    options: DecodeOptions = DEFAULT_DECODE,
+) -> Iterator[dict]:
+    """
+    Transkribiert und liefert die Segmente, sobald faster-whisper sie erzeugt.
+
+    Erstes Event ist ``info`` (Sprache, Dauer), danach ein ``segment`` pro
+    Segment. Der Text wird nicht gesammelt, der Speicherbedarf bleibt auch
+    bei stundenlangen Aufnahmen konstant.
+    """
+    logger.info(
+        f"Transkribiere (Segment-Stream): {describe_input(audio)}, "
+        f"Sprache: {language}, Modell: {model_name}"
+    )
+    segments, info = model.transcribe(
+        audio,
+        language=language,
+        word_timestamps=word_timestamps,
+        **decode_kwargs(options),
+    )
+    yield {
+        "type": "info",
+        "language": info.language,
+        "language_probability": round(info.language_probability, 3),
+        "duration": info.duration,
+        "model": model_name,
+    }
+    for segment in segments:
+        yield segment_event(segment)
+
+
+def run_batched_transcription(
+    model: Any,
+    clips: list[np.ndarray],
+    language: str,
+    model_name: str,
+    options: DecodeOptions = DEFAULT_DECODE,
+) -> list[TranscribeResponse]:
+    """
+    Transkribiert mehrere kurze Clips in einem Batch.
+
+    Die Clips werden aneinandergehängt und als ``clip_timestamps`` an die
+    ``BatchedInferencePipeline`` übergeben, sodass jeder Clip ein Eintrag im
+    Batch ist. Die Segmente werden anhand ihrer Startzeit zurück auf die
+    Clips verteilt.
+    """
+    from faster_whisper import BatchedInferencePipeline
+
+    starts: list[float] = []
+    clip_timestamps = []
+    offset = 0
+    for clip in clips:
+        starts.append(offset / WHISPER_SAMPLE_RATE)
+        if len(clip):
+            clip_timestamps.append(
+                {
+                    "start": offset / WHISPER_SAMPLE_RATE,
+                    "end": (offset + len(clip)) / WHISPER_SAMPLE_RATE,
+                }
+            )
+        offset += len(clip)
+
+    texts: list[list[str]] = [[] for _ in clips]
+    detected_language = language
+    if clip_timestamps:
+        logger.info(f"Transkribiere Batch: {len(clips)} Clips, Modell: {model_name}")
+        kwargs = {
+            name: value
+            for name, value in decode_kwargs(options).items()
+            if name not in _BATCH_EXCLUDED
+        }
+        pipeline = BatchedInferencePipeline(model)
+        segments, info = pipeline.transcribe(
+            np.concatenate(clips),
+            language=language,
+            clip_timestamps=clip_timestamps,
+            batch_size=len(clip_timestamps),
+            **kwargs,
+        )
+        detected_language = info.language
+        for segment in segments:
+            # Kleine Toleranz gegen Rundung der Segment-Startzeiten
+            index = bisect.bisect_right(starts, segment.start + 0.01) - 1
+            texts[max(0, index)].append(segment.text.strip())
+
+    return [
+        TranscribeResponse(
+            text=" ".join(parts),
+            duration=len(clip) / WHISPER_SAMPLE_RATE,
+            language=detected_language,
+            model=model_name,
+        )
+        for parts, clip in zip(texts, clips)
+    ]
 
 
 class WhisperService:
@@ -34,12 +395,43 @@ class WhisperService:
         self._model_size = model_size
         self._device = device
         self._compute_type = compute_type
-        self._model = None
-        self._loaded_model_size: str | None = None
+        self._pool: WhisperModelPool | None = None
+        self._last_model_size: str | None = None
+        self._last_used: dict[str, float] = {}
+        self._scheduler = WhisperScheduler(
+            workers=settings.whisper_workers,
+            max_queue=settings.whisper_max_queue,
+        )
+        self._process_pool: WhisperProcessPool | None = None
+        # Dekodieren/Zuschneiden getrennt von den Modell-Workern (PyAV und
+        # NumPy geben den GIL frei)
+        self._preprocess_executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.whisper_preprocess_workers),
+            thread_name_prefix="whisper-preprocess",
+        )
+        self._batcher: TranscriptionBatcher | None = None
+        if settings.whisper_batch_enabled:
+            self._batcher = TranscriptionBatcher(
+                self._run_batch,
+                max_batch_size=settings.whisper_batch_max_size,
+                max_wait_ms=settings.whisper_batch_max_wait_ms,
+            )
+        self._language_hints = LanguageHintCache(
+            max_entries=settings.whisper_language_hint_max_entries,
+            ttl=settings.whisper_language_hint_ttl,
+        )
+        self._cache: ResponseCache | None = None
+        if settings.whisper_cache_enabled:
+            self._cache = ResponseCache(
+                "whisper",
+                max_entries=settings.whisper_cache_max_entries,
+                ttl=settings.whisper_cache_ttl,
+                db_path=settings.whisper_cache_db,
+            )
 
     @property
     def model_size(self) -> str:
-        """Aktive Modellgröße."""
+        """Standard-Modellgröße (wenn der Request keine angibt)."""
         return self._model_size or settings.get_default_stt_model()
 
     @property
@@ -53,159 +445,812 @@ class WhisperService:
         return self._compute_type or settings.get_whisper_compute_type()
 
     @property
-    def is_loaded(self) -> bool:
-        """Prüft ob ein Modell geladen ist."""
-        return self._model is not None
+    def pool(self) -> WhisperModelPool:
+        """Registry der geladenen Modelle (Budget wird beim ersten Zugriff bestimmt)."""
+        if self._pool is None:
+            self._pool = WhisperModelPool(
+                settings.get_whisper_memory_budget_mb(),
+                loader=self._create_model,
+            )
+        return self._pool
 
-    def _load_model(self):
-        """Lädt das Whisper-Modell (synchron, für Thread-Pool)."""
-        if self._model is not None and self._loaded_model_size == self.model_size:
-            return
+    @property
+    def scheduler(self) -> WhisperScheduler:
+        """Worker-Pool für Transkriptionen."""
+        return self._scheduler
 
-        try:
-            from faster_whisper import WhisperModel
+    @property
+    def batcher(self) -> TranscriptionBatcher | None:
+        """Micro-Batcher für kurze Clips (None wenn deaktiviert)."""
+        return self._batcher
 
-            logger.info(
-                f"Lade Whisper-Modell: {self.model_size} "
-                f"(device={self.device}, compute_type={self.compute_type})"
-            )
+    @property
+    def cache(self) -> ResponseCache | None:
+        """Transkript-Cache (None, wenn deaktiviert)."""
+        return self._cache
+
+    @property
+    def language_hints(self) -> LanguageHintCache:
+        """Pro Sitzung erkannte Sprachen (für ``language=auto``)."""
+        return self._language_hints
 
-            self._model = WhisperModel(
-                self.model_size,
-                device=self.device,
-                compute_type=self.compute_type,
+    @property
+    def uses_processes(self) -> bool:
+        """True, wenn Transkriptionen in Worker-Prozessen laufen."""
+        return settings.whisper_backend == "process"
+
+    @property
+    def process_pool(self) -> WhisperProcessPool:
+        """Prozess-Backend (nur bei ``WHISPER_BACKEND=process``)."""
+        if self._process_pool is None:
+            self._process_pool = WhisperProcessPool(
+                processes=self._scheduler.workers,
+                warm_key=self.model_key(),
+                cpu_threads=settings.get_whisper_cpu_threads(),
+                num_workers=settings.whisper_num_workers,
+                max_models=settings.whisper_process_max_models,
+                log_level=settings.log_level,
             )
-            self._loaded_model_size = self.model_size
+        return self._process_pool
 
-            logger.info(f"Whisper-Modell '{self.model_size}' erfolgreich geladen")
+    def _loaded_keys(self) -> list[ModelKey]:
+        if self.uses_processes:
+            return self.process_pool.loaded_keys if self._process_pool else []
+        return self.pool.loaded_keys()
 
-        except Exception as e:
-            logger.error(f"Fehler beim Laden des Whisper-Modells: {e}")
-            raise
+    @property
+    def is_loaded(self) -> bool:
+        """Prüft ob mindestens ein Modell geladen ist."""
+        return bool(self._loaded_keys())
+
+    @property
+    def loaded_models(self) -> list[str]:
+        """Größen der geladenen Modelle (zuletzt benutztes zuletzt)."""
+        return [key.size for key in self._loaded_keys()]
+
+    @property
+    def last_model_size(self) -> str | None:
+        """Zuletzt verwendetes Modell (falls noch geladen)."""
+        if self._last_model_size in self.loaded_models:
+            return self._last_model_size
+        loaded = self.loaded_models
+        return loaded[-1] if loaded else None
+
+    def _mark_used(self, model_size: str):
+        self._last_model_size = model_size
+        self._last_used[model_size] = time.monotonic()
 
-    async def load_model(self):
-        """Lädt das Modell asynchron."""
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(_executor, self._load_model)
+    def recently_used(self, window: float) -> list[str]:
+        """Modelle, die in den letzten ``window`` Sekunden benutzt wurden."""
+        cutoff = time.monotonic() - window
+        return [size for size, used in self._last_used.items() if used >= cutoff]
+
+    def set_default_model(self, model_size: str):
+        """Setzt das Standard-Modell für Requests ohne Modellangabe."""
+        self._model_size = model_size
+
+    def model_key(self, model_size: str | None = None) -> ModelKey:
+        """Pool-Schlüssel für ein Modell (Default: Standard-Modell)."""
+        return ModelKey(model_size or self.model_size, self.device, self.compute_type)
+
+    @staticmethod
+    def _create_model(key: ModelKey) -> Any:
+        """Erzeugt ein WhisperModel mit den konfigurierten Thread-Einstellungen."""
+        return create_whisper_model(
+            key,
+            cpu_threads=settings.get_whisper_cpu_threads(),
+            num_workers=settings.whisper_num_workers,
+        )
+
+    def _load_model(self, model_size: str | None = None):
+        """Lädt ein Whisper-Modell in den Pool (synchron, für Thread-Pool)."""
+        self.pool.get(self.model_key(model_size))
+
+    async def load_model(self, model_size: str | None = None):
+        """Lädt ein Modell asynchron (auf der Lade-Spur des Schedulers)."""
+        if self.uses_processes:
+            await self.process_pool.load(self.model_key(model_size))
+            return
+        await self._scheduler.run_load(self._load_model, model_size)
+
+    async def preprocess(self, audio: str | BinaryIO | np.ndarray) -> PreparedAudio:
+        """
+        Vorverarbeitung im eigenen Thread-Pool (siehe ``preprocess_audio``).
+
+        Die Modell-Worker erhalten danach fertiges PCM und rechnen nur noch
+        Inferenz. Mit ``WHISPER_PREPROCESS_ENABLED=false`` wird die Eingabe
+        unverändert weitergereicht.
+        """
+        if not settings.whisper_preprocess_enabled:
+            return PreparedAudio(audio)
+        loop = asyncio.get_running_loop()
+        with span("preprocess"):
+            return await loop.run_in_executor(
+                self._preprocess_executor, preprocess_audio, audio
+            )
+
+    async def _ensure_loaded(self, model_size: str | None):
+        """
+        Lädt fehlende Modelle vorab, damit Transkriptions-Worker nicht warten.
+
+        Würde die Queue den Auftrag ohnehin abweisen, gibt es sofort
+        ``WhisperBusyError`` – ohne Ladevorgang und LRU-Verdrängung.
+        """
+        if not self.pool.is_loaded(self.model_key(model_size)):
+            self._scheduler.check_capacity()
+            await self.load_model(model_size)
 
     def _transcribe_sync(
         self,
-        audio_path: str,
+        audio: str | BinaryIO | np.ndarray,
         language: str = "de",
+        model_size: str | None = None,
+        options: DecodeOptions = DEFAULT_DECODE,
     ) -> TranscribeResponse:
         """Synchrone Transkription (für Thread-Pool)."""
-        self._load_model()
+        key = self.model_key(model_size)
 
-        logger.info(f"Transkribiere: {audio_path}, Sprache: {language}")
-
-        # Transkription durchführen
-        segments, info = self._model.transcribe(
-            audio_path,
-            language=language,
-            beam_size=5,
-            vad_filter=True,  # Voice Activity Detection
+        with self.pool.lease(key) as model:
+            self._mark_used(key.size)
+            started = time.perf_counter()
+            result = run_transcription(model, audio, language, key.size, options)
+        observe_transcription(
+            key.size, time.perf_counter() - started, result.duration, options.preset
         )
+        return result
 
-        # Segmente zusammenführen
-        text_parts = []
-        for segment in segments:
-            text_parts.append(segment.text.strip())
+    def _detect_language_sync(
+        self, pcm: np.ndarray, key: ModelKey
+    ) -> tuple[str, float]:
+        """Spracherkennung (für Thread-Pool)."""
+        with self.pool.lease(key) as model:
+            self._mark_used(key.size)
+            return detect_language(model, pcm)
 
-        text = " ".join(text_parts)
+    def _session_language(
+        self, session_key: str | None
+    ) -> tuple[str, float, str] | None:
+        """Für die Sitzung gemerkte Sprache (ohne Modellaufruf)."""
+        if session_key is None:
+            return None
+        hint = self._language_hints.get(session_key)
+        if hint is None:
+            return None
+        observe_language_detection(hint.language, "session")
+        return hint.language, hint.probability, "session"
 
-        logger.info(
-            f"Transkription abgeschlossen: {len(text)} Zeichen, "
-            f"Dauer: {info.duration:.1f}s, Sprache: {info.language}"
-        )
+    def _remember_language(
+        self, session_key: str | None, language: str | None, probability: float | None
+    ):
+        """Merkt eine erkannte Sprache ab ``WHISPER_LANGUAGE_HINT_MIN_PROBABILITY``."""
+        if (
+            session_key is not None
+            and language is not None
+            and probability is not None
+            and probability >= settings.whisper_language_hint_min_probability
+        ):
+            self._language_hints.put(session_key, language, probability)
 
-        return TranscribeResponse(
-            text=text,
-            duration=info.duration,
-            language=info.language,
-            model=self._loaded_model_size or self.model_size,
-        )
+    async def _detect_language(
+        self,
+        audio: str | BinaryIO | np.ndarray,
+        model: str | None,
+        session_key: str | None,
+        priority: int,
+    ) -> tuple[str, float, str]:
+        """
+        Erkennt die Sprache auf dem ersten Fenster (``WHISPER_LANGUAGE_DETECT_SECONDS``).
+
+        ``audio`` ist normalerweise schon vorverarbeitet (Stille am Rand
+        entfernt); bei rohem Audio (Segment-Stream) wird zumindest Stille am
+        Rand des Fensters übersprungen.
+        """
+        key = self.model_key(model)
+        with span("language_detect", model=key.size):
+            window = await asyncio.to_thread(
+                decode_window, audio, settings.whisper_language_detect_seconds
+            )
+            if not len(window):
+                raise EmptyAudioError("Audio ist leer")
+            start, end = trim_silence(
+                window,
+                threshold_db=settings.whisper_preprocess_silence_db,
+                pad_seconds=settings.whisper_preprocess_pad_ms / 1000,
+            )
+            if end > start:
+                window = window[start:end]
+            if self.uses_processes:
+                self._mark_used(key.size)
+                language, probability = await self._scheduler.run_async(
+                    self.process_pool.detect_language,
+                    window,
+                    key,
+                    priority=priority,
+                )
+            else:
+                await self._ensure_loaded(model)
+                language, probability = await self._scheduler.run(
+                    self._detect_language_sync, window, key, priority=priority
+                )
+
+        logger.info(f"Sprache erkannt: {language} ({probability:.2f})")
+        observe_language_detection(language, "detected")
+        self._remember_language(session_key, language, probability)
+        return language, probability, "detected"
+
+    async def resolve_language(
+        self,
+        audio: str | BinaryIO | np.ndarray,
+        model: str | None = None,
+        session_key: str | None = None,
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> tuple[str, float, str]:
+        """
+        Sprache für ``language=auto``: (Sprache, Konfidenz, Herkunft).
+
+        Ist für ``session_key`` bereits eine Sprache bekannt, wird sie ohne
+        Modellaufruf übernommen (``session``). Sonst wird nur das erste
+        Fenster dekodiert und erkannt (``detected``); ab
+        ``WHISPER_LANGUAGE_HINT_MIN_PROBABILITY`` merkt sich der Service das
+        Ergebnis für die Sitzung.
+        """
+        detected = self._session_language(session_key)
+        if detected is not None:
+            return detected
+        return await self._detect_language(audio, model, session_key, priority)
+
+    async def _transcribe_resolved(
+        self,
+        audio: str | BinaryIO | np.ndarray,
+        language: str,
+        model: str | None,
+        long_audio: bool,
+        priority: int,
+        options: DecodeOptions,
+        session_key: str | None = None,
+        use_cache: bool = True,
+    ) -> TranscribeResponse:
+        """
+        Gemeinsamer Ablauf von ``transcribe`` und ``transcribe_file``.
+
+        Bei ``language=auto`` gilt zuerst die Sitzungssprache. Ist keine
+        bekannt, läuft die Spracherkennung erst bei einem Cache-Miss; das
+        Transkript wird unter der Sprache ``auto`` gecacht, samt erkannter
+        Sprache und Konfidenz.
+        """
+
+        async def run(language: str) -> TranscribeResponse:
+            prepared = await self.preprocess(audio)
+            recognized = None
+            if language == LANGUAGE_AUTO:
+                # Erst nach der Vorverarbeitung: Stille am Anfang würde
+                # sonst das Erkennungsfenster füllen
+                recognized = await self._detect_language(
+                    prepared.audio, model, session_key, priority
+                )
+                language = recognized[0]
+            if long_audio:
+                result = await self._transcribe_long(
+                    prepared, language, model, priority, options
+                )
+            else:
+                result = await self._transcribe_uncached(
+                    prepared, language, model, options, priority
+                )
+            return with_language(result, recognized)
+
+        detected = None
+        if language == LANGUAGE_AUTO:
+            detected = self._session_language(session_key)
+            if detected is not None:
+                language = detected[0]
+        compute = partial(run, language)
+
+        if not use_cache:
+            return with_language(await compute(), detected)
+        result = await self._cached(audio, language, model, compute, long_audio, options)
+        if language == LANGUAGE_AUTO and result.cached:
+            # Erkennung aus dem Cache übernehmen, auch für die Sitzung
+            self._remember_language(
+                session_key, result.language, result.language_probability
+            )
+        return with_language(result, detected)
 
     async def transcribe(
         self,
-        audio_data: bytes,
+        audio_data: AudioInput,
         language: str = "de",
         mime_type: str = "audio/webm",
+        model: str | None = None,
+        use_cache: bool = True,
+        long_audio: bool = False,
+        options: DecodeOptions | None = None,
+        session_key: str | None = None,
     ) -> TranscribeResponse:
         """
         Transkribiere Audio-Daten.
 
+        Das Audio wird ohne temporäre Datei direkt an faster-whisper
+        übergeben; das Container-Format erkennt PyAV anhand des Inhalts.
+
         Args:
-            audio_data: Raw Audio-Bytes
-            language: Zielsprache (ISO 639-1)
-            mime_type: MIME-Type der Audio-Daten
+            audio_data: Raw Audio-Bytes, File-Objekt (z.B. gespoolter Upload)
+                oder 16 kHz Mono float32-PCM
+            language: Zielsprache (ISO 639-1) oder ``auto`` (siehe
+                ``resolve_language``)
+            mime_type: MIME-Type der Audio-Daten (nur für Logs)
+            model: Whisper-Modell für diesen Request (Default: Standard-Modell)
+            use_cache: Transkript-Cache nutzen (aus für einmalige Ausschnitte,
+                z.B. Streaming-Segmente)
+            long_audio: Langaudio-Modus – Abschnitte parallel transkribieren
+                (siehe ``_transcribe_long``)
+            options: Decoder-Preset und Überschreibungen (Default: accurate)
+            session_key: Client/Sitzung, für die eine erkannte Sprache
+                wiederverwendet wird (nur bei ``language=auto``)
 
         Returns:
             TranscribeResponse mit transkribiertem Text
         """
-        # Dateiendung aus MIME-Type ableiten
-        ext_map = {
-            "audio/webm": ".webm",
-            "audio/wav": ".wav",
-            "audio/wave": ".wav",
-            "audio/mp3": ".mp3",
-            "audio/mpeg": ".mp3",
-            "audio/ogg": ".ogg",
-            "audio/flac": ".flac",
-            "audio/m4a": ".m4a",
-            "audio/mp4": ".m4a",
-        }
-        extension = ext_map.get(mime_type, ".webm")
+        audio = as_whisper_input(audio_data)
+        options = options or DEFAULT_DECODE
+        logger.debug(f"Audio-Eingabe: {describe_input(audio)}, {mime_type}")
+        return await self._transcribe_resolved(
+            audio,
+            language,
+            model,
+            long_audio,
+            PRIORITY_INTERACTIVE,
+            options,
+            session_key,
+            use_cache,
+        )
+
+    async def _transcribe_uncached(
+        self,
+        prepared: PreparedAudio,
+        language: str,
+        model: str | None,
+        options: DecodeOptions = DEFAULT_DECODE,
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> TranscribeResponse:
+        audio = prepared.audio
+        # Kurze interaktive Clips über den Micro-Batcher, lange Dateien und
+        # Hintergrund-Jobs einzeln
+        if (
+            self._batcher is not None
+            and not self.uses_processes
+            and priority == PRIORITY_INTERACTIVE
+        ):
+            if not isinstance(audio, np.ndarray):
+                with span("audio_decode"):
+                    audio = await asyncio.to_thread(decode_to_pcm, audio)
+            if len(audio) <= BATCH_MAX_CLIP_SECONDS * WHISPER_SAMPLE_RATE:
+                group = (self.model_key(model), language, options)
+                return prepared.restore(await self._batcher.submit(group, audio))
 
-        # Temporäre Datei erstellen
-        with tempfile.NamedTemporaryFile(suffix=extension, delete=False) as tmp:
-            tmp.write(audio_data)
-            tmp_path = Path(tmp.name)
+        result = await self._run(audio, language, model, priority, options)
+        return prepared.restore(result)
 
+    async def transcribe_file(
+        self,
+        file_path: str,
+        language: str = "de",
+        model: str | None = None,
+        long_audio: bool = False,
+        priority: int = PRIORITY_INTERACTIVE,
+        options: DecodeOptions | None = None,
+    ) -> TranscribeResponse:
+        """
+        Transkribiere eine Audio-Datei direkt (optional im Langaudio-Modus).
+
+        ``priority`` ordnet den Auftrag in der Worker-Warteschlange ein
+        (z.B. ``PRIORITY_BATCH`` für Hintergrund-Jobs).
+        """
+        options = options or DEFAULT_DECODE
+        return await self._transcribe_resolved(
+            file_path, language, model, long_audio, priority, options
+        )
+
+    async def _transcribe_long(
+        self,
+        prepared: PreparedAudio,
+        language: str,
+        model: str | None,
+        priority: int = PRIORITY_INTERACTIVE,
+        options: DecodeOptions = DEFAULT_DECODE,
+    ) -> TranscribeResponse:
+        """
+        Langaudio-Modus: an Sprechpausen schneiden und parallel transkribieren.
+
+        Die Abschnitte laufen gleichzeitig auf allen Workern (Threads oder
+        Prozesse), höchstens einer pro Worker, damit die Queue für
+        interaktive Requests frei bleibt. Die Segmente werden in
+        Reihenfolge und mit korrigierten Zeitstempeln zusammengefügt.
+        """
+        key = self.model_key(model)
+        pcm = prepared.audio
+        if not isinstance(pcm, np.ndarray):
+            with span("audio_decode"):
+                pcm = await asyncio.to_thread(decode_to_pcm, pcm)
+        duration = len(pcm) / WHISPER_SAMPLE_RATE
+        workers = self._scheduler.workers
+        # Zwei Abschnitte pro Worker gleichen unterschiedliche Laufzeiten aus
+        target = max(settings.whisper_long_min_chunk_seconds, duration / (2 * workers))
+        with span("vad"):
+            chunks = await asyncio.to_thread(split_at_silences, pcm, target)
+        logger.info(
+            f"Langaudio: {duration:.0f}s in {len(chunks)} Abschnitte "
+            f"auf {workers} Worker verteilt"
+        )
+
+        if not self.uses_processes:
+            await self._ensure_loaded(model)
+        limit = asyncio.Semaphore(workers)
+
+        async def run_chunk(start: int, end: int) -> list[dict]:
+            async with limit:
+                if self.uses_processes:
+                    return await self._scheduler.run_async(
+                        self.process_pool.transcribe_segments,
+                        pcm[start:end],
+                        key,
+                        language,
+                        False,
+                        options,
+                        priority=priority,
+                    )
+                return await self._scheduler.run(
+                    self._segments_sync,
+                    pcm[start:end],
+                    key,
+                    language,
+                    options,
+                    priority=priority,
+                )
+
+        started = time.perf_counter()
+        tasks = [asyncio.ensure_future(run_chunk(start, end)) for start, end in chunks]
         try:
-            # Transkription im Thread-Pool ausführen
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                _executor,
-                self._transcribe_sync,
-                str(tmp_path),
-                language,
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        self._mark_used(key.size)
+        # Einmal für das ganze Audio: Wandzeit über alle parallelen Abschnitte
+        observe_transcription(
+            key.size, time.perf_counter() - started, duration, options.preset
+        )
+
+        segments: list[TranscriptSegment] = []
+        languages: Counter[str] = Counter()
+        for (start, _), events in zip(chunks, results):
+            offset = start / WHISPER_SAMPLE_RATE
+            for event in events:
+                if event["type"] == "info":
+                    languages[event["language"]] += 1
+                    continue
+                segments.append(
+                    TranscriptSegment(
+                        id=len(segments),
+                        text=event["text"],
+                        start=round(event["start"] + offset, 2),
+                        end=round(event["end"] + offset, 2),
+                        avg_logprob=event["avg_logprob"],
+                    )
+                )
+
+        text = " ".join(segment.text for segment in segments if segment.text)
+        logger.info(
+            f"Langaudio abgeschlossen: {len(text)} Zeichen, {len(segments)} Segmente"
+        )
+        result = TranscribeResponse(
+            text=text,
+            duration=duration,
+            language=languages.most_common(1)[0][0] if languages else language,
+            model=key.size,
+            segments=segments,
+        )
+        return prepared.restore(result)
+
+    def _segments_sync(
+        self,
+        audio: np.ndarray,
+        key: ModelKey,
+        language: str,
+        options: DecodeOptions = DEFAULT_DECODE,
+    ) -> list[dict]:
+        """Segment-Events eines Abschnitts (für Thread-Pool)."""
+        with self.pool.lease(key) as model:
+            return list(
+                iter_segment_events(
+                    model, audio, language, key.size, options=options
+                )
             )
-            return result
 
+    async def transcribe_stream(
+        self,
+        audio_data: AudioInput,
+        language: str = "de",
+        model: str | None = None,
+        word_timestamps: bool = False,
+        options: DecodeOptions | None = None,
+        session_key: str | None = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Transkribiert und liefert Segment-Events, während das Modell noch läuft.
+
+        Die Segmente werden im Worker-Thread aus dem Generator von
+        faster-whisper gelesen und über eine asyncio-Queue weitergereicht.
+        Wird der Generator geschlossen (Client getrennt), bricht der Worker
+        nach dem aktuellen Segment ab und gibt seinen Platz frei.
+
+        Events: ``info``, ``segment`` (text, start, end, avg_logprob,
+        optional words) und abschließend ``done``. Bei ``language=auto``
+        enthält ``info`` Konfidenz und Herkunft der erkannten Sprache.
+
+        Ohne Vorverarbeitung (``preprocess``): sie müsste die ganze Datei
+        dekodieren, bevor das erste Segment kommt. Nur leere Uploads werden
+        vorab abgewiesen.
+        """
+        audio = as_whisper_input(audio_data)
+        if is_empty_input(audio):
+            raise EmptyAudioError("Audio ist leer")
+        options = options or DEFAULT_DECODE
+        key = self.model_key(model)
+        started = time.perf_counter()
+        count = 0
+        detected = None
+        if language == LANGUAGE_AUTO:
+            detected = await self.resolve_language(audio, model, session_key)
+            language = detected[0]
+
+        def finish_event(event: dict) -> dict:
+            if detected is not None and event["type"] == "info":
+                event["language_probability"] = detected[1]
+                event["language_source"] = detected[2]
+            return event
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[dict | None] = asyncio.Queue()
+        stop = threading.Event()
+
+        def emit(event: dict):
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+
+        stream_args = (audio, key, language, word_timestamps, options, emit, stop)
+        if self.uses_processes:
+            # Der Worker-Prozess schickt jedes Segment sofort über eine Queue
+            self._mark_used(key.size)
+            run = self._scheduler.run_async(self._stream_process, *stream_args)
+        else:
+            await self._ensure_loaded(model)
+            run = self._scheduler.run(self._stream_sync, *stream_args)
+        task = asyncio.ensure_future(run)
+        # Ende signalisieren – auch wenn der Auftrag nie gestartet ist
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+        try:
+            while (event := await queue.get()) is not None:
+                count += event["type"] == "segment"
+                yield finish_event(event)
+            await task  # Fehler (z.B. WhisperBusyError) weiterreichen
         finally:
-            # Temporäre Datei aufräumen
-            tmp_path.unlink(missing_ok=True)
+            stop.set()
+            if not task.done():
+                task.cancel()
 
-    async def transcribe_file(
+        yield {
+            "type": "done",
+            "segments": count,
+            "elapsed_ms": int((time.perf_counter() - started) * 1000),
+        }
+
+    def _stream_sync(
         self,
-        file_path: str,
-        language: str = "de",
+        audio: str | BinaryIO | np.ndarray,
+        key: ModelKey,
+        language: str,
+        word_timestamps: bool,
+        options: DecodeOptions,
+        emit: Callable[[dict], None],
+        stop: threading.Event,
+    ):
+        """Liest den Segment-Generator im Worker-Thread (für ``transcribe_stream``)."""
+        with self.pool.lease(key) as model:
+            self._mark_used(key.size)
+            with span("decode", model=key.size, preset=options.preset, stream=True):
+                for event in iter_segment_events(
+                    model, audio, language, key.size, word_timestamps, options
+                ):
+                    if stop.is_set():
+                        logger.info("Segment-Stream abgebrochen (Client getrennt)")
+                        return
+                    emit(event)
+
+    async def _stream_process(
+        self,
+        audio: str | BinaryIO | np.ndarray,
+        key: ModelKey,
+        language: str,
+        word_timestamps: bool,
+        options: DecodeOptions,
+        emit: Callable[[dict], None],
+        stop: threading.Event,
+    ):
+        """Segment-Stream im Prozess-Backend (für ``transcribe_stream``)."""
+        with span(
+            "decode", model=key.size, preset=options.preset, stream=True, backend="process"
+        ):
+            await self.process_pool.stream_segments(
+                audio, key, language, word_timestamps, options, emit, stop
+            )
+
+    async def _cached(
+        self,
+        audio: str | BinaryIO | np.ndarray,
+        language: str,
+        model: str | None,
+        compute: Callable[[], Awaitable[TranscribeResponse]],
+        long_audio: bool = False,
+        options: DecodeOptions = DEFAULT_DECODE,
     ) -> TranscribeResponse:
-        """Transkribiere eine Audio-Datei direkt."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            _executor,
+        """
+        Liefert das Transkript aus dem Cache oder berechnet es genau einmal.
+
+        Der Schlüssel ist der SHA-256 des Audio-Inhalts zusammen mit Modell,
+        Sprache, Decoder-Preset und -Optionen; identische gleichzeitige Uploads werden
+        nur einmal transkribiert.
+        """
+        if self._cache is None:
+            return await compute()
+
+        key = self.model_key(model)
+        with span("hash"):
+            audio_hash = await asyncio.to_thread(hash_audio, audio)
+        cache_key = make_cache_key(
+            {
+                "audio": audio_hash,
+                "model": key.size,
+                "compute_type": key.compute_type,
+                "language": language,
+                "preset": options.preset,
+                "options": decode_kwargs(options),
+                "long_audio": long_audio,
+            }
+        )
+
+        async def _compute() -> dict:
+            return (await compute()).model_dump(exclude={"cached"})
+
+        data, cached = await self._cache.get_or_compute(
+            cache_key, _compute, tag=key.size
+        )
+        if cached:
+            logger.info(f"Transkript aus Cache: {audio_hash[:12]}, Modell: {key.size}")
+        return TranscribeResponse(**data, cached=cached)
+
+    async def _run(
+        self,
+        audio: str | BinaryIO | np.ndarray,
+        language: str,
+        model_size: str | None,
+        priority: int = PRIORITY_INTERACTIVE,
+        options: DecodeOptions = DEFAULT_DECODE,
+    ) -> TranscribeResponse:
+        """Führt die Transkription im Worker-Pool aus (WhisperBusyError bei voller Queue)."""
+        if self.uses_processes:
+            key = self.model_key(model_size)
+            self._mark_used(key.size)
+            return await self._scheduler.run_async(
+                self._transcribe_process,
+                audio,
+                key,
+                language,
+                options,
+                priority=priority,
+            )
+
+        await self._ensure_loaded(model_size)
+        return await self._scheduler.run(
             self._transcribe_sync,
-            file_path,
+            audio,
             language,
+            model_size,
+            options,
+            priority=priority,
         )
 
-    def unload_model(self):
-        """Gibt das Modell frei (Speicher freigeben)."""
-        if self._model is not None:
-            logger.info(f"Entlade Whisper-Modell: {self._loaded_model_size}")
-            del self._model
-            self._model = None
-            self._loaded_model_size = None
+    async def _transcribe_process(
+        self,
+        audio: str | BinaryIO | np.ndarray,
+        key: ModelKey,
+        language: str,
+        options: DecodeOptions = DEFAULT_DECODE,
+    ) -> TranscribeResponse:
+        """Transkription im Prozess-Backend (mit Zeitmessung wie im Thread)."""
+        started = time.perf_counter()
+        with span("decode", model=key.size, preset=options.preset, backend="process"):
+            result = await self.process_pool.transcribe(audio, key, language, options)
+        observe_transcription(
+            key.size, time.perf_counter() - started, result.duration, options.preset
+        )
+        return result
+
+    async def _run_batch(
+        self, group: Hashable, clips: list[np.ndarray]
+    ) -> list[TranscribeResponse]:
+        """Führt einen gesammelten Batch als einen Worker-Auftrag aus."""
+        key, language, options = group
+        await self._ensure_loaded(key.size)
+        return await self._scheduler.run(
+            self._transcribe_batch_sync, key, language, clips, options
+        )
+
+    def _transcribe_batch_sync(
+        self,
+        key: ModelKey,
+        language: str,
+        clips: list[np.ndarray],
+        options: DecodeOptions = DEFAULT_DECODE,
+    ) -> list[TranscribeResponse]:
+        """Synchrone Batch-Transkription (für Thread-Pool)."""
+        with self.pool.lease(key) as model:
+            self._mark_used(key.size)
+            started = time.perf_counter()
+            with span("decode", model=key.size, batch_size=len(clips)):
+                results = run_batched_transcription(
+                    model, clips, language, key.size, options
+                )
+        audio_seconds = sum(result.duration for result in results)
+        observe_transcription(
+            key.size, time.perf_counter() - started, audio_seconds, options.preset
+        )
+        return results
+
+    def start(self):
+        """Startet das Prozess-Backend (falls konfiguriert), damit Worker vorwärmen."""
+        if self.uses_processes:
+            self.process_pool.start()
+
+    def unload_model(self, model_size: str | None = None):
+        """
+        Gibt ein Modell frei (ohne Angabe: alle Modelle).
+
+        Im Prozess-Backend leben die Modelle in den Worker-Prozessen; einzelne
+        Modelle lassen sich dort nicht gezielt freigeben. Das Entladen beendet
+        daher den ganzen Pool (alle Modelle), Neustart bei Bedarf.
+        """
+        if self.uses_processes:
+            if self._process_pool is None:
+                return
+            loaded = self._process_pool.loaded_keys
+            if model_size is not None:
+                key = self.model_key(model_size)
+                if key not in loaded:
+                    logger.info(f"Whisper-Modell {key.size} ist nicht geladen")
+                    return
+                others = [k.size for k in loaded if k != key]
+                if others:
+                    logger.warning(
+                        f"Prozess-Backend: Entladen von {key.size} gibt auch "
+                        f"{', '.join(others)} frei"
+                    )
+            logger.info("Beende Whisper-Worker-Prozesse (Modelle entladen)")
+            self._process_pool.shutdown()
+            return
 
-            # GPU-Speicher freigeben
-            try:
-                import torch
+        if model_size is None:
+            self.pool.unload()
+        else:
+            self.pool.unload(self.model_key(model_size))
 
-                if torch.cuda.is_available():
-                    torch.cuda.empty_cache()
-            except ImportError:
-                pass
+    def shutdown(self):
+        """Gibt Modelle, Worker-Threads und Worker-Prozesse frei."""
+        self.unload_model()
+        self._scheduler.shutdown()
+        self._preprocess_executor.shutdown(wait=False, cancel_futures=True)
+        if self._process_pool is not None:
+            self._process_pool.shutdown()
 
 
 # Global service instance
@@ -0,0 +1,433 @@
+"""
+Everlast AI Backend - Streaming-Transkription
+
+Inkrementelle Transkription für WebSocket-Clients (z.B. Diktat im Browser).
+
+Eingehende Audio-Frames werden zu 16 kHz PCM dekodiert und von einer
+energiebasierten VAD in Sprachsegmente zerlegt. Während ein Segment läuft,
+werden regelmäßig Zwischenergebnisse (``partial``) berechnet; sobald eine
+Sprechpause erkannt wird, wird das Segment final transkribiert (``final``).
+Die Latenz nach Sprechende ist damit Pausenlänge plus Dekodierzeit des
+Segments – unabhängig von der Länge der Aufnahme.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+
+import numpy as np
+
+from config import settings
+from models.schemas import StreamTranscribeConfig
+from services.audio import WHISPER_SAMPLE_RATE, ContainerStreamDecoder, PcmResampler
+from services.whisper_scheduler import WhisperBusyError
+
+if TYPE_CHECKING:
+    from services.whisper_service import WhisperService
+
+logger = logging.getLogger(__name__)
+
+# VAD-Frame: 30 ms bei 16 kHz
+FRAME_SAMPLES = 480
+
+# Audio vor/nach der erkannten Sprache, damit Wortanfänge nicht abgeschnitten werden
+SEGMENT_PADDING_SECONDS = 0.2
+
+# Kürzere "Sprache" gilt als Störgeräusch (Klicks, Atmen)
+MIN_SPEECH_SECONDS = 0.2
+
+# Wiederholungen, wenn die Transkriptions-Queue für ein finales Segment voll ist
+FINAL_RETRIES = 3
+
+
+def _seconds(samples: int) -> float:
+    return round(samples / WHISPER_SAMPLE_RATE, 3)
+
+
+class EnergyVAD:
+    """
+    Einfache energiebasierte Sprach-Erkennung mit adaptivem Rauschpegel.
+
+    Ein Frame gilt als Sprache, wenn sein Pegel sowohl über der absoluten
+    Schwelle als auch deutlich über dem geschätzten Hintergrundrauschen liegt.
+    """
+
+    def __init__(self, threshold_db: float = -45.0, margin_db: float = 12.0):
+        self.threshold_db = threshold_db
+        self.margin_db = margin_db
+        self.noise_db = -60.0
+
+    def classify(self, frames: np.ndarray) -> np.ndarray:
+        """Klassifiziert Frames (Form ``(n, FRAME_SAMPLES)``) als Sprache/Stille."""
+        rms = np.sqrt(np.mean(np.square(frames, dtype=np.float64), axis=1))
+        levels = 20 * np.log10(rms + 1e-10)
+        speech = np.empty(len(levels), dtype=bool)
+        for i, level in enumerate(levels):
+            speech[i] = level > max(self.threshold_db, self.noise_db + self.margin_db)
+            if not speech[i]:
+                self.noise_db = 0.95 * self.noise_db + 0.05 * level
+        return speech
+
+
+@dataclass
+class SpeechSegment:
+    """Ausschnitt einer Äußerung (Sample-Positionen ab Stream-Beginn)."""
+
+    index: int
+    start: int
+    end: int
+    audio: np.ndarray
+    final: bool
+
+
+class SpeechSegmenter:
+    """Zerlegt einen PCM-Stream anhand der VAD in Sprachsegmente."""
+
+    def __init__(
+        self,
+        end_silence_ms: float,
+        partial_interval_ms: float,
+        max_segment_seconds: float,
+    ):
+        self._vad = EnergyVAD()
+        self._end_silence = int(end_silence_ms / 1000 * WHISPER_SAMPLE_RATE)
+        self._partial_interval = int(partial_interval_ms / 1000 * WHISPER_SAMPLE_RATE)
+        self._max_segment = int(max_segment_seconds * WHISPER_SAMPLE_RATE)
+        self._padding = int(SEGMENT_PADDING_SECONDS * WHISPER_SAMPLE_RATE)
+        self._min_speech = int(MIN_SPEECH_SECONDS * WHISPER_SAMPLE_RATE)
+
+        # Nur der noch benötigte Teil des Streams wird gehalten
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._buffer_start = 0
+        self._processed = 0
+        self._speech_start: Optional[int] = None
+        self._last_speech = 0
+        self._last_partial = 0
+        self._index = 0
+
+    @property
+    def position(self) -> int:
+        """Anzahl bisher empfangener Samples."""
+        return self._buffer_start + len(self._buffer)
+
+    def _slice(self, start: int, end: int) -> np.ndarray:
+        return self._buffer[start - self._buffer_start : end - self._buffer_start].copy()
+
+    def _finalize(self, end: int) -> Optional[SpeechSegment]:
+        """Schließt das laufende Segment bei ``end`` (None bei reinem Rauschen)."""
+        start = self._speech_start
+        self._speech_start = None
+        if self._last_speech - start < self._min_speech:
+            return None
+        segment_start = max(self._buffer_start, start - self._padding)
+        segment = SpeechSegment(
+            index=self._index,
+            start=segment_start,
+            end=end,
+            audio=self._slice(segment_start, end),
+            final=True,
+        )
+        self._index += 1
+        return segment
+
+    def push(self, pcm: np.ndarray) -> list[SpeechSegment]:
+        """Verarbeitet neue Samples; liefert fällige Zwischen- und Endsegmente."""
+        self._buffer = np.concatenate([self._buffer, pcm])
+        segments: list[SpeechSegment] = []
+
+        count = (self.position - self._processed) // FRAME_SAMPLES
+        if count:
+            offset = self._processed - self._buffer_start
+            frames = self._buffer[offset : offset + count * FRAME_SAMPLES]
+            speech = self._vad.classify(frames.reshape(count, FRAME_SAMPLES))
+
+            for is_speech in speech:
+                frame_start = self._processed
+                self._processed += FRAME_SAMPLES
+                if is_speech:
+                    if self._speech_start is None:
+                        self._speech_start = frame_start
+                        self._last_partial = frame_start
+                    self._last_speech = self._processed
+                if self._speech_start is None:
+                    continue
+
+                if self._processed - self._last_speech >= self._end_silence:
+                    # Sprechpause: Segment inkl. Nachlauf abschließen
+                    end = min(self._processed, self._last_speech + self._padding)
+                    segment = self._finalize(end)
+                    if segment is not None:
+                        segments.append(segment)
+                elif self._processed - self._speech_start >= self._max_segment:
+                    # Sehr lange Äußerung: hart schneiden und direkt weitermachen
+                    segment = self._finalize(self._processed)
+                    if segment is not None:
+                        segments.append(segment)
+                    self._speech_start = self._processed
+                    self._last_partial = self._processed
+
+        if (
+            self._speech_start is not None
+            and self._partial_interval > 0
+            and self._processed - self._last_partial >= self._partial_interval
+        ):
+            self._last_partial = self._processed
+            start = max(self._buffer_start, self._speech_start - self._padding)
+            segments.append(
+                SpeechSegment(
+                    index=self._index,
+                    start=start,
+                    end=self._processed,
+                    audio=self._slice(start, self._processed),
+                    final=False,
+                )
+            )
+
+        self._trim()
+        return segments
+
+    def flush(self) -> Optional[SpeechSegment]:
+        """Schließt ein offenes Segment am Stream-Ende ab."""
+        if self._speech_start is None:
+            return None
+        return self._finalize(self.position)
+
+    def _trim(self):
+        keep_from = (
+            self._speech_start if self._speech_start is not None else self._processed
+        ) - self._padding
+        drop = keep_from - self._buffer_start
+        if drop > 0:
+            self._buffer = self._buffer[drop:]
+            self._buffer_start += drop
+
+
+class StreamingTranscription:
+    """
+    Eine Streaming-Sitzung: nimmt Audio-Frames an und liefert Events.
+
+    Events (``events()``):
+
+    - ``{"type": "partial", "segment", "text", "start", "end"}``
+    - ``{"type": "final", "segment", "text", "start", "end", "language", "latency_ms"}``
+    - ``{"type": "error", "detail"}``
+    - ``{"type": "done", "segments", "duration"}`` (letztes Event)
+    """
+
+    def __init__(self, service: "WhisperService", config: StreamTranscribeConfig):
+        self._service = service
+        self.config = config
+        # language=auto: Sprache einmal pro Verbindung erkennen
+        self._session_key = f"ws:{uuid.uuid4().hex}"
+        self._segmenter = SpeechSegmenter(
+            end_silence_ms=(
+                config.end_silence_ms
+                if config.end_silence_ms is not None
+                else settings.whisper_stream_end_silence_ms
+            ),
+            partial_interval_ms=(
+                config.partial_interval_ms
+                if config.partial_interval_ms is not None
+                else settings.whisper_stream_partial_interval_ms
+            ),
+            max_segment_seconds=settings.whisper_stream_max_segment_seconds,
+        )
+        self._loop = asyncio.get_running_loop()
+        self._events: asyncio.Queue[Optional[dict]] = asyncio.Queue()
+        self._finals: asyncio.Queue[Optional[tuple[SpeechSegment, float]]] = (
+            asyncio.Queue()
+        )
+        self._final_task = asyncio.create_task(self._final_worker())
+        self._partial_task: Optional[asyncio.Task] = None
+        self._finalized_index = -1
+        self._segments = 0
+        self._remainder = b""
+        self._resampler = PcmResampler(config.sample_rate)
+
+        self._decoder: Optional[ContainerStreamDecoder] = None
+        self._decoder_done: Optional[asyncio.Future] = None
+        self._decoder_error: Optional[Exception] = None
+        if config.format == "webm":
+            self._decoder_done = self._loop.create_future()
+            self._decoder = ContainerStreamDecoder(
+                on_pcm=lambda pcm: self._call_from_thread(self._on_pcm, pcm),
+                on_end=lambda error: self._call_from_thread(
+                    self._on_decoder_end, error
+                ),
+            )
+
+    # ------------------------------------------------------------------
+    # Eingang
+    # ------------------------------------------------------------------
+
+    @property
+    def failed(self) -> bool:
+        """Der Audio-Stream war nicht dekodierbar; weiteres Audio wird verworfen."""
+        return self._decoder_error is not None
+
+    def push_audio(self, data: bytes):
+        """Nimmt einen Audio-Frame des Clients entgegen."""
+        if self._decoder is not None:
+            if not self.failed:
+                self._decoder.feed(data)
+            return
+
+        # pcm_s16le: ungerade Byte-Anzahl bis zum nächsten Frame aufheben
+        data = self._remainder + data
+        usable = len(data) - len(data) % 2
+        self._remainder = data[usable:]
+        if usable:
+            self._on_pcm(self._resampler.push(data[:usable]))
+
+    def _call_from_thread(self, fn, *args):
+        try:
+            self._loop.call_soon_threadsafe(fn, *args)
+        except RuntimeError:
+            pass  # Event-Loop bereits beendet (Sitzung abgebrochen)
+
+    def _on_pcm(self, pcm: np.ndarray):
+        for segment in self._segmenter.push(pcm):
+            self._dispatch(segment)
+
+    def _on_decoder_end(self, error: Optional[Exception]):
+        if error is not None:
+            self._decoder_error = error
+            logger.warning(f"Audio-Stream nicht dekodierbar: {error}")
+            self._emit({"type": "error", "detail": f"Audio nicht dekodierbar: {error}"})
+        if not self._decoder_done.done():
+            self._decoder_done.set_result(None)
+
+    def _dispatch(self, segment: SpeechSegment):
+        if segment.final:
+            self._finals.put_nowait((segment, time.perf_counter()))
+        elif self._partial_task is None or self._partial_task.done():
+            # Höchstens ein Zwischenergebnis gleichzeitig; sonst überspringen
+            self._partial_task = asyncio.create_task(self._partial(segment))
+
+    def _emit(self, event: Optional[dict]):
+        self._events.put_nowait(event)
+
+    # ------------------------------------------------------------------
+    # Transkription
+    # ------------------------------------------------------------------
+
+    async def _partial(self, segment: SpeechSegment):
+        try:
+            result = await self._service.transcribe(
+                segment.audio,
+                language=self.config.language,
+                model=self.config.model,
+                use_cache=False,
+                options=self.config.decode,
+                session_key=self._session_key,
+            )
+        except WhisperBusyError:
+            return  # Zwischenergebnisse sind verzichtbar
+        except Exception as e:
+            logger.debug(f"Zwischenergebnis fehlgeschlagen: {e}")
+            return
+        if segment.index > self._finalized_index:
+            self._emit(
+                {
+                    "type": "partial",
+                    "segment": segment.index,
+                    "text": result.text,
+                    "start": _seconds(segment.start),
+                    "end": _seconds(segment.end),
+                }
+            )
+
+    async def _final_worker(self):
+        """Transkribiert finale Segmente der Reihe nach."""
+        while True:
+            item = await self._finals.get()
+            if item is None:
+                return
+            segment, detected_at = item
+            self._finalized_index = segment.index
+            try:
+                result = await self._transcribe_final(segment)
+            except Exception as e:
+                logger.error(f"Streaming-Segment {segment.index} fehlgeschlagen: {e}")
+                self._emit(
+                    {"type": "error", "segment": segment.index, "detail": str(e)}
+                )
+                continue
+            self._segments += 1
+            self._emit(
+                {
+                    "type": "final",
+                    "segment": segment.index,
+                    "text": result.text,
+                    "start": _seconds(segment.start),
+                    "end": _seconds(segment.end),
+                    "language": result.language,
+                    "latency_ms": int((time.perf_counter() - detected_at) * 1000),
+                }
+            )
+
+    async def _transcribe_final(self, segment: SpeechSegment):
+        for attempt in range(FINAL_RETRIES + 1):
+            try:
+                return await self._service.transcribe(
+                    segment.audio,
+                    language=self.config.language,
+                    model=self.config.model,
+                    use_cache=False,
+                    options=self.config.decode,
+                    session_key=self._session_key,
+                )
+            except WhisperBusyError as e:
+                if attempt == FINAL_RETRIES:
+                    raise
+                await asyncio.sleep(e.retry_after)
+
+    # ------------------------------------------------------------------
+    # Ausgang / Lebenszyklus
+    # ------------------------------------------------------------------
+
+    async def events(self) -> AsyncIterator[dict]:
+        """Liefert Events bis einschließlich ``done``."""
+        while True:
+            event = await self._events.get()
+            if event is None:
+                return
+            yield event
+
+    async def finish(self):
+        """Stream-Ende: offenes Segment abschließen, Ergebnisse abwarten."""
+        if self._decoder is not None:
+            self._decoder.finish()
+            await self._decoder_done
+        else:
+            self._remainder = b""
+            tail = self._resampler.flush()
+            if len(tail):
+                self._on_pcm(tail)
+
+        segment = self._segmenter.flush()
+        if segment is not None:
+            self._dispatch(segment)
+        self._finals.put_nowait(None)
+        await self._final_task
+
+        self._emit(
+            {
+                "type": "done",
+                "segments": self._segments,
+                "duration": _seconds(self._segmenter.position),
+            }
+        )
+        self._emit(None)
+
+    async def close(self):
+        """Bricht die Sitzung ab (z.B. Client-Disconnect)."""
+        if self._decoder is not None:
+            self._decoder.finish()
+        for task in (self._final_task, self._partial_task):
+            if task is not None and not task.done():
+                task.cancel()
+        self._emit(None)
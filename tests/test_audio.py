@@ -0,0 +1,84 @@
+"""
+Everlast AI Backend - Audio-Tests
+
+Resampling auf 16 kHz darf hohe Frequenzen nicht in das Sprachband falten.
+"""
+
+import io
+import wave
+
+import numpy as np
+import pytest
+
+from services.audio import (
+    WHISPER_SAMPLE_RATE,
+    PcmResampler,
+    decode_resampled,
+    trim_silence,
+)
+
+SOURCE_RATE = 48000
+
+
+def _tone(frequency: float, seconds: float = 1.0, rate: int = SOURCE_RATE) -> np.ndarray:
+    t = np.arange(int(seconds * rate)) / rate
+    return (0.5 * np.sin(2 * np.pi * frequency * t) * 32767).astype(np.int16)
+
+
+def _wav(samples: np.ndarray, rate: int = SOURCE_RATE, channels: int = 1) -> bytes:
+    if channels > 1:
+        samples = np.repeat(samples[:, None], channels, axis=1)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as f:
+        f.setnchannels(channels)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+def _rms(pcm: np.ndarray) -> float:
+    # Ein-/Ausschwingen des Filters an den Rändern ignorieren
+    core = pcm[len(pcm) // 10 : -len(pcm) // 10]
+    return float(np.sqrt(np.mean(np.square(core, dtype=np.float64))))
+
+
+@pytest.mark.parametrize("channels", [1, 2])
+def test_decode_resampled_rejects_aliasing(channels):
+    # 10 kHz liegt über der Nyquist-Frequenz von 16 kHz (8 kHz) und würde
+    # ohne Tiefpass als 6 kHz-Ton durchschlagen
+    pcm = decode_resampled(_wav(_tone(10000), channels=channels))
+    assert len(pcm) == WHISPER_SAMPLE_RATE
+    assert _rms(pcm) < 0.01
+
+
+def test_decode_resampled_keeps_speech_band():
+    pcm = decode_resampled(_wav(_tone(1000)))
+    assert pcm.dtype == np.float32
+    assert _rms(pcm) == pytest.approx(0.5 / np.sqrt(2), rel=0.05)
+
+
+def test_pcm_resampler_rejects_aliasing_across_chunks():
+    resampler = PcmResampler(SOURCE_RATE)
+    data = _tone(10000).tobytes()
+    chunks = [resampler.push(data[i : i + 960]) for i in range(0, len(data), 960)]
+    pcm = np.concatenate([*chunks, resampler.flush()])
+    assert abs(len(pcm) - WHISPER_SAMPLE_RATE) <= 32
+    assert _rms(pcm) < 0.01
+
+
+def test_pcm_resampler_passes_16khz_through():
+    samples = _tone(1000, rate=WHISPER_SAMPLE_RATE)
+    pcm = PcmResampler().push(samples.tobytes())
+    np.testing.assert_allclose(pcm, samples / 32768.0, atol=1e-6)
+
+
+def test_trim_silence_keeps_padding():
+    rate = WHISPER_SAMPLE_RATE
+    pcm = np.concatenate(
+        [np.zeros(rate), np.full(rate // 2, 0.1), np.zeros(2 * rate)]
+    ).astype(np.float32)
+    start, end = trim_silence(pcm, pad_seconds=0.3)
+    assert start == int(0.7 * rate)
+    assert end == int(1.8 * rate)
+    assert trim_silence(np.zeros(rate, dtype=np.float32)) == (0, 0)
@@ -0,0 +1,93 @@
+"""
+Everlast AI Backend - Circuit-Breaker-Tests
+
+Öffnen nach wiederholten Fehlern, genau ein Probe-Request im Half-Open-
+Zustand und Freigabe des Probe-Slots, wenn der Probe-Request abbricht.
+"""
+
+import asyncio
+
+import httpx
+from fastapi.testclient import TestClient
+
+from services.circuit_breaker import CircuitBreaker, CircuitState
+from services.ollama_backends import OllamaBackend
+from services.ollama_service import ollama_service
+
+
+def _open_breaker(breaker: CircuitBreaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+
+def test_opens_after_threshold_and_rejects():
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+    assert breaker.retry_after() > 0
+
+
+def test_half_open_lets_exactly_one_probe_through():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0)
+    _open_breaker(breaker)
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    assert not breaker.can_attempt()
+
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow_request()
+
+
+def test_failed_probe_reopens():
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=60)
+    _open_breaker(breaker)
+    breaker.reset_timeout = 0
+    assert breaker.allow_request()
+    breaker.reset_timeout = 60
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_cancelled_probe_releases_slot():
+    backend = OllamaBackend("http://ollama.invalid:11434", timeout=1.0)
+    backend.breaker.reset_timeout = 0
+    _open_breaker(backend.breaker)
+
+    async def probe(started: asyncio.Event):
+        async with backend.track():
+            started.set()
+            await asyncio.sleep(60)
+
+    async def main():
+        assert backend.breaker.allow_request()
+        started = asyncio.Event()
+        task = asyncio.create_task(probe(started))
+        await started.wait()
+        assert not backend.breaker.can_attempt()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(main())
+    assert backend.in_flight == 0
+    assert backend.breaker.state == CircuitState.HALF_OPEN
+    assert backend.breaker.allow_request()
+
+
+def test_transport_error_maps_to_503(monkeypatch):
+    import main
+
+    async def generate(**kwargs):
+        raise httpx.ConnectError("Verbindung abgelehnt")
+
+    monkeypatch.setattr(ollama_service, "allow_request", lambda: True)
+    monkeypatch.setattr(ollama_service, "generate", generate)
+
+    response = TestClient(main.app).post("/api/v1/generate", json={"prompt": "Hallo"})
+    assert response.status_code == 503
+    assert "Retry-After" in response.headers
@@ -0,0 +1,84 @@
+"""
+Everlast AI Backend - Failover-Tests
+
+Fällt ein Ollama-Backend aus, übernimmt ein anderes – aber nur, wenn es
+eines gibt, und nur bei wiederholbaren Fehlern.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from services.ollama_backends import OllamaBackend
+from services.ollama_service import OllamaService
+
+
+def _service(*hosts: str) -> OllamaService:
+    service = OllamaService()
+    service.backends = [OllamaBackend(f"http://{host}:11434", 1.0) for host in hosts]
+    return service
+
+
+def _mock_client(backend: OllamaBackend, handler):
+    backend._client = httpx.AsyncClient(
+        base_url=backend.url, transport=httpx.MockTransport(handler)
+    )
+
+
+def test_no_failover_without_other_backend():
+    service = _service("a")
+    error = httpx.ConnectError("Verbindung abgelehnt")
+    assert not service._can_fail_over(error, [service.backends[0]])
+
+
+def test_failover_to_routable_backend():
+    service = _service("a", "b")
+    error = httpx.ConnectError("Verbindung abgelehnt")
+    assert service._can_fail_over(error, [service.backends[0]])
+
+    # Geöffneter Breaker: kein Kandidat mehr
+    breaker = service.backends[1].breaker
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    assert not service._can_fail_over(error, [service.backends[0]])
+
+
+def test_client_errors_do_not_fail_over():
+    service = _service("a", "b")
+    request = httpx.Request("POST", "http://a:11434/api/generate")
+    error = httpx.HTTPStatusError(
+        "404", request=request, response=httpx.Response(404, request=request)
+    )
+    assert not service._can_fail_over(error, [service.backends[0]])
+
+
+def test_request_fails_over_to_second_backend():
+    service = _service("a", "b")
+    first, second = service.backends
+
+    def refuse(request):
+        raise httpx.ConnectError("Verbindung abgelehnt", request=request)
+
+    def answer(request):
+        return httpx.Response(200, json={"models": []})
+
+    _mock_client(first, refuse)
+    _mock_client(second, answer)
+    # Gleichstand bei der Auswahl vermeiden: erst a, dann b
+    second.latency_ms = 10.0
+
+    assert asyncio.run(service._request("GET", "/api/tags")) == {"models": []}
+    assert first.available is False
+    assert second.available is True
+
+
+def test_last_backend_error_is_raised():
+    service = _service("a")
+
+    def refuse(request):
+        raise httpx.ConnectError("Verbindung abgelehnt", request=request)
+
+    _mock_client(service.backends[0], refuse)
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(service._request("GET", "/api/tags"))
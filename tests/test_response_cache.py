@@ -0,0 +1,99 @@
+"""
+Everlast AI Backend - Antwort-Cache-Tests
+
+Gleichzeitige identische Anfragen werden nur einmal berechnet; ein neuer
+Modell-Digest aus ``/api/tags`` invalidiert die Einträge des Modells, auch
+wenn der Client den Namen ohne Tag (``:latest``) verwendet.
+"""
+
+import asyncio
+
+from models.schemas import GenerateResponse, ModelInfo
+from services.ollama_backends import normalize_model
+from services.ollama_service import OllamaService
+from services.response_cache import ResponseCache, make_cache_key
+
+
+def test_make_cache_key_ignores_field_order():
+    assert make_cache_key({"a": 1, "b": 2}) == make_cache_key({"b": 2, "a": 1})
+    assert make_cache_key({"a": 1}) != make_cache_key({"a": 2})
+
+
+def test_concurrent_misses_are_coalesced():
+    cache = ResponseCache("test")
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"text": "hallo"}
+
+    async def main():
+        return await asyncio.gather(
+            *(cache.get_or_compute("key", compute) for _ in range(5))
+        )
+
+    results = asyncio.run(main())
+    assert calls == 1
+    assert [value for value, _ in results] == [{"text": "hallo"}] * 5
+    assert sorted(cached for _, cached in results) == [False] + [True] * 4
+    assert cache.stats()["coalesced"] == 4
+
+
+def test_failed_compute_is_not_cached():
+    cache = ResponseCache("test")
+
+    async def fail():
+        raise RuntimeError("Backend weg")
+
+    async def succeed():
+        return {"text": "ok"}
+
+    async def main():
+        try:
+            await cache.get_or_compute("key", fail)
+        except RuntimeError:
+            pass
+        return await cache.get_or_compute("key", succeed)
+
+    assert asyncio.run(main()) == ({"text": "ok"}, False)
+
+
+def test_invalidate_tag_removes_only_tagged_entries():
+    cache = ResponseCache("test")
+    cache.set("a", {"v": 1}, tag="llama3.2:latest")
+    cache.set("b", {"v": 2}, tag="mistral:latest")
+    assert cache.invalidate_tag("llama3.2:latest") == 1
+    assert cache.get("a") is None
+    assert cache.get("b") == {"v": 2}
+
+
+def test_normalize_model_adds_latest_tag():
+    assert normalize_model("llama3.2") == "llama3.2:latest"
+    assert normalize_model("llama3.2:3b") == "llama3.2:3b"
+
+
+def test_new_digest_invalidates_untagged_model_name():
+    service = OllamaService(base_url="http://ollama.invalid:11434")
+    service._cache = ResponseCache("test")
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        return GenerateResponse(text="hallo", model="llama3.2")
+
+    async def generate():
+        key = service._cache_key("generate", "llama3.2", prompt="Hallo")
+        return await service._cached(key, "llama3.2", compute)
+
+    service._update_models([ModelInfo(name="llama3.2:latest", size="2 GB", digest="a")])
+    old_key = service._cache_key("generate", "llama3.2", prompt="Hallo")
+    assert not asyncio.run(generate()).cached
+    assert asyncio.run(generate()).cached
+
+    service._update_models([ModelInfo(name="llama3.2:latest", size="2 GB", digest="b")])
+    assert service._cache.get(old_key) is None
+    assert not asyncio.run(generate()).cached
+    assert calls == 2
@@ -0,0 +1,66 @@
+"""
+Everlast AI Backend - Micro-Batching-Tests
+
+Gleichzeitige Clips einer Gruppe laufen als ein Batch; wartende Requests
+dürfen bei Fehlern oder Abbruch des Batches nicht hängen bleiben.
+"""
+
+import asyncio
+
+from services.whisper_batcher import TranscriptionBatcher
+
+
+def test_submit_groups_concurrent_items():
+    batches = []
+
+    async def run_batch(group, items):
+        batches.append((group, items))
+        return [item * 2 for item in items]
+
+    async def main():
+        batcher = TranscriptionBatcher(run_batch, max_batch_size=8, max_wait_ms=10)
+        results = await asyncio.gather(*(batcher.submit("de", i) for i in range(3)))
+        return results, batcher.stats()
+
+    results, stats = asyncio.run(main())
+    assert results == [0, 2, 4]
+    assert batches == [("de", [0, 1, 2])]
+    assert stats["batches"] == 1
+
+
+def test_batch_error_reaches_every_caller():
+    async def run_batch(group, items):
+        raise RuntimeError("decoder kaputt")
+
+    async def main():
+        batcher = TranscriptionBatcher(run_batch, max_batch_size=2, max_wait_ms=10)
+        return await asyncio.gather(
+            batcher.submit("de", 1), batcher.submit("de", 2), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert [str(r) for r in results] == ["decoder kaputt", "decoder kaputt"]
+
+
+def test_cancelled_dispatch_releases_waiting_callers():
+    started = None
+
+    async def run_batch(group, items):
+        started.set()
+        await asyncio.sleep(60)
+        return items
+
+    async def main():
+        nonlocal started
+        started = asyncio.Event()
+        batcher = TranscriptionBatcher(run_batch, max_batch_size=8, max_wait_ms=1)
+        callers = [asyncio.create_task(batcher.submit("de", i)) for i in range(3)]
+        await started.wait()
+        for task in list(batcher._tasks):
+            task.cancel()
+        return await asyncio.wait_for(
+            asyncio.gather(*callers, return_exceptions=True), timeout=1
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, asyncio.CancelledError) for r in results)
@@ -0,0 +1,112 @@
+"""
+Everlast AI Backend - Scheduler-Tests
+
+Volle Warteschlange: sofortige Abweisung (503 mit Retry-After), ohne dass
+vorher noch ein Modell geladen wird.
+"""
+
+import asyncio
+import io
+import wave
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from services.whisper_scheduler import (
+    PRIORITY_BATCH,
+    PRIORITY_INTERACTIVE,
+    WhisperBusyError,
+    WhisperScheduler,
+)
+from services.whisper_service import whisper_service
+
+
+def test_full_queue_rejects_immediately():
+    async def main():
+        scheduler = WhisperScheduler(workers=1, max_queue=1)
+        release = asyncio.Event()
+        running = asyncio.create_task(scheduler.run_async(release.wait))
+        waiting = asyncio.create_task(scheduler.run_async(release.wait))
+        await asyncio.sleep(0)
+
+        with pytest.raises(WhisperBusyError) as busy:
+            scheduler.check_capacity()
+        with pytest.raises(WhisperBusyError):
+            await scheduler.run_async(release.wait)
+
+        release.set()
+        await asyncio.gather(running, waiting)
+        return busy.value, scheduler.stats()
+
+    error, stats = asyncio.run(main())
+    assert error.queue_depth == 1
+    assert error.retry_after >= 1
+    assert stats["rejected"] == 2
+    assert stats["completed"] == 2
+
+
+def test_interactive_requests_overtake_batch_jobs():
+    async def main():
+        scheduler = WhisperScheduler(workers=1, max_queue=4)
+        release = asyncio.Event()
+        order = []
+
+        async def job(name):
+            order.append(name)
+
+        blocker = asyncio.create_task(scheduler.run_async(release.wait))
+        await asyncio.sleep(0)
+        tasks = [
+            asyncio.create_task(scheduler.run_async(job, "batch", priority=PRIORITY_BATCH)),
+            asyncio.create_task(
+                scheduler.run_async(job, "interactive", priority=PRIORITY_INTERACTIVE)
+            ),
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(blocker, *tasks)
+        return order
+
+    assert asyncio.run(main()) == ["interactive", "batch"]
+
+
+def _wav(seconds: float = 1.0, rate: int = 16000) -> bytes:
+    t = np.arange(int(seconds * rate)) / rate
+    samples = (0.3 * np.sin(2 * np.pi * 440 * t) * 32767).astype(np.int16)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+def test_transcribe_returns_503_without_loading_model(monkeypatch):
+    import main
+
+    scheduler = WhisperScheduler(workers=1, max_queue=0)
+    # Einzigen Worker belegen: jeder weitere Auftrag würde abgewiesen
+    asyncio.run(scheduler._acquire(PRIORITY_INTERACTIVE))
+    loads = []
+
+    async def load_model(model_size=None):
+        loads.append(model_size)
+
+    monkeypatch.setattr(whisper_service, "_scheduler", scheduler)
+    monkeypatch.setattr(whisper_service, "load_model", load_model)
+    monkeypatch.setattr(whisper_service, "_cache", None)
+    monkeypatch.setattr(whisper_service, "_batcher", None)
+
+    client = TestClient(main.app)
+    response = client.post(
+        "/api/v1/transcribe",
+        files={"audio": ("clip.wav", _wav(), "audio/wav")},
+        data={"language": "de", "model": "tiny"},
+    )
+    scheduler.shutdown()
+
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+    assert loads == []